@@ -85,6 +85,8 @@ class BaseModule:
     D'autres méthodes génériques sont définies :
     -   boucle : appelée à chaque tour de boucle synchro, elle permet
         d'accomplir une certaine action le plus régulièrement possible
+    -   delai_boucle : retourne le temps pendant lequel la boucle synchro
+        peut attendre sans que le module n'ait besoin d'être appelé
 
     On passe en paramètre du module l'importeur. Cela permet, pour un module,
     d'avoir accès à tous les autres modules chargés. Mais de ce fait,
@@ -179,6 +181,18 @@ class BaseModule:
         """Méthode appelée à chaque tour de boucle synchro."""
         pass
 
+    def delai_boucle(self):
+        """Retourne le délai avant le prochain travail du module.
+
+        Quand aucun client n'envoie de message, la boucle synchro peut
+        attendre au lieu de tourner à vide. Cette méthode retourne le
+        temps (en secondes) pendant lequel le module peut se passer
+        d'un appel à 'boucle', 0 si il a du travail en attente, ou None
+        si il n'a aucune contrainte (c'est le cas par défaut).
+
+        """
+        return None
+
     def traiter_commande(self, personnage, commande):
         """Méthode à redéfinir si on veut que le module traite des commandes
         hors interprétation.
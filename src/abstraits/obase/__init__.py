@@ -35,18 +35,68 @@ import traceback
 import time
 from collections import OrderedDict
 
+from abstraits.obase.migration import PlanMigration
+from abstraits.obase.reference import Reference
+from abstraits.obase.registre import Registre
 from bases.collections.dictionnaire import *
 from bases.collections.liste import Liste
 
 objets_base = {} # dictionnaire des différents BaseObj {nom_cls:cls}
+plans_migration = {} # plans de mise à jour {classe: PlanMigration}
 
 
 # Objets chargés
-objets = {}
-objets_par_type = {}
+objets = Registre() # objets enregistrés, par type (voir Registre)
 ids = {}
 statut_gen = 0 # 0 => OK, 1 => en cours
 classes_base = {}
+references = {} # attributs référençant des objets {classe: noms}
+nouveaux = None # objets enregistrés suivis par le journal (voir supenr)
+
+# Types de valeurs qui ne sont pas des objets de base
+# Ils sont testés avant isinstance, sensiblement plus lent sur les classes
+# ayant une métaclasse (voir BaseObj.__setattr__)
+TYPES_VALEURS = frozenset((bool, int, float, str, bytes, type(None), tuple,
+        list, dict, set))
+
+def surveiller_reference(classe, nom):
+    """Place un descripteur Reference sur l'attribut de la classe.
+
+    Cette fonction est appelée quand un attribut reçoit un objet de
+    base (BaseObj). Par la suite, à chaque lecture de cet attribut, on
+    vérifie que l'objet référencé existe encore (voir Reference).
+
+    Si l'attribut est défini par la classe ou ses parents comme une
+    méthode ou une propriété, il n'est pas remplacé.
+
+    """
+    noms = references.get(classe)
+    if noms is None:
+        noms = references[classe] = set()
+
+    if nom in noms:
+        return
+
+    noms.add(nom)
+    if nom.startswith("__"):
+        return
+
+    for parent in classe.__mro__:
+        if nom in parent.__dict__:
+            attribut = parent.__dict__[nom]
+            if isinstance(attribut, Reference) or \
+                    hasattr(type(attribut), "__get__"):
+                return
+
+            break
+
+    # La valeur définie par la classe elle-même est conservée
+    if nom in classe.__dict__:
+        reference = Reference(nom, classe.__dict__[nom])
+    else:
+        reference = Reference(nom)
+
+    setattr(classe, nom, reference)
 
 class MetaBaseObj(type):
 
@@ -103,6 +153,12 @@ class BaseObj(metaclass=MetaBaseObj):
     Le test est simple : si l'objet issu de la classe doit être enregistré,
     l'hériter de BaseObj.
 
+    Un objet détruit (voir 'detruire') n'est pas retiré des objets qui le
+    référencent, mais les attributs qui le contiennent retournent None.
+    Ces attributs sont repérés quand ils reçoivent un objet de base : un
+    descripteur est alors placé sur la classe (voir Reference). Les autres
+    attributs sont lus sans vérification.
+
     """
 
     importeur = None
@@ -124,11 +180,8 @@ class BaseObj(metaclass=MetaBaseObj):
 
     def ajouter_enr(self):
         if self.e_existe and type(self).enregistrer and statut_gen == 0 and \
-                id(self) not in objets:
-            objets[id(self)] = self
-            liste = objets_par_type.get(type(self), [])
-            liste.append(self)
-            objets_par_type[type(self)] = liste
+                objets.ajouter(self) and nouveaux is not None:
+            nouveaux.append(self)
 
     def version_actuelle(self, classe):
         """Retourne la version actuelle de l'objet.
@@ -155,12 +208,11 @@ class BaseObj(metaclass=MetaBaseObj):
         """Marque l'objet comme détruit."""
         self.e_existe = False
         importeur.supenr.detruire_objet(self)
-        if id(self) in objets:
-            del objets[id(self)]
+        objets.retirer(self)
 
     @property
     def construit(self):
-        return hasattr(self, "_statut") and self._statut == CONSTRUIT
+        return self.__dict__.get("_statut") == CONSTRUIT
 
     def __setstate__(self, dico_attrs):
         """Méthode appelée lors de la désérialisation de l'objet"""
@@ -180,6 +232,11 @@ class BaseObj(metaclass=MetaBaseObj):
             sys.exit(1)
         self.__dict__.update(dico_attrs)
 
+        # On repère les attributs référençant des objets
+        for nom, valeur in dico_attrs.items():
+            if isinstance(valeur, BaseObj):
+                surveiller_reference(classe, nom)
+
         # On vérifie s'il a besoin d'une vraie mis à jour
         self._update(classe)
         statut_gen = 0
@@ -190,59 +247,17 @@ class BaseObj(metaclass=MetaBaseObj):
         destinée à vérifier si l'objet doit être mis à jour et, le cas
         échéant, le mettre à jour.
 
-        """
-        # Mise à jour récursive par rapport aux classes-mères
-        for base in classe.__bases__:
-            # Inutile d'essayer de mettre à jour 'object'
-            if base is not object:
-                base._update(self, base)
-        if classe._nom in objets_base:
-            # On importe le convertisseur dédié à la classe en cours
-            try:
-                convertisseur = getattr(__import__( \
-                        "primaires.supenr.convertisseurs." + classe._nom, \
-                        globals(), locals(), ["Convertisseur"]), \
-                        "Convertisseur")
-            except ImportError as error:
-                print("La classe {0} suivie en version ne possède pas de " \
-                        "fichier de convertisseurs dans primaires.supenr." \
-                        "convertisseurs".format(classe._nom))
-                exit()
-            except AttributeError as error:
-                print("Le fichier {0}.py dans primaires.supenr." \
-                        "convertisseurs ne possède pas de classe " \
-                        "Convertisseur".format(classe._nom))
-                exit()
-
-            # On vérifie la version de la classe et celle de l'objet
-            # Rappel :
-            #   self.version_actuelle() retourne la version enregistrée
-            #   classe._version retourne la version de la classe
-            while self.version_actuelle(classe) < classe._version:
-                try:
-                    # On appelle la version de conversion
-                    getattr(convertisseur, "depuis_version_" + \
-                            str(self.version_actuelle(classe)))(self, classe)
-                except AttributeError as error:
-                    print("Le fichier {0}.py dans primaires.supenr." \
-                            "convertisseurs ne comporte pas de méthode " \
-                            "depuis_version_".format(classe._nom) + str( \
-                            self.version_actuelle(classe)))
-                    print(traceback.format_exc())
-                    exit()
-
-
-    def __getattribute__(self, nom_attr):
-        """Méthode appelé quand on cherche à récupérer l'attribut nom_attr
-
-        Si l'attribut n'existe plus, on retourne None.
+        Le plan de mise à jour (convertisseurs des classes suivies en
+        version, classes-mères comprises) est calculé une seule fois par
+        classe (voir PlanMigration).
 
         """
-        objet = object.__getattribute__(self, nom_attr)
-        if hasattr(objet, "e_existe") and not objet.e_existe:
-            return None
+        plan = plans_migration.get(classe)
+        if plan is None:
+            plan = PlanMigration(classe, objets_base)
+            plans_migration[classe] = plan
 
-        return objet
+        plan.appliquer(self)
 
     def __getstate__(self):
         return dict(self.__dict__)
@@ -250,7 +265,11 @@ class BaseObj(metaclass=MetaBaseObj):
     def __setattr__(self, attr, valeur):
         """L'objet est modifié."""
         object.__setattr__(self, attr, valeur)
-        if self.construit:
+        if type(valeur) not in TYPES_VALEURS and isinstance(valeur,
+                BaseObj) and attr not in references.get(type(self), ()):
+            surveiller_reference(type(self), attr)
+
+        if self.__dict__.get("_statut") == CONSTRUIT:
             importeur.supenr.ajouter_objet(self)
 
     def _enregistrer(self):
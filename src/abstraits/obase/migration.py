@@ -0,0 +1,135 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier définit la classe PlanMigration, détaillée plus bas."""
+
+import traceback
+
+class PlanMigration:
+
+    """Plan de mise à jour des objets d'une classe.
+
+    Au chargement, chaque objet de base (BaseObj) doit être mis à jour
+    si l'une de ses classes suivies en version (la sienne ou l'une de
+    ses classes-mères) a changé de version depuis son enregistrement.
+    Le plan est calculé une seule fois par classe (voir
+    BaseObj._update) : il contient, dans l'ordre de mise à jour (les
+    classes-mères d'abord), chaque classe suivie, sa version et les
+    méthodes 'depuis_version_N' de son convertisseur.
+
+    Un objet à jour est reconnu d'une seule comparaison : son
+    dictionnaire des versions est égal à celui attendu ('versions').
+
+    """
+
+    def __init__(self, classe, suivies):
+        """Calcule le plan de la classe.
+
+        Paramètres :
+            classe -- la classe des objets à mettre à jour
+            suivies -- le dictionnaire des classes suivies en version
+                       {nom: classe} (voir objets_base)
+
+        """
+        self.classe = classe
+        self.etapes = []
+        self.versions = {}
+        for base in parcourir(classe):
+            if base._nom not in suivies or base._nom in self.versions:
+                continue
+
+            convertisseur = importer_convertisseur(base)
+            methodes = [getattr(convertisseur, "depuis_version_" + str(i),
+                    None) for i in range(base._version)]
+            self.etapes.append((base, methodes))
+            self.versions[base._nom] = base._version
+
+    def __repr__(self):
+        return "<PlanMigration {} ({} étapes)>".format(
+                self.classe.__name__, len(self.etapes))
+
+    def appliquer(self, objet):
+        """Met à jour l'objet si nécessaire."""
+        if objet.__dict__.get("_dict_version") == self.versions:
+            return
+
+        for classe, methodes in self.etapes:
+            while objet.version_actuelle(classe) < classe._version:
+                version = objet.version_actuelle(classe)
+                methode = methodes[version] if 0 <= version < len(
+                        methodes) else None
+                if methode is None:
+                    print("Le fichier {0}.py dans primaires.supenr." \
+                            "convertisseurs ne comporte pas de méthode " \
+                            "depuis_version_".format(classe._nom) + str(
+                            version))
+                    exit()
+
+                try:
+                    methode(objet, classe)
+                except AttributeError as error:
+                    print("Le fichier {0}.py dans primaires.supenr." \
+                            "convertisseurs ne comporte pas de méthode " \
+                            "depuis_version_".format(classe._nom) + str(
+                            version))
+                    print(traceback.format_exc())
+                    exit()
+
+
+def parcourir(classe):
+    """Parcourt les classes dans l'ordre de mise à jour.
+
+    Les classes-mères sont parcourues (récursivement) avant la classe
+    elle-même. 'object' est ignoré.
+
+    """
+    for base in classe.__bases__:
+        if base is not object:
+            yield from parcourir(base)
+
+    yield classe
+
+def importer_convertisseur(classe):
+    """Importe le convertisseur de la classe suivie en version."""
+    try:
+        return getattr(__import__("primaires.supenr.convertisseurs." + \
+                classe._nom, globals(), locals(), ["Convertisseur"]),
+                "Convertisseur")
+    except ImportError as error:
+        print("La classe {0} suivie en version ne possède pas de " \
+                "fichier de convertisseurs dans primaires.supenr." \
+                "convertisseurs".format(classe._nom))
+        exit()
+    except AttributeError as error:
+        print("Le fichier {0}.py dans primaires.supenr." \
+                "convertisseurs ne possède pas de classe " \
+                "Convertisseur".format(classe._nom))
+        exit()
@@ -0,0 +1,118 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Ce fichier définit la classe Reference, détaillée plus bas."""
+
+# Valeur par défaut absente
+ABSENT = object()
+
+class Reference:
+
+    """Descripteur d'un attribut référençant un objet de base.
+
+    Un objet de base (BaseObj) détruit n'est pas supprimé des objets qui
+    le référencent : son attribut 'e_existe' passe simplement à False.
+    Ce descripteur est placé sur la classe, pour chaque attribut ayant
+    déjà contenu un objet de base (voir BaseObj.__setattr__). Quand on
+    lit l'attribut, si l'objet référencé est détruit, on retourne None.
+
+    Les autres attributs ne sont pas concernés : ils sont lus directement
+    dans le dictionnaire de l'objet, sans vérification.
+
+    """
+
+    __slots__ = ("nom", "defaut")
+
+    def __init__(self, nom, defaut=ABSENT):
+        """Constructeur du descripteur.
+
+        Paramètres :
+            nom -- le nom de l'attribut
+            defaut -- la valeur définie par la classe, que remplace
+                      le descripteur
+
+        """
+        self.nom = nom
+        self.defaut = defaut
+
+    def __repr__(self):
+        return "<Reference {}>".format(self.nom)
+
+    def __get__(self, objet, classe=None):
+        """Retourne la valeur de l'attribut, ou None si elle est détruite."""
+        if objet is None:
+            return self.get_defaut(None, classe)
+
+        try:
+            valeur = objet.__dict__[self.nom]
+        except KeyError:
+            valeur = self.get_defaut(objet, type(objet))
+
+        if getattr(valeur, "e_existe", True):
+            return valeur
+
+        return None
+
+    def __set__(self, objet, valeur):
+        """Modifie la valeur de l'attribut."""
+        objet.__dict__[self.nom] = valeur
+
+    def __delete__(self, objet):
+        """Supprime l'attribut."""
+        try:
+            del objet.__dict__[self.nom]
+        except KeyError:
+            raise AttributeError(self.nom)
+
+    def get_defaut(self, objet, classe):
+        """Retourne la valeur définie par la classe ou ses parents.
+
+        Si aucune classe ne définit l'attribut, lève AttributeError.
+
+        """
+        if self.defaut is not ABSENT:
+            return self.defaut
+
+        # On cherche dans les classes parentes de celle portant ce descripteur
+        trouve = False
+        for parent in classe.__mro__:
+            if not trouve:
+                trouve = parent.__dict__.get(self.nom) is self
+                continue
+
+            if self.nom in parent.__dict__:
+                defaut = parent.__dict__[self.nom]
+                if isinstance(defaut, Reference):
+                    return defaut.__get__(objet, classe)
+
+                return defaut
+
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+                classe.__name__, self.nom))
@@ -0,0 +1,156 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier définit la classe Registre, détaillée plus bas."""
+
+from weakref import WeakKeyDictionary
+
+class Registre:
+
+    """Registre des objets enregistrés, classés par type.
+
+    Chaque classe possède son dictionnaire {id(objet): objet}, ce qui
+    permet d'ajouter et de retirer un objet en temps constant (un objet
+    détruit est retiré, voir BaseObj.detruire). L'ordre d'ajout est
+    conservé.
+
+    Un index des sous-classes ({classe: classes héritées ayant des
+    objets, elle comprise}) est tenu à jour quand une classe reçoit son
+    premier objet : récupérer les objets d'un groupe (voir groupe) ne
+    parcourt donc que les classes concernées. Les classes héritées
+    sont elles aussi référencées faiblement (chaque classe figurant
+    parmi ses propres classes héritées), dans l'ordre de leur premier
+    objet.
+
+    Les objets sont référencés directement : le registre est ce qui les
+    garde en vie jusqu'à l'enregistrement. Les classes sont en revanche
+    référencées faiblement : une classe remplacée (au rechargement d'un
+    module) et qui n'a plus d'objets disparaît du registre.
+
+    """
+
+    def __init__(self):
+        self.par_classe = WeakKeyDictionary()
+        self.sous_classes = WeakKeyDictionary()
+        self.nb = 0
+
+    def __repr__(self):
+        return "<Registre ({} objets)>".format(self.nb)
+
+    def __len__(self):
+        return self.nb
+
+    def __contains__(self, objet):
+        objets = self.par_classe.get(type(objet))
+        return objets is not None and id(objet) in objets
+
+    def __iter__(self):
+        for objets in list(self.par_classe.values()):
+            yield from list(objets.values())
+
+    def values(self):
+        """Retourne la liste de tous les objets."""
+        return list(self)
+
+    def ajouter(self, objet):
+        """Ajoute l'objet au registre.
+
+        On retourne True si l'objet a été ajouté, False s'il y était déjà.
+
+        """
+        classe = type(objet)
+        objets = self.par_classe.get(classe)
+        if objets is None:
+            objets = self.par_classe[classe] = {}
+            self.indexer(classe)
+        elif id(objet) in objets:
+            return False
+
+        objets[id(objet)] = objet
+        self.nb += 1
+        return True
+
+    def retirer(self, objet):
+        """Retire l'objet du registre s'il s'y trouve."""
+        objets = self.par_classe.get(type(objet))
+        if objets is not None and objets.pop(id(objet), None) is not None:
+            self.nb -= 1
+
+    def indexer(self, classe):
+        """Ajoute la classe à l'index de ses classes-mères."""
+        for base in classe.__mro__:
+            if base is object:
+                continue
+
+            classes = self.sous_classes.get(base)
+            if classes is None:
+                classes = self.sous_classes[base] = WeakKeyDictionary()
+
+            classes[classe] = None
+
+    def groupe(self, classe):
+        """Retourne les objets de la classe et de ses classes héritées."""
+        objets = []
+        for sous_classe in list(self.sous_classes.get(classe, ())):
+            objets.extend(self.par_classe.get(sous_classe, {}).values())
+
+        return objets
+
+    def premier(self, classe):
+        """Retourne le premier objet ajouté de la classe ou None.
+
+        Seule la classe elle-même est considérée (pas ses classes
+        héritées).
+
+        """
+        for objet in self.par_classe.get(classe, {}).values():
+            return objet
+
+        return None
+
+    def vider(self, classe=None):
+        """Retire les objets de la classe ou tous les objets.
+
+        On retourne la liste des objets retirés.
+
+        """
+        if classe is None:
+            retires = self.values()
+            self.par_classe.clear()
+            self.sous_classes.clear()
+            self.nb = 0
+            return retires
+
+        retires = list(self.par_classe.get(classe, {}).values())
+        for objet in retires:
+            self.retirer(objet)
+
+        return retires
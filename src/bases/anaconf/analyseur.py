@@ -42,6 +42,22 @@ Si ces chaînes font référence à des objets, fonctions, méthodes, elles doiv
 import os
 import sys
 
+# Types dont les valeurs peuvent être conservées par l'analyseur
+TYPES_IMMUABLES = (bool, int, float, complex, str, bytes, type(None))
+
+def est_immuable(valeur):
+    """Retourne True si la valeur ne peut être modifiée.
+
+    Les tuples et frozensets sont immuables si leurs éléments le sont.
+
+    """
+    if isinstance(valeur, TYPES_IMMUABLES):
+        return True
+    elif isinstance(valeur, (tuple, frozenset)):
+        return all(est_immuable(element) for element in valeur)
+
+    return False
+
 class Analyseur:
 
     """Analyseur de fichiers de configuration.
@@ -92,6 +108,18 @@ class Analyseur:
         Autrement dit, analyseur.port appellera eval("3933")
         Cela est rendu possible par la redéfinition de __getattribute__
 
+    Pour ne pas réinterpréter les données à chaque accès, l'analyseur
+    conserve :
+    -   le code compilé de chaque donnée déjà interprétée ;
+    -   la valeur des données immuables (nombres, chaînes, tuples...).
+        Les listes ou dictionnaires sont réinterprétés à chaque accès,
+        afin que chaque appelant en obtienne une copie.
+    Ces valeurs sont oubliées quand les globales sont modifiées ou qu'une
+    donnée est redéfinie. Recharger le fichier revient à créer un nouvel
+    analyseur, sans valeurs conservées. Les données volontairement
+    variables (qui font appel à 'randrange' par exemple) doivent être
+    signalées grâce à la méthode '_set_dynamiques'.
+
     """
     def __init__(self, nom_fichier, nom_defaut, defaut, logger,
             debug=False):
@@ -128,6 +156,9 @@ class Analyseur:
             'on': True,
             'off': False,
         }
+        self._codes = {} # {nom: code compilé}
+        self._valeurs = {} # {nom: valeur immuable}
+        self._dynamiques = set() # noms des données réinterprétées
         self._logger = logger
         self._logger.filtrer_niveau("warning")
         # On cherche le fichier pour commencer
@@ -178,15 +209,38 @@ class Analyseur:
 
     def __getattribute__(self, nom):
         """Retourne l'évaluation de la donnée de configuration."""
-        if nom.startswith("_") or not object.__getattribute__(self, nom):
+        if nom.startswith("_"):
             return object.__getattribute__(self, nom)
+
+        valeurs = object.__getattribute__(self, "_valeurs")
+        if nom in valeurs:
+            return valeurs[nom]
+
+        attribut = object.__getattribute__(self, nom)
+        if not attribut:
+            return attribut
         elif nom in self.__dict__.keys():
-            attribut = object.__getattribute__(self, nom)
-            return eval(attribut, self._globales)
+            code = self._codes.get(nom)
+            if code is None:
+                code = compile(attribut, nom, "eval")
+                self._codes[nom] = code
+
+            valeur = eval(code, self._globales)
+            if nom not in self._dynamiques and est_immuable(valeur):
+                valeurs[nom] = valeur
+
+            return valeur
         else:
             raise ValueError("La donnée '{}' n'a pu être trouvée dans " \
                     "cette configuration".format(nom))
 
+    def __setattr__(self, nom, valeur):
+        """Redéfinit une donnée, en oubliant son interprétation."""
+        object.__setattr__(self, nom, valeur)
+        if not nom.startswith("_"):
+            self._codes.pop(nom, None)
+            self._valeurs.pop(nom, None)
+
     def _set_globales(self, globales):
         """Paramètre les globales, données sous la forme d'un dictionnaires.
 
@@ -200,5 +254,25 @@ class Analyseur:
         >>> analyseur.hasard # contient randrange(8)
         6
 
+        Les valeurs déjà interprétées sont oubliées, puisqu'elles
+        peuvent dépendre des globales.
+        Notez qu'une donnée comme 'hasard' doit être réinterprétée à
+        chaque accès : voir '_set_dynamiques'.
+
         """
         self._globales.update(globales)
+        self._valeurs.clear()
+
+    def _set_dynamiques(self, *noms):
+        """Signale des données à réinterpréter à chaque accès.
+
+        Par défaut, les données immuables ne sont interprétées qu'une
+        fois. Si une donnée fait appel à une fonction dont le résultat
+        change (comme 'randrange'), il faut la signaler ici.
+        >>> analyseur._set_globales({"randrange": random.randrange})
+        >>> analyseur._set_dynamiques("hasard")
+
+        """
+        self._dynamiques.update(noms)
+        for nom in noms:
+            self._valeurs.pop(nom, None)
@@ -52,6 +52,7 @@ inconnue pour l'importeur.
 
 """
 
+from contextlib import nullcontext
 from imp import reload
 import importlib
 import os
@@ -60,7 +61,8 @@ import traceback
 import py_compile
 
 from abstraits.module import *
-from abstraits.obase import BaseObj, objets_base
+from abstraits.obase import BaseObj, objets_base, plans_migration
+from bases.importeur.profil import ProfilDemarrage
 from corps.arborescence import getcwd
 
 # Constantes
@@ -93,6 +95,10 @@ class Importeur:
     py_modules = {}
     sauvegarde = True
     espace = {}
+    redefinitions = {} # {nom_methode: (module, ...)}
+    profil = None # profil du démarrage (voir ProfilDemarrage)
+    differes = [] # modules secondaires dont le chargement est différé
+    demarre = False # le démarrage est terminé
 
     def __init__(self, parser_cmd, anaconf, man_logs, serveur,
             sauvegarde=True):
@@ -120,10 +126,29 @@ class Importeur:
         Importeur.serveur = serveur
         Importeur.logger = man_logs.creer_logger("", "importeur", "")
         Importeur.sauvegarde = sauvegarde
+        if parser_cmd is not None and "profil-demarrage" in parser_cmd:
+            Importeur.profil = ProfilDemarrage()
+
         BaseObj.importeur = self
         __builtins__["importeur"] = self
         type(self).espace["importeur"] = self
 
+    def __getattr__(self, nom):
+        """Charge le module différé demandé.
+
+        Cette méthode n'est appelée que si l'attribut n'existe pas. Un
+        module dont le chargement est différé (voir
+        'modules_differes' dans la configuration globale) est chargé au
+        premier accès, si le démarrage est terminé.
+
+        """
+        if nom in Importeur.differes and Importeur.demarre:
+            self.charger_differe(nom)
+            return self.__dict__[nom]
+
+        raise AttributeError("l'importeur n'a pas d'attribut {}".format(
+                repr(nom)))
+
     def __str__(self):
         """Retourne sous une forme un peu plus lisible les modules importés."""
         ret = []
@@ -137,18 +162,37 @@ class Importeur:
         """Méthode appelée pour charger les modules primaires et secondaires.
         Par défaut, on importe tout mais on ne crée rien.
 
+        Les modules secondaires précisés dans la configuration globale
+        ('modules_differes') sont importés mais ne sont créés qu'une fois
+        le démarrage terminé (voir charger_differe) : leurs classes
+        d'objets enregistrés doivent être connues quand supenr charge
+        la sauvegarde.
+
         """
+        conf_glb = Importeur.anaconf.get_config("globale")
         # On commence par parcourir les modules primaires
         Importeur.logger.debug("Chargement des modules :")
         for nom_package in os.listdir(getcwd() + "/" + REP_PRIMAIRES):
             if not nom_package.startswith("__"):
-                self.charger_module("primaire", nom_package)
+                with self.mesurer("importation", nom_package):
+                    self.charger_module("primaire", nom_package)
                 Importeur.logger.debug("  Le module {0} a été chargé".format( \
                         nom_package))
         # On fait de même avec les modules secondaires
         for nom_package in os.listdir(getcwd() + "/" + REP_SECONDAIRES):
-            if not nom_package.startswith("__"):
-                self.charger_module("secondaire", nom_package)
+            if nom_package in conf_glb.modules_differes:
+                # Le package est importé sans être gardé dans py_modules :
+                # charger_differe ne doit pas le recharger
+                with self.mesurer("importation", nom_package):
+                    importlib.import_module(REP_SECONDAIRES + "." + \
+                            nom_package)
+                if nom_package not in Importeur.differes:
+                    Importeur.differes.append(nom_package)
+                Importeur.logger.debug("  Le module {0} sera créé " \
+                        "après le démarrage".format(nom_package))
+            elif not nom_package.startswith("__"):
+                with self.mesurer("importation", nom_package):
+                    self.charger_module("secondaire", nom_package)
                 Importeur.logger.debug("  Le module {0} a été chargé".format( \
                         nom_package))
 
@@ -208,6 +252,8 @@ class Importeur:
                 Importeur.logger.debug("  Le module {0} a été " \
                         "instancié".format(nom_module))
 
+        Importeur.redefinitions.clear()
+
     def executer_script(self, script=None):
         """Exécute le script spécifié."""
         if script:
@@ -237,14 +283,16 @@ class Importeur:
             if hasattr(self, nom_module): # le module est chargé
                 module = getattr(self, nom_module)
                 if module.statut == INSTANCIE:
-                    module.config()
+                    with self.mesurer("configuration", nom_module):
+                        module.config()
                     Importeur.logger.debug("  Le module {0} a été " \
                             "configuré".format(nom_module))
         # Configuration des modules restants
         Importeur.logger.debug("Configuration des modules restants :")
         for module in self.__dict__.values():
             if module.statut == INSTANCIE:
-                module.config()
+                with self.mesurer("configuration", module.nom):
+                    module.config()
                 Importeur.logger.debug("  Le module {0} a été " \
                         "configuré".format(module.nom))
 
@@ -266,7 +314,8 @@ class Importeur:
             if hasattr(self, nom_module): # le module est chargé
                 module = getattr(self, nom_module)
                 if module.statut == CONFIGURE:
-                    module.init()
+                    with self.mesurer("initialisation", nom_module):
+                        module.init()
                     Importeur.logger.debug("  Le module {0} a été " \
                             "initialisé".format(nom_module))
 
@@ -280,7 +329,8 @@ class Importeur:
         Importeur.logger.debug("Initialisation des modules non spécifiés :")
         for module in self.__dict__.values():
             if module.statut == CONFIGURE and module.nom not in a_initialiser:
-                module.init()
+                with self.mesurer("initialisation", module.nom):
+                    module.init()
                 Importeur.logger.debug("  Le module {0} a été " \
                         "initialisé".format(module.nom))
 
@@ -290,20 +340,23 @@ class Importeur:
             if hasattr(self, nom_module): # le module est chargé
                 module = getattr(self, nom_module)
                 if module.statut == CONFIGURE:
-                    module.init()
+                    with self.mesurer("initialisation", nom_module):
+                        module.init()
                     Importeur.logger.debug("  Le module {0} a été " \
                             "initialisé".format(nom_module))
 
         for module in self.__dict__.values():
             if module.statut == INITIALISE:
-                module.ajouter_commandes()
+                with self.mesurer("commandes", module.nom):
+                    module.ajouter_commandes()
 
     def tout_preparer(self):
         """Méthode permettant de préparer tous les modules.
 
         """
         Importeur.logger.debug("Préparation des modules :")
-        self.supenr.preparer()
+        with self.mesurer("préparation", "supenr"):
+            self.supenr.preparer()
         prepares = [self.supenr]
         for module in self.__dict__.values():
             if module not in prepares and module.statut == INITIALISE:
@@ -312,16 +365,20 @@ class Importeur:
                     if autre_m in prepares:
                         continue
 
-                    autre_m.preparer()
+                    with self.mesurer("préparation", autre):
+                        autre_m.preparer()
                     prepares.append(autre_m)
                     Importeur.logger.debug("  Le module {0} a été " \
                             "préparé".format(autre))
 
-                module.preparer()
+                with self.mesurer("préparation", module.nom):
+                    module.preparer()
                 prepares.append(module)
                 Importeur.logger.debug("  Le module {0} a été " \
                         "préparé".format(module.nom))
 
+        Importeur.demarre = True
+
     def tout_detruire(self):
         """Méthode permettant de détruire tous les modules qui en ont besoin.
         Les modules à détruire sont ceux initialisés.
@@ -359,6 +416,8 @@ class Importeur:
                     Importeur.logger.debug("  Le module {0} a été " \
                             "détruit".format(nom_module))
 
+        Importeur.redefinitions.clear()
+
     def tout_arreter(self):
         """Méthode permettant d'arrêter tous les modules.
         Cette méthode ne doit être appelée qu'en cas d'arrêt complet du MUD,
@@ -388,6 +447,7 @@ class Importeur:
         res = False
         Importeur.nb_hotboot += 1
         objets_base.clear()
+        plans_migration.clear()
         try:
              for nom_package in os.listdir(getcwd() + "/" + REP_PRIMAIRES):
                  if not nom_package.startswith("__"):
@@ -413,10 +473,123 @@ class Importeur:
         Elle doit faire appel à la méthode boucle de chaque module primaire
         ou secondaire.
 
+        Seuls les modules redéfinissant la méthode boucle sont appelés.
+
         """
-        for module in self.__dict__.values():
+        for module in self.get_redefinitions("boucle"):
             module.boucle()
 
+        # Les modules différés sont chargés un par un
+        if Importeur.differes and Importeur.demarre:
+            nom = Importeur.differes[0]
+            try:
+                self.charger_differe(nom)
+            except Exception:
+                Importeur.logger.fatal("Le module différé {} n'a pas pu " \
+                        "être chargé".format(nom))
+                Importeur.logger.fatal(traceback.format_exc())
+
+    def delai_boucle(self, maximum):
+        """Retourne le temps pendant lequel la boucle synchro peut attendre.
+
+        On interroge chaque module (voir BaseModule.delai_boucle). Le
+        délai retourné ne dépasse pas 'maximum'.
+
+        """
+        delai = maximum
+        for module in self.get_redefinitions("delai_boucle"):
+            d_module = module.delai_boucle()
+            if d_module is not None and d_module < delai:
+                delai = max(d_module, 0)
+
+        return delai
+
+    def get_redefinitions(self, nom_methode):
+        """Retourne les modules instanciés redéfinissant la méthode indiquée.
+
+        Le résultat est gardé en cache jusqu'au prochain chargement ou
+        déchargement de module.
+
+        """
+        modules = Importeur.redefinitions.get(nom_methode)
+        if modules is None:
+            defaut = getattr(BaseModule, nom_methode)
+            modules = tuple(m for m in self.__dict__.values() if \
+                    isinstance(m, BaseModule) and \
+                    getattr(type(m), nom_methode) is not defaut)
+            Importeur.redefinitions[nom_methode] = modules
+
+        return modules
+
+    def mesurer(self, phase, nom):
+        """Mesure la phase du module si le démarrage est profilé.
+
+        On retourne un gestionnaire de contexte (voir
+        ProfilDemarrage.mesurer).
+
+        """
+        if Importeur.profil is None:
+            return nullcontext()
+
+        return Importeur.profil.mesurer(phase, nom)
+
+    def ecrire_profil(self):
+        """Écrit le rapport du profil de démarrage, s'il est actif.
+
+        Le premier appel marque la fin du démarrage. Le rapport est
+        réécrit quand le dernier module différé a été chargé (voir
+        charger_differe).
+
+        """
+        if Importeur.profil is None:
+            return
+
+        if Importeur.profil.fin is None:
+            Importeur.profil.terminer()
+
+        chemin = Importeur.parser_cmd["profil-demarrage"]
+        try:
+            Importeur.profil.ecrire(chemin)
+        except OSError as err:
+            Importeur.logger.warning("Le profil de démarrage n'a pas pu " \
+                    "être écrit dans {} : {}".format(chemin, err))
+        else:
+            Importeur.logger.info("Profil de démarrage écrit dans " \
+                    "{}".format(chemin))
+
+    def charger_differe(self, nom):
+        """Crée, configure, initialise et prépare un module différé.
+
+        Le package a déjà été importé au démarrage (voir tout_charger).
+        Le module est d'abord retiré des modules différés. Cette méthode
+        est appelée au premier accès au module (voir __getattr__) ou,
+        une fois le démarrage terminé, à chaque tour de boucle jusqu'à
+        ce que tous les modules différés soient chargés (voir boucle).
+        Le profil de démarrage est alors réécrit.
+
+        """
+        if nom in Importeur.differes:
+            Importeur.differes.remove(nom)
+
+        try:
+            with self.mesurer("chargement différé", nom):
+                self.charger_module("secondaire", nom)
+                module = getattr(self, nom)
+                module.config()
+                module.init()
+                module.ajouter_commandes()
+                # Les modules à préparer avant sont déjà préparés, sauf
+                # s'ils sont eux-mêmes différés (getattr les charge)
+                for autre in module.preparer_apres:
+                    getattr(self, autre)
+                module.preparer()
+        finally:
+            if not Importeur.differes:
+                self.ecrire_profil()
+
+        Importeur.logger.info("Le module différé {} a été chargé".format(
+                nom))
+
     def module_est_charge(self, nom):
         """Retourne True si le module est déjà chargé, False sinon.
         On n'a pas besoin du type du module, les modules primaires
@@ -454,6 +627,7 @@ class Importeur:
         type(self).py_modules[py_chemin] = module
         c_module = getattr(module, "Module")
         setattr(self, nom, c_module(self))
+        Importeur.redefinitions.clear()
 
     def decharger_module(self, m_type, nom):
         """Méthode permettant de décharger un module.
@@ -467,6 +641,7 @@ class Importeur:
         if self.module_est_charge(nom):
             getattr(self, nom).detruire()
             delattr(self, nom)
+            Importeur.redefinitions.clear()
         else:
             print("{0} n'est pas dans les attributs de l'importeur".format(nom))
 
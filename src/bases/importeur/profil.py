@@ -0,0 +1,123 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier définit la classe ProfilDemarrage, détaillée plus bas."""
+
+from contextlib import contextmanager
+import time
+
+class ProfilDemarrage:
+
+    """Profil du démarrage des modules.
+
+    Le profil mesure le temps (réel) passé par chaque module dans
+    chaque phase du démarrage (importation, configuration,
+    initialisation, ajout des commandes, préparation). Il est créé
+    par l'importeur si l'option --profil-demarrage est précisée en
+    ligne de commande et le rapport est écrit à la fin du démarrage
+    (voir rapport et ecrire). Si des modules sont différés, il est
+    réécrit une fois qu'ils sont tous chargés.
+
+    """
+
+    def __init__(self):
+        self.debut = time.time()
+        self.fin = None # fin du démarrage (voir terminer)
+        self.phases = [] # noms des phases, dans l'ordre
+        self.durees = {} # {phase: {module: durée}}
+
+    def __repr__(self):
+        return "<ProfilDemarrage ({} phases)>".format(len(self.phases))
+
+    @contextmanager
+    def mesurer(self, phase, module):
+        """Mesure la durée de la phase pour le module."""
+        if phase not in self.durees:
+            self.phases.append(phase)
+            self.durees[phase] = {}
+
+        debut = time.time()
+        try:
+            yield
+        finally:
+            durees = self.durees[phase]
+            durees[module] = durees.get(module, 0) + time.time() - debut
+
+    def terminer(self):
+        """Marque la fin du démarrage.
+
+        Les modules différés, chargés ensuite, ne sont pas comptés dans
+        la durée du démarrage (ils ont leur propre phase).
+
+        """
+        self.fin = time.time()
+
+    def rapport(self, nb_modules=10):
+        """Retourne le rapport sous la forme d'une chaîne.
+
+        Pour chaque phase, on affiche sa durée et les nb_modules
+        modules les plus lents. On affiche ensuite la durée totale
+        de chaque module, toutes phases confondues.
+
+        """
+        fin = time.time() if self.fin is None else self.fin
+        lignes = ["Démarrage en {:.3f}s".format(fin - self.debut)]
+        for phase in self.phases:
+            durees = self.durees[phase]
+            total = sum(durees.values())
+            lignes.append("")
+            lignes.append("{} : {:.3f}s ({} modules)".format(phase, total,
+                    len(durees)))
+            for module, duree in sorted(durees.items(),
+                    key=lambda d: d[1], reverse=True)[:nb_modules]:
+                lignes.append("  {:<20} {:8.3f}s".format(module, duree))
+
+        modules = {}
+        for durees in self.durees.values():
+            for module, duree in durees.items():
+                modules[module] = modules.get(module, 0) + duree
+
+        lignes.append("")
+        lignes.append("Par module :")
+        for module, duree in sorted(modules.items(), key=lambda d: d[1],
+                reverse=True):
+            detail = ", ".join("{} {:.3f}s".format(phase,
+                    self.durees[phase][module]) for phase in self.phases \
+                    if module in self.durees[phase])
+            lignes.append("  {:<20} {:8.3f}s ({})".format(module, duree,
+                    detail))
+
+        return "\n".join(lignes)
+
+    def ecrire(self, chemin):
+        """Écrit le rapport dans le fichier indiqué."""
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            fichier.write(self.rapport() + "\n")
@@ -78,6 +78,8 @@ class ParserCMD(dict):
         # - i (interactif) : console interactive
         # - l (chemin-logs) : chemin d'enregistrement des logs
         # - p (port) : port d'écoute du serveur
+        # - profil-demarrage : chemin du rapport du profil de démarrage
+        #                      (option longue uniquement)
         # - r (script) : script avant préparation
         # - s 'serveur) : lancer le serveur (on ou off)
         flags_courts = "c:de:hi:l:p:r:s:"
@@ -89,6 +91,7 @@ class ParserCMD(dict):
                 "interactif=",
                 "chemin-logs=",
                 "port=",
+                "profil-demarrage=",
                 "script",
                 "serveur=",
         ]
@@ -132,6 +135,8 @@ class ParserCMD(dict):
                     sys.exit(1)
                 else:
                     self["port"] = port
+            elif nom == "--profil-demarrage":
+                self["profil-demarrage"] = val
             elif nom in ["-d", "--debug"]:
                 self["debug"] = True
                 print("Lancement du MUD en mode debug (sans échec).")
@@ -165,5 +170,7 @@ class ParserCMD(dict):
             "-i, interactif : lance Kassie en mode débuggage interactif\n" \
             "-l, chemin-logs\n" \
             "-p, port : paramètre le port d'écoute du serveur\n" \
+            "--profil-demarrage : écrit le temps de démarrage de chaque " \
+            "module dans le fichier précisé\n" \
             "-r, script : paramètre le script à exécuter au lancement\n" \
             "-s, serveur (on ou off) : lance ou arrête le serveur")
@@ -0,0 +1,112 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Banc d'essai de l'échéancier des actions différées.
+
+Ce script programme puis annule un grand nombre d'actions différées
+(100 000 par défaut) et mesure le temps passé dans chaque étape.
+L'ancien algorithme (liste réordonnée à chaque ajout) est mesuré
+sur un plus petit nombre d'actions, à titre de comparaison.
+
+Usage : python bench_diffact.py [nombre_actions]
+
+"""
+
+import random
+import sys
+import time
+
+from primaires.diffact.action_differee import ActionDifferee
+from primaires.diffact.echeancier import Echeancier
+
+def rien():
+    pass
+
+class Liste:
+
+    """Reproduction de l'ancien stockage des actions différées."""
+
+    def __init__(self):
+        self.actions = {}
+        self.ordre_actions = []
+
+    def ajouter(self, action):
+        self.actions[action.nom] = action
+        self.ordre_actions = [nom for nom in self.ordre_actions \
+            if self.actions[nom] <= action] + [action.nom] + \
+            [nom for nom in self.ordre_actions if self.actions[nom] > action]
+
+    def retirer(self, nom):
+        del self.actions[nom]
+        del self.ordre_actions[self.ordre_actions.index(nom)]
+
+    def extraire(self, moment):
+        if self.ordre_actions:
+            nom = self.ordre_actions[0]
+            action = self.actions[nom]
+            if action.echeance <= moment:
+                self.retirer(nom)
+                return action
+
+        return None
+
+def mesurer(conteneur, nb):
+    """Mesure l'ajout, l'annulation et l'extraction de nb actions."""
+    aleatoire = random.Random(nb)
+    actions = [ActionDifferee(str(i), aleatoire.uniform(0, 3600), rien) \
+            for i in range(nb)]
+    annulees = aleatoire.sample([a.nom for a in actions], nb // 2)
+
+    debut = time.perf_counter()
+    for action in actions:
+        conteneur.ajouter(action)
+    ajout = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    for nom in annulees:
+        conteneur.retirer(nom)
+    retrait = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    extraites = 0
+    moment = time.time() + 3600
+    while conteneur.extraire(moment) is not None:
+        extraites += 1
+    extraction = time.perf_counter() - debut
+
+    assert extraites == nb - len(annulees)
+    print("  {:>7} actions : ajout {:.3f}s, annulation {:.3f}s, " \
+            "extraction {:.3f}s".format(nb, ajout, retrait, extraction))
+
+nb = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+print("Échéancier (tas binaire) :")
+mesurer(Echeancier(), nb)
+print("Ancienne liste ordonnée :")
+mesurer(Liste(), min(nb, 5000))
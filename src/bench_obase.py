@@ -0,0 +1,150 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Banc d'essai de l'accès aux attributs des objets de base (BaseObj).
+
+Ce script mesure la lecture et l'écriture d'attributs d'une salle
+et d'un personnage, avec l'implémentation actuelle de BaseObj (seuls les
+attributs référençant des objets sont vérifiés, voir Reference) puis
+avec l'ancienne (qui redéfinissait __getattribute__ pour vérifier
+chaque attribut lu et passait par la propriété 'construit' à chaque
+écriture).
+
+Les objets sont créés sans leur constructeur (qui a besoin des modules
+chargés) : seuls les attributs lus sont renseignés.
+
+Usage : python bench_obase.py [nombre_acces]
+
+"""
+
+import builtins
+import sys
+import time
+
+from abstraits.obase import BaseObj, CONSTRUIT, references
+from abstraits.obase.reference import Reference
+from primaires.perso.personnage import Personnage
+from primaires.perso.stats import Stats
+from primaires.salle.salle import Salle
+
+class Supenr:
+
+    """Supenr minimal, qui ne retient pas les objets modifiés."""
+
+    def ajouter_objet(self, objet):
+        pass
+
+class Importeur:
+
+    """Importeur minimal, donnant accès au supenr."""
+
+    supenr = Supenr()
+
+builtins.importeur = Importeur()
+
+# Ancienne implémentation
+def ancien_getattribute(self, nom_attr):
+    objet = object.__getattribute__(self, nom_attr)
+    if hasattr(objet, "e_existe") and not objet.e_existe:
+        return None
+
+    return objet
+
+def ancien_setattr(self, attr, valeur):
+    object.__setattr__(self, attr, valeur)
+    if self.construit:
+        importeur.supenr.ajouter_objet(self)
+
+def ancien_construit(self):
+    return hasattr(self, "_statut") and self._statut == CONSTRUIT
+
+def creer(classe, **attributs):
+    """Crée un objet sans appeler son constructeur."""
+    objet = classe.__new__(classe)
+    objet.__dict__.update(_statut=CONSTRUIT, e_existe=True,
+            _dict_version={}, **attributs)
+    return objet
+
+salle = creer(Salle, _nom_zone="depart", _mnemonic="1", titre="Une rue",
+        nom_terrain="ville", interieur=False, flags=0, magasin=None,
+        _personnages=[], decors=[], affections={})
+stats = creer(Stats, parent=None, _Stats__stats=[])
+personnage = creer(Personnage, nom="Kredh", _race=None, _prompt="",
+        equipement=None, affections={}, _salle=None, stats=stats)
+
+# La propriété 'salle' place le personnage dans la salle et renseigne
+# '_salle', attribut référençant un objet
+personnage.salle = salle
+LECTURES = (
+    (salle, ("titre", "flags", "interieur", "magasin", "_personnages",
+            "nom_terrain")),
+    (personnage, ("nom", "salle", "race", "affections", "_prompt")),
+)
+
+def mesurer(nb):
+    """Mesure nb lectures et écritures d'attributs."""
+    debut = time.perf_counter()
+    for i in range(nb):
+        for objet, noms in LECTURES:
+            for nom in noms:
+                getattr(objet, nom)
+    lecture = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    for i in range(nb):
+        salle.flags = i
+        personnage.nom = "Kredh"
+    ecriture = time.perf_counter() - debut
+    print("  {} lectures : {:.3f}s, {} écritures : {:.3f}s".format(
+            nb * 11, lecture, nb * 2, ecriture))
+
+nb = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+print("Implémentation actuelle :")
+mesurer(nb)
+
+# On retire les descripteurs Reference avant de mesurer l'ancienne
+# implémentation
+descripteurs = []
+for classe, noms in references.items():
+    for nom in noms:
+        if isinstance(classe.__dict__.get(nom), Reference):
+            descripteurs.append((classe, nom, classe.__dict__[nom]))
+            delattr(classe, nom)
+
+actuel = (BaseObj.__setattr__, BaseObj.construit)
+BaseObj.__getattribute__ = ancien_getattribute
+BaseObj.__setattr__ = ancien_setattr
+BaseObj.construit = property(ancien_construit)
+print("Ancienne implémentation :")
+mesurer(nb)
+del BaseObj.__getattribute__
+BaseObj.__setattr__, BaseObj.construit = actuel
+for classe, nom, descripteur in descripteurs:
+    setattr(classe, nom, descripteur)
@@ -0,0 +1,225 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+
+"""Banc d'essai de la couche numérique du scripting.
+
+Ce script compile quelques scripts représentatifs (calcul de dégâts,
+boucles, fonctions courantes de primaires.scripting.fonctions) puis
+mesure leur exécution :
+    avec la couche numérique (des entiers, et des fractions seulement
+    quand une division ne tombe pas juste) ;
+    avec des fractions partout, comme avant la couche numérique.
+
+Le code « fractions » est déduit du code généré : les entiers
+littéraux deviennent des fractions, les appels à diviser redeviennent
+des divisions et les fonctions retournent des fractions.
+
+Usage : python bench_scripting.py [nombre_executions]
+
+"""
+
+import ast
+import builtins
+from collections import OrderedDict
+from fractions import Fraction
+import sys
+import time
+
+class Supenr:
+
+    """Supenr minimal, qui ne retient pas les objets modifiés."""
+
+    def ajouter_objet(self, objet):
+        pass
+
+class Scripting:
+
+    """Module scripting minimal, qui ne retient que les statistiques."""
+
+    tps_fonctions = 1
+    nb_moy_fonctions = 0
+    moy_fonctions = 0
+    nb_exc_fonctions = 0
+    exc_fonctions = {}
+    nb_cache_succes = 0
+    nb_cache_echecs = 0
+
+class Importeur:
+
+    """Importeur minimal, donnant accès au supenr et au scripting."""
+
+    supenr = Supenr()
+    scripting = Scripting()
+
+builtins.importeur = Importeur()
+
+from primaires.scripting.instruction import Instruction
+from primaires.scripting.utile.fonctions import formatter
+from primaires.scripting.utile.nombres import diviser
+import primaires.scripting
+
+FONCTIONS = ("arrondir", "ent_alea", "intervalle", "liste", "longueur",
+        "puissance", "recuperer")
+
+SCRIPTS = {
+    "dégâts": """
+        force = ent_alea(20) + 10
+        degats = force * 3 / 2 - armure
+        bonus = ent_alea(6) / 2
+        degats = degats + bonus
+        degats = arrondir(degats)
+        si degats < 0:
+        degats = 0
+        finsi
+    """,
+    "boucle": """
+        total = 0
+        pour chaque i dans intervalle(1, 50):
+        total = total + i * 2 - 1
+        si total > 1000:
+        total = total / 4
+        finsi
+        fait
+    """,
+    "liste": """
+        poids = liste(3, 7, 12, 5, 9, 2)
+        somme = 0
+        pour chaque p dans poids:
+        somme = somme + puissance(p, 2)
+        fait
+        moyenne = somme / longueur(poids)
+        premier = recuperer(poids, 1) + moyenne
+    """,
+}
+
+class FonctionFraction:
+
+    """Fonction retournant des fractions, comme avant la couche numérique."""
+
+    def __init__(self, fonction):
+        self.fonction = fonction
+
+    def executer(self, evenement, *parametres):
+        methode = self.fonction.quelle_fonction(parametres)
+        retour = methode(*parametres)
+        if type(retour) is int:
+            retour = Fraction(retour)
+
+        return retour
+
+def charger_fonctions():
+    """Charge les fonctions utilisées par les scripts."""
+    fonctions = {}
+    for nom in FONCTIONS:
+        module = __import__("primaires.scripting.fonctions." + nom,
+                fromlist=["ClasseFonction"])
+        fonction = module.ClasseFonction
+        fonction.nom = nom
+        fonction._parametres_possibles = OrderedDict()
+        fonction.init_types()
+        fonction.convertir_types()
+        fonctions[nom] = fonction
+
+    return fonctions
+
+def compiler(script):
+    """Retourne le code Python du script, comme Test.calculer_cache."""
+    lignes = []
+    niveau = 0
+    for ligne in script.strip().splitlines():
+        ligne = ligne.strip()
+        instruction = Instruction.test_interpreter(ligne).construire(ligne)
+        instruction.deduire_niveau(niveau)
+        niveau = instruction.get_niveau_suivant()
+        lignes.append(" " * 4 * (instruction.niveau + 1) + \
+                instruction.code_python)
+
+    return "def script():\n" + "\n".join(lignes) + "\n    yield None"
+
+def en_fractions(code):
+    """Convertit le code généré pour qu'il calcule en fractions."""
+    arbre = ast.parse(code)
+    for noeud in ast.walk(arbre):
+        for champ, valeur in ast.iter_fields(noeud):
+            if isinstance(valeur, list):
+                setattr(noeud, champ, [remplacer(v) for v in valeur])
+            elif isinstance(valeur, ast.AST):
+                setattr(noeud, champ, remplacer(valeur))
+
+    return ast.unparse(ast.fix_missing_locations(arbre))
+
+def remplacer(noeud):
+    """Remplace un entier littéral ou un appel à diviser."""
+    if isinstance(noeud, ast.Constant) and type(noeud.value) is int:
+        return ast.Call(func=ast.Name(id="Fraction", ctx=ast.Load()),
+                args=[noeud], keywords=[])
+    if isinstance(noeud, ast.Call) and isinstance(noeud.func, ast.Name) \
+            and noeud.func.id == "diviser":
+        return ast.BinOp(left=noeud.args[0], op=ast.Div(),
+                right=noeud.args[1])
+
+    return noeud
+
+def mesurer(code, fonctions, variables, nb):
+    """Exécute nb fois le script et retourne la durée et les variables."""
+    globales = {
+        "fonctions": fonctions,
+        "variables": {},
+        "evt": None,
+        "Fraction": Fraction,
+        "diviser": diviser,
+        "formatter": formatter,
+    }
+    exec(compile(code, "<string>", "exec"), globales)
+    script = globales["script"]
+    debut = time.perf_counter()
+    for i in range(nb):
+        globales["variables"] = dict(variables)
+        for etape in script():
+            pass
+
+    return time.perf_counter() - debut, globales["variables"]
+
+nb = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+fonctions = charger_fonctions()
+fonctions_fractions = {nom: FonctionFraction(fonction) for nom, fonction in \
+        fonctions.items()}
+print("{} exécutions par script :".format(nb))
+for titre, script in SCRIPTS.items():
+    code = compiler(script)
+    numerique, variables = mesurer(code, fonctions, {"armure": 4}, nb)
+    fractions, _ = mesurer(en_fractions(code), fonctions_fractions,
+            {"armure": Fraction(4)}, nb)
+    types = sorted(set(type(v).__name__ for v in variables.values()))
+    print("  {} : numérique {:.3f}s, fractions {:.3f}s (x{:.1f}), " \
+            "types : {}".format(titre, numerique, fractions,
+            fractions / numerique, ", ".join(types)))
@@ -0,0 +1,123 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Banc d'essai de la sérialisation des objets de base (supenr).
+
+Ce script crée un univers de test (des coordonnées, des vecteurs et
+des sorties) puis mesure, pour chaque format, la taille des données et
+le temps de sérialisation et de restauration :
+    l'ancienne sauvegarde complète (un seul pickle de tous les objets) ;
+    la sérialisation par objet, avec pickle (Serialiseur, compact=False) ;
+    la sérialisation par objet, avec l'encodeur compact (Encodeur).
+
+Usage : python bench_supenr.py [nombre_salles]
+
+"""
+
+import builtins
+from collections import deque
+import pickle
+import sys
+import time
+
+from bases.logs import man_logs
+from primaires.salle.coordonnees import Coordonnees
+from primaires.salle.sortie import Sortie
+from primaires.supenr.serialiseur import Serialiseur
+from primaires.vehicule.vecteur import Vecteur
+
+class Supenr:
+
+    """Supenr minimal, qui ne retient pas les objets modifiés."""
+
+    def ajouter_objet(self, objet):
+        pass
+
+class Importeur:
+
+    """Importeur minimal, donnant accès au supenr."""
+
+    supenr = Supenr()
+
+builtins.importeur = Importeur()
+logger = man_logs.creer_logger("supenr", "bench_supenr")
+
+def creer_univers(nb):
+    """Crée nb coordonnées, chacune avec un vecteur et deux sorties."""
+    univers = []
+    for i in range(nb):
+        coordonnees = Coordonnees(i % 100, i // 100, -(i % 7))
+        vecteur = Vecteur(i * 0.5, -i, 3)
+        sorties = [Sortie("nord", "nord", corresp="sud"),
+                Sortie("est", "porte", "la", corresp="ouest")]
+        sorties[1].longueur = i % 5
+        univers.extend([coordonnees, vecteur] + sorties)
+
+    return univers
+
+def mesurer_complet(univers):
+    """Mesure la sauvegarde complète en un seul pickle."""
+    debut = time.perf_counter()
+    donnees = pickle.dumps(univers, pickle.HIGHEST_PROTOCOL)
+    serialisation = time.perf_counter() - debut
+    debut = time.perf_counter()
+    pickle.loads(donnees)
+    restauration = time.perf_counter() - debut
+    return len(donnees), serialisation, restauration
+
+def mesurer_serialiseur(univers, compact):
+    """Mesure la sérialisation par objet."""
+    serialiseur = Serialiseur(logger, compact)
+    debut = time.perf_counter()
+    enregistrements = serialiseur.serialiser(deque(univers))
+    serialisation = time.perf_counter() - debut
+    taille = sum(len(e[4]) for e in enregistrements)
+    schema = serialiseur.encodeur.schema()
+
+    restaure = Serialiseur(logger, compact)
+    restaure.encodeur.restaurer_schema(schema)
+    debut = time.perf_counter()
+    restaure.restaurer([(e[0], e[4]) for e in enregistrements])
+    restauration = time.perf_counter() - debut
+    return taille, serialisation, restauration
+
+nb = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+univers = creer_univers(nb)
+print("{} objets :".format(len(univers)))
+for titre, mesure in (
+        ("Sauvegarde complète (pickle)", lambda: mesurer_complet(univers)),
+        ("Par objet (pickle)", lambda: mesurer_serialiseur(univers, False)),
+        ("Par objet (compact)", lambda: mesurer_serialiseur(univers, True)),
+        ):
+    taille, serialisation, restauration = mesure()
+    print("  {} : {}o ({:.1f} o/objet), sérialisation : {:.3f}s, " \
+            "restauration : {:.3f}s".format(titre, taille,
+            taille / len(univers), serialisation, restauration))
@@ -95,6 +95,34 @@ nb_max_connectes = -1
 tps_attente_connexion = 0.05
 tps_attente_reception = 0.05
 
+# Boucle synchro par évènements
+# Si cette option est à True, le serveur attend en une seule fois les
+# connexions et messages des clients (grâce au module selectors, epoll
+# sous Linux) jusqu'à la prochaine action différée à exécuter. Les deux
+# temps d'attente ci-dessus sont alors ignorés : la boucle synchro ne
+# tourne que quand elle a du travail, mais n'attend jamais plus
+# longtemps que le temps d'attente maximum (en secondes).
+boucle_evenements = True
+tps_attente_max = 1
+
+# Boucle asyncio
+# Si cette option est à True, la boucle synchro est remplacée par une
+# boucle d'évènements asyncio, réveillée uniquement quand un client envoie
+# un message ou qu'une action différée doit être exécutée.
+boucle_asyncio = False
+
+# Tampon de sortie des clients
+# Ce qui ne peut être envoyé immédiatement à un client est placé dans un
+# tampon de sortie, d'une taille limitée (en octets). Un client qui ne lit
+# pas ce qu'on lui envoie ne peut ainsi pas bloquer le serveur. Quand le
+# tampon d'un client déborde, on peut :
+#   "ignorer" : ignorer les nouveaux messages jusqu'à ce que le tampon
+#               se vide
+#   "tronquer" : garder la partie du message qui tient dans le tampon
+#   "deconnecter" : déconnecter le client
+taille_tampon_sortie = 262144
+debordement_tampon = "deconnecter"
+
 
 ## Chemins d'accès
 
@@ -150,4 +178,15 @@ modules_a_detruire = []
 # chargés)
 modules_a_ignorer = []
 
+# Liste des modules secondaires dont le chargement est différé
+# Ces modules sont importés au démarrage (leurs objets enregistrés sont
+# chargés avec les autres) mais ne sont créés, configurés et initialisés
+# qu'une fois le MUD lancé, un par tour de boucle, ou au premier accès
+# (importeur.nom_module). Aucun autre module ne doit en avoir besoin
+# pendant le démarrage, et leurs objets enregistrés ne doivent pas faire
+# appel au module quand ils sont chargés.
+# Lancez le MUD avec l'option --profil-demarrage pour savoir quels modules
+# ralentissent le démarrage.
+modules_differes = []
+
 """
@@ -62,9 +62,14 @@ l'arrêt de Kassie. Survolez-le pour vous faire une idée des différentes
 
 Note : ce mécanisme de boucle synchro dispense d'utiliser des threads. Il est
 de ce fait facile de contrôler le flux d'instruction, de remonter aux erreurs
-et de faire des statistiques sur les performances du serveur. Un tour de
-boucle synchro se fait par défaut en un peu plus de 100 ms. Ce nombre peut
-varier en fonction de votre configuration mais également de votre système.
+et de faire des statistiques sur les performances du serveur. Par défaut,
+la boucle synchro attend les évènements réseau jusqu'à la prochaine action
+différée à exécuter : elle ne tourne que quand elle a du travail. Si
+l'option 'boucle_evenements' est désactivée, un tour de boucle synchro se
+fait en un peu plus de 100 ms. Ce nombre peut varier en fonction de votre
+configuration mais également de votre système. Si l'option 'boucle_asyncio'
+est activée, la boucle synchro est confiée à une boucle d'évènements asyncio
+(voir reseau/connexions/asynchrone.py).
 
 Référez-vous au site officiel www.kassie.fr pour plus d'informations.
 
@@ -76,6 +81,7 @@ import sys
 from lib import *
 
 from reseau.connexions.serveur import *
+from reseau.connexions.asynchrone import BoucleAsynchrone
 from reseau.fonctions.callbacks import *
 from bases.importeur import Importeur
 from bases.parser_cmd import ParserCMD
@@ -146,7 +152,9 @@ if "serveur" in parser_cmd.keys():
 # La plupart des informations se trouve dans la configuration globale
 serveur = ConnexionServeur(port, config_globale.nb_clients_attente, \
         config_globale.nb_max_connectes, config_globale.tps_attente_connexion,
-        config_globale.tps_attente_reception)
+        config_globale.tps_attente_reception, config_globale.tps_attente_max,
+        config_globale.boucle_evenements, config_globale.taille_tampon_sortie,
+        config_globale.debordement_tampon)
 
 # On crée l'importeur, gérant les différents modules (primaires et secondaires)
 importeur = Importeur(parser_cmd, anaconf, man_logs, serveur)
@@ -195,6 +203,8 @@ if "debug" not in parser_cmd.keys():
     importeur.executer_script(parser_cmd.get("script"))
     importeur.tout_preparer()
 
+importeur.ecrire_profil()
+
 # Création du thread pour la console interactive
 if console:
     thread = ThreadConsole(console)
@@ -206,11 +216,14 @@ if console:
 # sur le flux d'instructions.
 
 if __name__ == "__main__":
+    if config_globale.boucle_asyncio:
+        BoucleAsynchrone(serveur, importeur, console).lancer()
+
     while serveur.lance:
         if console:
             console.console.runcodes()
         importeur.boucle()
-        serveur.verifier_connexions()
-        serveur.verifier_receptions()
+        serveur.verifier_evenements(importeur.delai_boucle(
+                serveur.attente_maximum))
 
     arreter_MUD()
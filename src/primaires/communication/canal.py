@@ -254,12 +254,18 @@ class Canal(BaseObj):
         ex = self.clr + "[" + self.nom + "] " + message + "|ff|"
         im = self.clr + "<" + message + ">"
 
+        immerges = []
+        autres = []
+        joueurs_connectes = type(self).importeur.connex.joueurs_connectes
         for connecte in self.actuellement_connectes:
-            if connecte in type(self).importeur.connex.joueurs_connectes:
+            if connecte in joueurs_connectes:
                 if connecte in self.immerges:
-                    connecte << im
+                    immerges.append(connecte)
                 else:
-                    connecte << ex
+                    autres.append(connecte)
+
+        importeur.connex.diffuser(im, immerges)
+        importeur.connex.diffuser(ex, autres)
 
     def envoyer(self, joueur, message):
         """Envoie un message au canal"""
@@ -282,12 +288,18 @@ class Canal(BaseObj):
 
         importeur.communication.rapporter_conversation("[" + self.nom + "]",
                 joueur, message)
+        immerges = []
+        autres = []
         for connecte in self.actuellement_connectes:
             if connecte is not joueur:
                 importeur.communication.enregistrer_conversation(
                         self.clr + self.nom + "|ff|", connecte,
                         joueur, message)
                 if connecte in self.immerges:
-                    connecte << im
+                    immerges.append(connecte)
                 else:
-                    connecte << ex_autre
+                    autres.append(connecte)
+
+        # Le message n'est formaté qu'une fois par profil de client
+        importeur.connex.diffuser(im, immerges)
+        importeur.connex.diffuser(ex_autre, autres)
@@ -35,6 +35,7 @@ import hashlib
 import sys
 
 from abstraits.module import *
+from corps.fonctions import lisser as fn_lisser
 from primaires.connex.instance_connexion import InstanceConnexion
 from reseau.connexions.client_connecte import ClientConnecte
 from primaires.connex.compte import Compte
@@ -65,6 +66,9 @@ class Module(BaseModule):
         self.joueurs_bannis = []
         self.bannissements_temporaires = {}
         self.table_logger = importeur.man_logs.creer_logger("connex", "table")
+
+        # Dernier message diffusé et ses rendus {profil: message formaté}
+        self.derniere_diffusion = (None, {})
         type(importeur).espace["comptes"] = self.comptes
 
     def config(self):
@@ -185,6 +189,64 @@ class Module(BaseModule):
         for inst in self.instances.values():
             inst.envoyer_file_attente()
 
+    def delai_boucle(self):
+        """Si des messages attendent d'être envoyés, on ne patiente pas.
+
+        Les clients saturés ne sont pas pris en compte : le serveur
+        se réveillera quand ils seront prêts en écriture.
+
+        """
+        for inst in self.instances.values():
+            if inst.file_attente and not (inst.client and \
+                    inst.client.sature):
+                return 0
+
+        return None
+
+    def diffuser(self, message, joueurs, lisser=False):
+        """Envoie un même message à plusieurs joueurs.
+
+        Le message est traité comme le ferait Joueur.envoyer (sans
+        paramètres de formatage), mais il n'est formaté qu'une fois par
+        profil d'instance de connexion (voir InstanceConnexion.profil) :
+        les instances de même profil reçoivent le même objet bytes dans
+        leur file d'attente.
+
+        Les rendus du dernier message diffusé sont conservés, ce qui
+        permet de diffuser le même message dans plusieurs salles (un
+        navire, une perturbation météorologique) sans le reformater.
+
+        """
+        if not message:
+            return
+
+        message = message.format()
+        if lisser:
+            message = fn_lisser(message)
+
+        dernier, rendus = self.derniere_diffusion
+        if message != dernier:
+            rendus = {}
+            self.derniere_diffusion = (message, rendus)
+
+        for joueur in joueurs:
+            instance = joueur.instance_connexion
+            if instance is None:
+                continue
+
+            # Les instances redéfinissant 'envoyer' le gardent
+            if type(instance).envoyer is not InstanceConnexion.envoyer:
+                instance.envoyer(message)
+                continue
+
+            profil = instance.profil
+            formate = rendus.get(profil)
+            if formate is None:
+                formate = instance.formater_message(message)
+                rendus[profil] = formate
+
+            instance.envoyer_formate(formate)
+
     def __getitem__(self, item):
         """Méthode appelée quand on fait connex[item].
         L'item peut être de plusieurs types :
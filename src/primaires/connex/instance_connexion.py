@@ -32,6 +32,7 @@
 
 from abstraits.obase import BaseObj
 from primaires.format.fonctions import *
+from primaires.format.rendu import get_rendu
 from .motd import MOTD
 
 import telnetlib as tlib
@@ -42,6 +43,9 @@ OPTIONS = {
     "hello": tlib.IAC + tlib.AYT,
 }
 
+# Nombre de messages gardés en attente pour un client saturé
+MAX_FILE_ATTENTE = 100
+
 class InstanceConnexion(BaseObj):
 
     """Classe représentant une instance de connexion.
@@ -209,28 +213,36 @@ class InstanceConnexion(BaseObj):
         cfg_charte = type(self.importeur).anaconf.get_config("charte_graph")
 
         # Si le compte le spécifie, on supprime les codes couleurs
-        if self.compte and not self.compte.couleur:
-            msg = supprimer_couleurs(msg)
-
-        # On convertit tout en bytes, c'est plus simple ainsi
-        # On doit déduire l'encodage qui sera éventuellement utilisé
-        encodage = self.encodage
-        msg = get_bytes(msg, encodage)
+        encodage, couleur, sup_accents, aff_sp_cars = self.profil
+
+        # Le rendu compilé remplace, en une seule passe, les couleurs, les
+        # caractères spéciaux, les accents (si l'option du contexte est
+        # activée) et les sauts de ligne
+        if isinstance(msg, str):
+            # Sans encodage précisé, on supprime les accents
+            rendu = get_rendu(cfg_charte, couleur, not aff_sp_cars,
+                    sup_accents or not encodage)
+            msg = rendu.rendre(msg).encode(encodage or "utf-8",
+                    errors="replace")
+        else:
+            rendu = get_rendu(cfg_charte, couleur, not aff_sp_cars,
+                    sup_accents)
+            msg = rendu.rendre(msg)
 
-        # Ajout de la couleur
-        msg = ajouter_couleurs(msg, cfg_charte)
+        return msg
 
-        if not self.contexte_actuel.opts.aff_sp_cars:
-            # On remplace les caractères spéciaux
-            msg = remplacer_sp_cars(msg)
+    @property
+    def profil(self):
+        """Retourne le profil de formatage de l'instance.
 
-        # Suppression des accents si l'option du contexte est activée
-        if self.contexte_actuel.opts.sup_accents:
-            msg = supprimer_accents(msg)
-        # On remplace les sauts de ligne
-        msg = convertir_nl(msg)
+        Il s'agit d'un tuple (encodage, couleur, sup_accents,
+        aff_sp_cars) : deux instances de même profil obtiennent le même
+        message formaté (voir formater_message).
 
-        return msg
+        """
+        opts = self.contexte_actuel.opts
+        couleur = not self.compte or bool(self.compte.couleur)
+        return (self.encodage, couleur, opts.sup_accents, opts.aff_sp_cars)
 
     def envoyer(self, msg, nl=2):
         """Envoie au client le message.
@@ -253,6 +265,17 @@ class InstanceConnexion(BaseObj):
         msg = self.formater_message(msg)
         self.file_attente.append((nl, msg))
 
+    def envoyer_formate(self, msg, nl=2):
+        """Envoie au client un message déjà formaté.
+
+        Le message (de type bytes) est placé tel quel dans la file
+        d'attente : il peut donc être partagé entre plusieurs instances
+        de même profil (voir le module connex, méthode 'diffuser').
+
+        """
+        self.nb_msg += 1
+        self.file_attente.append((nl, msg))
+
     def get_prompt(self):
         """Méthode retournant le prompt déduit du contexte.
         Le prompt retourné est encodé.
@@ -295,7 +318,16 @@ class InstanceConnexion(BaseObj):
         On ajoute le prompt à la fine d'attente si ajt_prompt est à True et
         si self.avec_prompt.
 
+        Si le client n'a pas encore reçu les derniers messages (son
+        tampon de sortie n'est pas vide), on garde la file d'attente pour
+        la lui envoyer en une seule fois quand il sera prêt, sauf si elle
+        devient trop longue. On n'envoie ainsi qu'un prompt.
+
         """
+        if self.client and self.client.sature and ajt_prompt and \
+                len(self.file_attente) < MAX_FILE_ATTENTE:
+            return
+
         if self.file_attente:
             msg = self.get_file_attente()
             self.file_attente = []
@@ -36,6 +36,9 @@ import traceback
 from abstraits.module import *
 from primaires.scripting.exceptions import InterrompreCommande
 from .action_differee import ActionDifferee
+from .echeancier import Echeancier
+from .periodique import Periodique
+from .roue import Roue
 
 class Module(BaseModule):
 
@@ -72,14 +75,25 @@ class Module(BaseModule):
     il faut prévoir un retard d'exécution maximum à peu près équivalent au
     temps moyen du Watch Dog.
 
+    Les actions en attente sont conservées dans un échéancier (voir
+    la classe Echeancier) : l'ajout et le retrait d'une action se font
+    en temps logarithmique, quel que soit le nombre d'actions en attente.
+
+    Les actions à répéter à intervalle régulier (les ticks, par exemple)
+    n'ont pas besoin de se reprogrammer elles-mêmes : il suffit de les
+    ajouter une fois avec la méthode 'ajouter_periodique'. Elles sont
+    conservées dans une roue temporelle (voir la classe Roue) et
+    reprogrammées automatiquement après chaque exécution.
+
     """
 
     def __init__(self, importeur):
         """Constructeur du module"""
         BaseModule.__init__(self, importeur, "diffact", "primaire")
         self.id_unique = 1
-        self.actions = {} # {nom_action:action_differee}
-        self.ordre_actions = [] # [nom_action]
+        self.echeancier = Echeancier()
+        self.periodiques = {} # {nom_periodique: periodique}
+        self.roue = Roue(time.time())
         self.longues = []
         self.logger = type(self.importeur).man_logs.creer_logger("diffact", \
                 "diffact")
@@ -92,6 +106,11 @@ class Module(BaseModule):
 
         BaseModule.init(self)
 
+    @property
+    def actions(self):
+        """Retourne le dictionnaire {nom_action: action_differee}."""
+        return self.echeancier.actions
+
     def boucle(self):
         """Redéfinition de la méthode boucle du Module.
 
@@ -101,6 +120,25 @@ class Module(BaseModule):
         """
         self.mettre_a_jour_actions()
 
+    def delai_boucle(self):
+        """Retourne le temps avant la prochaine action à exécuter."""
+        echeance = self.prochaine_echeance()
+        if echeance is None:
+            return None
+
+        return echeance - time.time()
+
+    def prochaine_echeance(self):
+        """Retourne l'échéance de la prochaine action (ou None).
+
+        L'échéance des actions périodiques est arrondie au pas de la roue
+        et peut être légèrement anticipée.
+
+        """
+        echeances = [e for e in (self.echeancier.prochaine_echeance(),
+                self.roue.prochaine_echeance()) if e is not None]
+        return min(echeances) if echeances else None
+
     def ajouter_action(self, nom_action, tps, ref_fonc, *args, **kwargs):
         """Cette méthode permet d'ajouter une action différée à la liste
         de celles en attente. On précise :
@@ -115,68 +153,106 @@ class Module(BaseModule):
             nom_action = str(self.id_unique)
             self.id_unique += 1
 
-        if nom_action in self.ordre_actions:
+        if nom_action in self.echeancier:
             self.logger.warning("L'action différée {} existe déjà. " \
                     "L'ancienne sera écrasée.".format(nom_action))
             self.retirer_action(nom_action)
 
         action = ActionDifferee(nom_action, tps, ref_fonc, *args, **kwargs)
-        self.actions[nom_action] = action
-        # On ordonne les actions correctement
-        self.ordre_actions = [nom for nom in self.ordre_actions \
-            if self.actions[nom] <= action] + [nom_action] + \
-            [nom for nom in self.ordre_actions if self.actions[nom] > action]
-
-
+        self.echeancier.ajouter(action)
 
     def retirer_action(self, nom, warning=True):
         """Méthode permettant de retirer une action différée de la liste de
         celles en attente.
 
         """
-        if not nom in self.ordre_actions:
-            if not warning:
-                return
-
+        if self.echeancier.retirer(nom) is None and warning:
             self.logger.warning("L'action différée {0} devant être " \
                     "supprimée n'existe pas".format(nom))
+
+    def ajouter_periodique(self, nom, intervalle, ref_fonc, *args,
+            delai=None, **kwargs):
+        """Ajoute une action périodique.
+
+        On précise :
+        -   le nom de l'action (nom unique, servant d'identifiant)
+        -   l'intervalle entre deux exécutions en secondes
+        -   la référence vers la fonction ou la méthode à exécuter
+        -   les paramètres non nommés organisés en tuple
+        -   les paramètres nommés organisés dans un dictionnaire
+
+        Le paramètre nommé 'delai' permet de préciser le temps
+        d'attente avant la première exécution (par défaut, l'intervalle).
+
+        """
+        if nom in self.periodiques:
+            self.logger.warning("L'action périodique {} existe déjà. " \
+                    "L'ancienne sera écrasée.".format(nom))
+            self.retirer_periodique(nom)
+
+        if delai is None:
+            delai = intervalle
+
+        periodique = Periodique(nom, intervalle, delai, ref_fonc, *args,
+                **kwargs)
+        self.periodiques[nom] = periodique
+        self.roue.ajouter(periodique)
+
+    def retirer_periodique(self, nom, warning=True):
+        """Retire une action périodique."""
+        periodique = self.periodiques.pop(nom, None)
+        if periodique is None:
+            if warning:
+                self.logger.warning("L'action périodique {0} devant être " \
+                        "supprimée n'existe pas".format(nom))
         else:
-            del self.actions[nom]
-            del self.ordre_actions[self.ordre_actions.index(nom)]
+            self.roue.retirer(periodique)
 
     def mettre_a_jour_actions(self):
         """Cette méthode se charge de mettre à jour les actions différées en
-        attente d'être exécutées. Elle parcourt la liste des actions en
-        attente et exécute celle qui doivent l'être, tout en les supprimant
-        de la liste.
+        attente d'être exécutées. Elle extrait de l'échéancier les actions
+        arrivées à échéance et les exécute.
+
+        Les actions ajoutées pendant ce tour (par une action exécutée,
+        par exemple) ne seront exécutées qu'au tour suivant.
 
         """
-        for nom in self.ordre_actions:
-            action = self.actions.get(nom)
-            if action is None or action.doit_exec():
-                # On la supprime avant toute chose
-                self.retirer_action(nom)
-                # On l'exécute ensuite
-                if action is None:
-                    continue
-
-                t1 = time.time()
-                try:
-                    action.executer()
-                except InterrompreCommande:
-                    pass
-                except Exception:
-                    self.logger.fatal("Une erreur s'est produite lors " \
-                            "de l'exécution de l'action {}.".format(
-                            action.nom))
-                    self.logger.fatal(traceback.format_exc())
-                finally:
-                    t2 = time.time()
-                    tps = round(t2 - t1, 3)
-                    if tps > 0.3:
-                        self.longues.append((nom, tps))
-            else:
-                break
+        moment = time.time()
+        limite = self.echeancier.numero
+        action = self.echeancier.extraire(moment, limite)
+        while action is not None:
+            self.executer_action(action)
+            action = self.echeancier.extraire(moment, limite)
+
+        for periodique in self.roue.avancer(moment):
+            # L'action a pu être retirée par une action exécutée avant
+            if self.periodiques.get(periodique.nom) is not periodique:
+                continue
+
+            self.executer_action(periodique)
+
+            # L'action a pu être retirée pendant son exécution
+            if self.periodiques.get(periodique.nom) is periodique:
+                periodique.reprogrammer(moment)
+                self.roue.ajouter(periodique)
+
+    def executer_action(self, action):
+        """Exécute une action différée ou périodique."""
+        t1 = time.time()
+        try:
+            action.executer()
+        except InterrompreCommande:
+            pass
+        except Exception:
+            self.logger.fatal("Une erreur s'est produite lors " \
+                    "de l'exécution de l'action {}.".format(
+                    action.nom))
+            self.logger.fatal(traceback.format_exc())
+        finally:
+            t2 = time.time()
+            tps = round(t2 - t1, 3)
+            if tps > 0.3:
+                self.longues.append((action.nom, tps))
 
     def stats_diffact(self, infos):
         """Ajoute les stats concernant les actions différées."""
@@ -192,6 +268,10 @@ class Module(BaseModule):
 
         # Messages des stats
         msg = "|tit|Actions différées :|ff|"
+        msg += "\n  Actions en attente : {}".format(len(self.echeancier))
+        msg += "\n  Actions périodiques : {} ({} exécutions sautées)".format(
+                len(self.periodiques), sum(p.nb_sautees for p in \
+                self.periodiques.values()))
         msg += "\n  Actions longues (>0,3s) : {}".format(nb_longues)
         msg += "\n  Actions les plus gourmandes :\n"
 
@@ -0,0 +1,134 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Ce fichier définit la classe Echeancier, détaillée plus bas."""
+
+import heapq
+
+# Constantes
+MIN_COMPACTAGE = 64
+
+class Echeancier:
+
+    """Cette classe conserve les actions différées en attente.
+
+    Les actions sont rangées dans un tas binaire (voir le module heapq)
+    ordonné par échéance puis par ordre d'ajout. L'ajout d'une action
+    et l'extraction de la plus proche se font donc en O(log n).
+
+    Le retrait est paresseux : l'action est simplement oubliée du
+    dictionnaire 'actions' et son entrée dans le tas sera ignorée quand
+    elle en atteindra le sommet. Quand les entrées obsolètes deviennent
+    majoritaires, le tas est reconstruit.
+
+    """
+
+    def __init__(self):
+        """Constructeur de l'échéancier."""
+        self.actions = {} # {nom_action: action_differee}
+        self.tas = [] # [(echeance, numero, action_differee)]
+        self.numero = 0
+        self.obsoletes = 0
+
+    def __len__(self):
+        return len(self.actions)
+
+    def __contains__(self, nom):
+        return nom in self.actions
+
+    def ajouter(self, action):
+        """Ajoute une action différée.
+
+        Si une action de même nom existe déjà, elle est remplacée.
+
+        """
+        if action.nom in self.actions:
+            self.obsoletes += 1
+
+        self.actions[action.nom] = action
+        self.numero += 1
+        heapq.heappush(self.tas, (action.echeance, self.numero, action))
+
+    def retirer(self, nom):
+        """Retire l'action nommée et la retourne (ou None)."""
+        action = self.actions.pop(nom, None)
+        if action is not None:
+            self.obsoletes += 1
+            if self.obsoletes >= MIN_COMPACTAGE and \
+                    self.obsoletes * 2 > len(self.tas):
+                self.compacter()
+
+        return action
+
+    def compacter(self):
+        """Reconstruit le tas sans les entrées obsolètes."""
+        actions = self.actions
+        self.tas = [e for e in self.tas if actions.get(e[2].nom) is e[2]]
+        heapq.heapify(self.tas)
+        self.obsoletes = 0
+
+    def _nettoyer_sommet(self):
+        """Retire du sommet du tas les entrées obsolètes."""
+        tas = self.tas
+        actions = self.actions
+        while tas and actions.get(tas[0][2].nom) is not tas[0][2]:
+            heapq.heappop(tas)
+            self.obsoletes -= 1
+
+    def prochaine_echeance(self):
+        """Retourne l'échéance de la prochaine action (ou None)."""
+        self._nettoyer_sommet()
+        if self.tas:
+            return self.tas[0][0]
+
+        return None
+
+    def extraire(self, moment, limite=None):
+        """Retire et retourne la prochaine action échue à 'moment'.
+
+        Si 'limite' est précisé, les actions ajoutées après que le
+        numéro d'ajout a atteint cette limite sont ignorées. Cela
+        permet de ne pas exécuter, dans un même tour de boucle, les
+        actions ajoutées par une action en cours d'exécution.
+
+        Si aucune action n'est échue, retourne None.
+
+        """
+        self._nettoyer_sommet()
+        if not self.tas:
+            return None
+
+        echeance, numero, action = self.tas[0]
+        if echeance > moment or (limite is not None and numero > limite):
+            return None
+
+        heapq.heappop(self.tas)
+        del self.actions[action.nom]
+        return action
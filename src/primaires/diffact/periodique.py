@@ -0,0 +1,89 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Ce fichier définit la classe Periodique, détaillée plus bas."""
+
+import math
+import time
+
+from bases.fonction import Fonction
+
+class Periodique:
+
+    """Cette classe représente une action périodique.
+
+    À la différence d'une action différée (voir ActionDifferee), une
+    action périodique n'est pas détruite après son exécution : elle est
+    reprogrammée par le module diffact lui-même. Elle possède :
+    -   un nom identifiant (str)
+    -   un intervalle en secondes (float)
+    -   une prochaine échéance sous la forme d'un timestamp (float)
+    -   une fonction telle que décrite dans bases.fonction avec une liste
+        d'arguments
+
+    La prochaine échéance est calculée à partir de la précédente et non
+    de l'heure d'exécution : le retard de la boucle synchro ne s'accumule
+    donc pas d'une exécution à l'autre. Si la boucle a pris plus d'un
+    intervalle de retard, les exécutions manquées sont sautées.
+
+    """
+
+    def __init__(self, nom, intervalle, delai, ref_fonc, *args, **kwargs):
+        """Constructeur de l'action périodique."""
+        if intervalle <= 0:
+            raise ValueError("l'intervalle d'une action périodique doit " \
+                    "être positif")
+
+        self.nom = nom
+        self.intervalle = intervalle
+        self.echeance = time.time() + delai
+        self.fonction = Fonction(ref_fonc, *args, **kwargs)
+        self.position = None # (niveau, case) dans la roue
+        self.nb_executions = 0
+        self.nb_sautees = 0
+
+    def __repr__(self):
+        return "<Periodique {} toutes les {}s>".format(repr(self.nom),
+                self.intervalle)
+
+    def executer(self):
+        """Exécution de la fonction. On redirige vers self.fonction.exec()."""
+        self.nb_executions += 1
+        self.fonction.executer()
+
+    def reprogrammer(self, moment):
+        """Calcule la prochaine échéance après 'moment'."""
+        echeance = self.echeance + self.intervalle
+        if echeance <= moment:
+            sautees = math.floor((moment - echeance) / self.intervalle) + 1
+            echeance += sautees * self.intervalle
+            self.nb_sautees += sautees
+
+        self.echeance = echeance
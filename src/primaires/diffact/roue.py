@@ -0,0 +1,179 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Ce fichier définit la classe Roue, détaillée plus bas."""
+
+import math
+
+# Constantes
+RESOLUTION = 0.1 # durée d'une case du premier niveau (en secondes)
+TAILLE = 64 # nombre de cases par niveau
+NIVEAUX = 4 # nombre de niveaux
+
+class Roue:
+
+    """Roue temporelle hiérarchique pour les actions périodiques.
+
+    La roue découpe le temps en pas de 'resolution' secondes. Le premier
+    niveau contient une case par pas, le second une case par tour
+    complet du premier, et ainsi de suite. Une action est rangée dans le
+    niveau le plus fin capable de contenir son échéance ; quand le temps
+    atteint une case d'un niveau supérieur, ses actions descendent vers
+    les niveaux inférieurs. L'ajout et le retrait se font en temps
+    constant, l'avancée de la roue en temps proportionnel au nombre de
+    pas écoulés et d'actions échues.
+
+    Les objets placés dans la roue doivent posséder un attribut
+    'echeance' (timestamp) et un attribut 'position' réservé à la roue.
+
+    """
+
+    def __init__(self, moment, resolution=RESOLUTION, taille=TAILLE,
+            niveaux=NIVEAUX):
+        """Constructeur de la roue, démarrant à 'moment'."""
+        self.resolution = resolution
+        self.taille = taille
+        self.niveaux = [[set() for i in range(taille)] \
+                for j in range(niveaux)]
+        self.pas = int(moment / resolution)
+        self.echues = []
+        self.nb_actions = 0
+
+    def __len__(self):
+        return self.nb_actions
+
+    def ajouter(self, action):
+        """Ajoute une action dans la roue."""
+        self.nb_actions += 1
+        self._placer(action)
+
+    def retirer(self, action):
+        """Retire une action de la roue."""
+        if action.position is None:
+            return
+
+        niveau, case = action.position
+        if niveau is None:
+            self.echues.remove(action)
+        else:
+            self.niveaux[niveau][case].discard(action)
+
+        action.position = None
+        self.nb_actions -= 1
+
+    def _placer(self, action):
+        """Range l'action dans la case correspondant à son échéance."""
+        pas = math.ceil(action.echeance / self.resolution)
+        ecart = pas - self.pas
+        if ecart <= 0:
+            action.position = (None, None)
+            self.echues.append(action)
+            return
+
+        taille = self.taille
+        dernier = len(self.niveaux) - 1
+        niveau = 0
+        portee = taille
+        while ecart >= portee and niveau < dernier:
+            niveau += 1
+            portee *= taille
+
+        if ecart >= portee:
+            # Au-delà de la roue, on range dans la case la plus lointaine
+            pas = self.pas + portee - 1
+
+        case = (pas // taille ** niveau) % taille
+        action.position = (niveau, case)
+        self.niveaux[niveau][case].add(action)
+
+    def avancer(self, moment):
+        """Fait avancer la roue jusqu'à 'moment'.
+
+        Retourne la liste des actions échues, qui sont retirées de
+        la roue.
+
+        """
+        cible = int(moment / self.resolution)
+        taille = self.taille
+        while self.pas < cible:
+            self.pas += 1
+            pas = self.pas
+
+            # Descente des niveaux supérieurs, du plus haut au plus bas
+            for niveau in range(len(self.niveaux) - 1, 0, -1):
+                periode = taille ** niveau
+                if pas % periode == 0:
+                    cases = self.niveaux[niveau]
+                    case = (pas // periode) % taille
+                    actions = cases[case]
+                    cases[case] = set()
+                    for action in actions:
+                        self._placer(action)
+
+            cases = self.niveaux[0]
+            case = pas % taille
+            if cases[case]:
+                actions = cases[case]
+                cases[case] = set()
+                for action in actions:
+                    # Les actions au-delà de la roue sont replacées
+                    self._placer(action)
+
+        echues = self.echues
+        self.echues = []
+        for action in echues:
+            action.position = None
+        self.nb_actions -= len(echues)
+        echues.sort(key=lambda a: a.echeance)
+        return echues
+
+    def prochaine_echeance(self):
+        """Retourne le moment du prochain pas à traiter (ou None).
+
+        Ce moment n'est jamais postérieur à la prochaine échéance, mais
+        peut la précéder : si seules les cases des niveaux supérieurs
+        contiennent des actions, on retourne le moment où le premier
+        niveau termine son tour, quand les actions doivent descendre.
+
+        """
+        if self.echues:
+            return self.pas * self.resolution
+
+        taille = self.taille
+        cases = self.niveaux[0]
+        for i in range(1, taille + 1):
+            if cases[(self.pas + i) % taille]:
+                return (self.pas + i) * self.resolution
+
+        for cases in self.niveaux[1:]:
+            if any(cases):
+                return (self.pas // taille + 1) * taille * self.resolution
+
+        return None
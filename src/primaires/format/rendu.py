@@ -0,0 +1,174 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Ce fichier définit la classe Rendu, détaillée plus bas.
+
+Il définit également la fonction get_rendu, qui retourne le rendu compilé
+correspondant à une charte graphique et à des options de formatage.
+
+"""
+
+import re
+
+from primaires.format.fonctions import ACCENTS, COULEURS_STR, \
+        sp_cars_a_remplacer
+
+# Raccourcis de mise en forme {balise: nom de l'option de la charte}
+RACCOURCIS = {
+    "|tit|": "couleur_titre",
+    "|cmd|": "couleur_cmd",
+    "|ent|": "couleur_entree",
+    "|att|": "couleur_attention",
+    "|err|": "couleur_erreur",
+}
+
+# Rendus déjà compilés {(charte, options): rendu}
+RENDUS = {}
+
+class Rendu:
+
+    """Rendu compilé des messages envoyés aux clients.
+
+    Plutôt que d'appliquer successivement plusieurs remplacements (les
+    raccourcis de mise en forme, les couleurs, les caractères spéciaux
+    et les accents), on construit à la création du rendu une table de
+    remplacement unique et une expression régulière qui trouve, en une
+    seule passe, toutes les balises à remplacer. Le message est découpé
+    sur ces balises, qui sont remplacées d'après la table, puis rassemblé.
+    Les sauts de ligne sont enfin convertis (voir convertir_nl).
+
+    Le rendu accepte des messages 'str' ou 'bytes' : une table est
+    construite pour chaque type, la première fois qu'on en a besoin.
+
+    """
+
+    def __init__(self, couleurs, couleur=True, sp_cars=True, accents=False):
+        """Constructeur du rendu.
+
+        Paramètres :
+            couleurs -- un dictionnaire {raccourci: couleur} (voir RACCOURCIS)
+            couleur -- convertir les couleurs en ANSI (sinon, les retirer)
+            sp_cars -- remplacer les caractères spéciaux échappés
+            accents -- supprimer les accents
+
+        """
+        table = {}
+        for balise, valeur in couleurs.items():
+            if couleur:
+                for clr, code_ansi in COULEURS_STR.items():
+                    valeur = valeur.replace(clr, code_ansi)
+            else:
+                valeur = ""
+
+            table[balise] = valeur
+
+        for balise, code_ansi in COULEURS_STR.items():
+            table[balise] = code_ansi if couleur else ""
+
+        if sp_cars:
+            table.update(sp_cars_a_remplacer)
+
+        if accents:
+            table.update(ACCENTS)
+
+        self.table = table
+        self.compiles = {}
+
+    @staticmethod
+    def get_motif(balises):
+        """Retourne le motif de l'expression régulière.
+
+        Les balises de la forme |xx| sont regroupées derrière un seul
+        signe |, ce qui accélère sensiblement la recherche.
+
+        """
+        codes = [balise[1:-1] for balise in balises if len(balise) > 2 and \
+                balise.startswith("|") and balise.endswith("|")]
+        autres = [re.escape(balise) for balise in balises if \
+                balise[1:-1] not in codes]
+
+        # Les balises les plus longues sont testées en premier
+        codes.sort(key=len, reverse=True)
+        autres.sort(key=len, reverse=True)
+        alternatives = autres
+        if codes:
+            alternatives.insert(0, r"\|(?:" + "|".join(re.escape(code) \
+                    for code in codes) + r")\|")
+
+        return "(" + "|".join(alternatives) + ")"
+
+    def compiler(self, type_message):
+        """Compile le rendu pour le type précisé (str ou bytes)."""
+        motif = self.get_motif(list(self.table.keys()))
+        if type_message is bytes:
+            table = {cle.encode(): valeur.encode() for cle, valeur in \
+                    self.table.items()}
+            compilation = (re.compile(motif.encode()), table, b"", b"\n",
+                    b"\r\n")
+        else:
+            compilation = (re.compile(motif), self.table, "", "\n", "\r\n")
+
+        self.compiles[type_message] = compilation
+        return compilation
+
+    def rendre(self, message):
+        """Retourne le message transformé."""
+        type_message = type(message)
+        compilation = self.compiles.get(type_message)
+        if compilation is None:
+            compilation = self.compiler(type_message)
+
+        expression, table, vide, nl, nl_client = compilation
+        morceaux = expression.split(message)
+
+        # Les balises trouvées sont aux indices impairs
+        morceaux[1::2] = map(table.__getitem__, morceaux[1::2])
+        return vide.join(morceaux).replace(nl, nl_client)
+
+
+def get_rendu(charte, couleur=True, sp_cars=True, accents=False):
+    """Retourne le rendu compilé pour la charte et les options précisées.
+
+    Les rendus sont conservés dans RENDUS : ils ne sont compilés qu'une
+    seule fois par charte graphique et combinaison d'options. Les valeurs
+    de la charte ne sont donc lues qu'à la compilation du rendu.
+
+    """
+    cle = (charte, couleur, sp_cars, accents)
+    rendu = RENDUS.get(cle)
+    if rendu is None:
+        couleurs = {}
+        for balise, option in RACCOURCIS.items():
+            couleurs[balise] = getattr(charte, option)
+
+        rendu = Rendu(couleurs, couleur, sp_cars, accents)
+        RENDUS[cle] = rendu
+
+    return rendu
@@ -101,8 +101,8 @@ class Module(BaseModule):
         # Ajout des actions différées pour chaque tick
         intervalle = 60 / NB_TICKS
         for no in self.ticks.keys():
-            self.importeur.diffact.ajouter_action("ptick_{}".format(no),
-                    intervalle * no, self.tick, no)
+            self.importeur.diffact.ajouter_periodique("ptick_{}".format(no),
+                    60, self.tick, no, delai=intervalle * no)
 
         BaseModule.init(self)
 
@@ -207,8 +207,6 @@ class Module(BaseModule):
 
     def tick(self, no):
         """Exécute un tick."""
-        self.importeur.diffact.ajouter_action("ptick_{}".format(no),
-                60, self.tick, no)
         for joueur in self.ticks[no]:
             joueur.tick()
 
@@ -96,6 +96,8 @@ class Module(BaseModule):
             min, max = self.cfg.temperatures[importeur.temps.temps.mois]
             self.temperature = randint(min, max)
 
+        self.importeur.diffact.ajouter_periodique("cycle_meteo", 60,
+                self.cycle_meteo)
         self.cycle_meteo()
 
     @property
@@ -103,9 +105,6 @@ class Module(BaseModule):
         return perturbations
 
     def cycle_meteo(self):
-        self.importeur.diffact.ajouter_action("cycle_meteo", 60,
-                self.cycle_meteo)
-
         # On tue les perturbations trop vieilles
         for pertu in self.perturbations_actuelles:
             pertu.tick()
@@ -214,8 +214,10 @@ class Module(BaseModule):
             self.logger.info("  Dont {} de type {}".format(nombre, nom))
 
         # Opérations de nettoyage cycliques
-        importeur.diffact.ajouter_action("net_boule de neige", 60,
+        importeur.diffact.ajouter_periodique("net_boule de neige", 60,
                 self.nettoyage_cyclique, "boule de neige")
+        importeur.diffact.ajouter_periodique("net_lumieres", 5,
+                self.nettoyage_lumieres)
         self.nettoyage_lumieres()
 
         # Réinitialisation des scripts des prototypes
@@ -360,8 +362,6 @@ class Module(BaseModule):
 
     def nettoyage_cyclique(self, nom_type):
         """Nettoyage cyclique, appelé toutes les minutes."""
-        importeur.diffact.ajouter_action("net_{}".format(nom_type), 60,
-                self.nettoyage_cyclique, nom_type)
         boule_neige = o_types["boule de neige"]
         prototypes = [p for p in self.prototypes.values() if \
                 isinstance(p, boule_neige)]
@@ -374,8 +374,6 @@ class Module(BaseModule):
 
     def nettoyage_lumieres(self):
         """Nettoyage cyclique des lmuières."""
-        importeur.diffact.ajouter_action("net_lumieres", 5,
-                self.nettoyage_lumieres)
         prototypes = [p for p in self.prototypes.values() if \
                 p.est_de_type("lumière")]
         objets = []
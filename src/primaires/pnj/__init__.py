@@ -30,8 +30,6 @@
 
 """Fichier contenant le module primaire pnj."""
 
-from fractions import Fraction
-
 from abstraits.module import *
 from primaires.perso.exceptions.action import ExceptionAction
 from primaires.pnj.chemin import CheminPNJ
@@ -73,13 +71,6 @@ class Module(BaseModule):
         type(importeur).espace["prototypes_pnj"] = self._prototypes
         type(importeur).espace["PNJ"] = self._PNJ
 
-        # Évènements de changement de temps
-        self.ch_minute = []
-        self.ch_heure = []
-        self.ch_jour = []
-        self.ch_mois = []
-        self.ch_annee = []
-
     def config(self):
         """Méthode de configuration du module"""
         importeur.hook.ajouter_hook("pnj:arrive",
@@ -109,20 +100,25 @@ class Module(BaseModule):
 
     def init(self):
         """Initialisation du module"""
+        # On suit les changements de temps scriptés dans les prototypes
+        for nom in ("minute", "heure", "jour", "mois", "année"):
+            importeur.scripting.abonnements.suivre(Prototype,
+                    "changer." + nom)
+
         prototypes = self.importeur.supenr.charger_groupe(Prototype)
         for prototype in prototypes:
             self._prototypes[prototype.cle] = prototype
             prototype.script.init()
 
+            # On ajoute le prototype au renouvellement automatique
+            importeur.scripting.abonnements.inscrire(prototype)
+
         pnjs = self.importeur.supenr.charger_groupe(PNJ)
         pnjs = [p for p in pnjs if hasattr(p, "identifiant") and \
                 p.prototype]
         for pnj in pnjs:
             self._PNJ[pnj.identifiant] = pnj
 
-            # On ajoute les PNJs au renouvellement automatique
-            self.inscrire_PNJ(pnj)
-
         chemins = self.importeur.supenr.charger_groupe(CheminPNJ)
         chemins = self.importeur.supenr.charger_groupe(CheminPNJ)
         for chemin in chemins:
@@ -131,8 +127,8 @@ class Module(BaseModule):
         # Ajout des actions différées pour chaque tick
         intervalle = 60 / NB_TICKS
         for no in self.ticks.keys():
-            self.importeur.diffact.ajouter_action("ntick_{}".format(no),
-                    intervalle * no, self.tick, no)
+            self.importeur.diffact.ajouter_periodique("ntick_{}".format(no),
+                    60, self.tick, no, delai=intervalle * no)
 
         importeur.perso.ajouter_talent("depecage", "dépeçage", "survie", 0.25)
 
@@ -218,6 +214,7 @@ class Module(BaseModule):
         """Supprime le prototype cle"""
         prototype = self._prototypes[cle]
         del self._prototypes[cle]
+        importeur.scripting.abonnements.desinscrire(prototype)
         prototype.detruire()
 
     def creer_PNJ(self, prototype, salle=None):
@@ -228,10 +225,6 @@ class Module(BaseModule):
 
         """
         pnj = PNJ(prototype, salle)
-
-        # On ajoute le PNJ au renouvellement automatique
-        self.inscrire_PNJ(pnj)
-
         self.ajouter_PNJ(pnj)
 
         if salle:
@@ -251,18 +244,6 @@ class Module(BaseModule):
         """Supprime le PNJ de la liste des PNJ."""
         pnj = self._PNJ[identifiant]
 
-        # On le retire des changements de temps
-        if pnj in self.ch_minute:
-            self.ch_minute.remove(pnj)
-        if pnj in self.ch_heure:
-            self.ch_heure.remove(pnj)
-        if pnj in self.ch_jour:
-            self.ch_jour.remove(pnj)
-        if pnj in self.ch_mois:
-            self.ch_mois.remove(pnj)
-        if pnj in self.ch_annee:
-            self.ch_annee.remove(pnj)
-
         # Appel de l'hook correspondant
         self.importeur.hook["pnj:détruit"].executer(pnj)
         del self._PNJ[identifiant]
@@ -292,8 +273,6 @@ class Module(BaseModule):
 
     def tick(self, no):
         """Exécute un tick."""
-        self.importeur.diffact.ajouter_action("ntick_{}".format(no),
-                60, self.tick, no)
 
         # On sélectionne les PNJ à tick
         pnj = list(self._PNJ.values())
@@ -364,103 +343,38 @@ class Module(BaseModule):
                 pnj.attaquer(personnage)
 
     def inscrire_PNJ(self, pnj):
-        """Inscrit le PNJ dans le changement de temps."""
-        if pnj.script["changer"]["minute"].tests:
-            if pnj not in self.ch_minute:
-                self.ch_minute.append(pnj)
-        elif pnj in self.ch_minute:
-            self.ch_minute.remove(pnj)
-
-        if pnj.script["changer"]["heure"].tests:
-            if pnj not in self.ch_heure:
-                self.ch_heure.append(pnj)
-        elif pnj in self.ch_heure:
-            self.ch_heure.remove(pnj)
-
-        if pnj.script["changer"]["jour"].tests:
-            if pnj not in self.ch_jour:
-                self.ch_jour.append(pnj)
-        elif pnj in self.ch_jour:
-            self.ch_jour.remove(pnj)
-
-        if pnj.script["changer"]["mois"].tests:
-            if pnj not in self.ch_mois:
-                self.ch_mois.append(pnj)
-        elif pnj in self.ch_mois:
-            self.ch_mois.remove(pnj)
-
-        if pnj.script["changer"]["année"].tests:
-            if pnj not in self.ch_annee:
-                self.ch_annee.append(pnj)
-        elif pnj in self.ch_annee:
-            self.ch_annee.remove(pnj)
+        """Inscrit le prototype du PNJ dans le changement de temps."""
+        importeur.scripting.abonnements.inscrire(pnj.prototype)
+
+    def changer_temps(self, temps, nom):
+        """Exécute l'évènement changer.nom des PNJ qui le scriptent.
+
+        Les abonnements sont tenus par prototype : seuls les PNJ des
+        prototypes scriptant l'évènement sont parcourus.
+
+        """
+        abonnements = importeur.scripting.abonnements
+        variables = abonnements.variables_temps(temps)
+        for prototype in abonnements.abonnes(Prototype, "changer." + nom):
+            for pnj in list(prototype.pnj):
+                pnj.script["changer"][nom].executer(pnj=pnj, **variables)
 
     def changer_minute(self, temps):
         """Hook appelé à chaque changement de minute."""
-        minute, heure, jour, mois, annee = temps.minute, temps.heure, \
-                temps.jour + 1, temps.mois + 1, temps.annee
-        minute = Fraction(minute)
-        heure = Fraction(heure)
-        jour = Fraction(jour)
-        mois = Fraction(mois)
-        annee = Fraction(annee)
-        for pnj in self.ch_minute:
-            pnj.script["changer"]["minute"].executer(pnj=pnj,
-                    minute=minute, heure=heure, jour=jour, mois=mois,
-                    annee=annee)
+        self.changer_temps(temps, "minute")
 
     def changer_heure(self, temps):
         """Hook appelé à chaque changement d'heure."""
-        minute, heure, jour, mois, annee = temps.minute, temps.heure, \
-                temps.jour + 1, temps.mois + 1, temps.annee
-        minute = Fraction(minute)
-        heure = Fraction(heure)
-        jour = Fraction(jour)
-        mois = Fraction(mois)
-        annee = Fraction(annee)
-        for pnj in self.ch_heure:
-            pnj.script["changer"]["heure"].executer(pnj=pnj,
-                    minute=minute, heure=heure, jour=jour, mois=mois,
-                    annee=annee)
+        self.changer_temps(temps, "heure")
 
     def changer_jour(self, temps):
         """Hook appelé à chaque changement de jour."""
-        minute, heure, jour, mois, annee = temps.minute, temps.heure, \
-                temps.jour + 1, temps.mois + 1, temps.annee
-        minute = Fraction(minute)
-        heure = Fraction(heure)
-        jour = Fraction(jour)
-        mois = Fraction(mois)
-        annee = Fraction(annee)
-        for pnj in self.ch_jour:
-            pnj.script["changer"]["jour"].executer(pnj=pnj,
-                    minute=minute, heure=heure, jour=jour, mois=mois,
-                    annee=annee)
+        self.changer_temps(temps, "jour")
 
     def changer_mois(self, temps):
         """Hook appelé à chaque changement de mois."""
-        minute, heure, jour, mois, annee = temps.minute, temps.heure, \
-                temps.jour + 1, temps.mois + 1, temps.annee
-        minute = Fraction(minute)
-        heure = Fraction(heure)
-        jour = Fraction(jour)
-        mois = Fraction(mois)
-        annee = Fraction(annee)
-        for pnj in self.ch_mois:
-            pnj.script["changer"]["mois"].executer(pnj=pnj,
-                    minute=minute, heure=heure, jour=jour, mois=mois,
-                    annee=annee)
+        self.changer_temps(temps, "mois")
 
     def changer_annee(self, temps):
         """Hook appelé à chaque changement d'année."""
-        minute, heure, jour, mois, annee = temps.minute, temps.heure, \
-                temps.jour + 1, temps.mois + 1, temps.annee
-        minute = Fraction(minute)
-        heure = Fraction(heure)
-        jour = Fraction(jour)
-        mois = Fraction(mois)
-        annee = Fraction(annee)
-        for pnj in self.ch_annee:
-            pnj.script["changer"]["annee"].executer(pnj=pnj,
-                    minute=minute, heure=heure, jour=jour, mois=mois,
-                    annee=annee)
+        self.changer_temps(temps, "année")
@@ -31,7 +31,6 @@
 """Fichier contenant le module primaire salle."""
 
 from datetime import datetime
-from fractions import Fraction
 from math import sqrt
 import re
 from random import random, randint
@@ -113,11 +112,6 @@ class Module(BaseModule):
         self.terrains = {}
         self.etendues = {}
         self.obstacles = {}
-        self.ch_minute = []
-        self.ch_heure = []
-        self.ch_jour = []
-        self.ch_mois = []
-        self.ch_annee = []
 
         # Liste des méthodes ajoutant des salles éventuelles à cartographier
         # Par exemple, un éventuel module secondaire de navigation ajoute à
@@ -210,6 +204,10 @@ class Module(BaseModule):
 
     def init(self):
         """Méthode d'initialisation du module"""
+        # On suit les changements de temps scriptés dans les salles
+        for nom in ("minute", "heure", "jour", "mois", "année"):
+            importeur.scripting.abonnements.suivre(Salle, "changer." + nom)
+
         # On récupère les salles
         salles = importeur.supenr.charger_groupe(Salle)
         for salle in salles:
@@ -269,9 +267,10 @@ class Module(BaseModule):
 
         importeur.diffact.ajouter_action("net_salles", 300,
                 self.nettoyer_salles)
-        importeur.diffact.ajouter_action("repop_salles", 900,
+        importeur.diffact.ajouter_periodique("repop_salles", 900,
                 self.repop_salles)
-        importeur.diffact.ajouter_action("repop_feux", 5, Feu.repop)
+        importeur.diffact.ajouter_periodique("repop_feux", 9, Feu.repop,
+                delai=5)
 
         # On ajoute les talents
         importeur.perso.ajouter_talent("collecte_bois", "collecte de bois",
@@ -282,8 +281,8 @@ class Module(BaseModule):
         # Ajout des actions différées pour chaque tick
         intervalle = 60 / NB_TICKS
         for no in self.ticks.keys():
-            self.importeur.diffact.ajouter_action("stick_{}".format(no),
-                    intervalle * no, self.tick, no)
+            self.importeur.diffact.ajouter_periodique("stick_{}".format(no),
+                    60, self.tick, no, delai=intervalle * no)
 
         # Ajout des hooks de changement de temps
         self.importeur.hook["temps:minute"].ajouter_evenement(
@@ -510,6 +509,7 @@ class Module(BaseModule):
         if coords.valide and coords.tuple() in self._coords.keys():
             del self._coords[coords.tuple()]
         del self._salles[cle]
+        importeur.scripting.abonnements.desinscrire(salle)
         salle.detruire()
 
     def creer_decor(self, cle):
@@ -718,8 +718,6 @@ class Module(BaseModule):
 
     def repop_salles(self):
         """Méthode chargée de repop les salles."""
-        importeur.diffact.ajouter_action("repop_salles", 900,
-                self.repop_salles)
         for s in self.salles.values():
             try:
                 s.repop()
@@ -751,8 +749,6 @@ class Module(BaseModule):
 
     def tick(self, no):
         """Exécute un tick."""
-        self.importeur.diffact.ajouter_action("stick_{}".format(no),
-                60, self.tick, no)
 
         # On sélectionne les salles à tick
         salles = list(self._salles.values())
@@ -867,102 +863,32 @@ class Module(BaseModule):
 
     def inscrire_salle(self, salle):
         """Inscrit la salle dans le changement de temps."""
-        if salle.script["changer"]["minute"].tests:
-            if salle not in self.ch_minute:
-                self.ch_minute.append(salle)
-        elif salle in self.ch_minute:
-            self.ch_minute.remove(salle)
-
-        if salle.script["changer"]["heure"].tests:
-            if salle not in self.ch_heure:
-                self.ch_heure.append(salle)
-        elif salle in self.ch_heure:
-            self.ch_heure.remove(salle)
-
-        if salle.script["changer"]["jour"].tests:
-            if salle not in self.ch_jour:
-                self.ch_jour.append(salle)
-        elif salle in self.ch_jour:
-            self.ch_jour.remove(salle)
-
-        if salle.script["changer"]["mois"].tests:
-            if salle not in self.ch_mois:
-                self.ch_mois.append(salle)
-        elif salle in self.ch_mois:
-            self.ch_mois.remove(salle)
-
-        if salle.script["changer"]["année"].tests:
-            if salle not in self.ch_annee:
-                self.ch_annee.append(salle)
-        elif salle in self.ch_annee:
-            self.ch_annee.remove(salle)
+        importeur.scripting.abonnements.inscrire(salle)
+
+    def changer_temps(self, temps, nom, exc_interruption=True):
+        """Exécute l'évènement changer.nom des salles qui le scriptent."""
+        abonnements = importeur.scripting.abonnements
+        variables = abonnements.variables_temps(temps)
+        for salle in abonnements.abonnes(Salle, "changer." + nom):
+            salle.script["changer"][nom].executer(salle=salle,
+                    exc_interruption=exc_interruption, **variables)
 
     def changer_minute(self, temps):
         """Hook appelé à chaque changement de minute."""
-        minute, heure, jour, mois, annee = temps.minute, temps.heure, \
-                temps.jour + 1, temps.mois + 1, temps.annee
-        minute = Fraction(minute)
-        heure = Fraction(heure)
-        jour = Fraction(jour)
-        mois = Fraction(mois)
-        annee = Fraction(annee)
-        for salle in self.ch_minute:
-            salle.script["changer"]["minute"].executer(salle=salle,
-                    minute=minute, heure=heure, jour=jour, mois=mois,
-                    annee=annee)
+        self.changer_temps(temps, "minute")
 
     def changer_heure(self, temps):
         """Hook appelé à chaque changement d'heure."""
-        minute, heure, jour, mois, annee = temps.minute, temps.heure, \
-                temps.jour + 1, temps.mois + 1, temps.annee
-        minute = Fraction(minute)
-        heure = Fraction(heure)
-        jour = Fraction(jour)
-        mois = Fraction(mois)
-        annee = Fraction(annee)
-        for salle in self.ch_heure:
-            salle.script["changer"]["heure"].executer(salle=salle,
-                    minute=minute, heure=heure, jour=jour, mois=mois,
-                    annee=annee, exc_interruption=False)
+        self.changer_temps(temps, "heure", exc_interruption=False)
 
     def changer_jour(self, temps):
         """Hook appelé à chaque changement de jour."""
-        minute, heure, jour, mois, annee = temps.minute, temps.heure, \
-                temps.jour + 1, temps.mois + 1, temps.annee
-        minute = Fraction(minute)
-        heure = Fraction(heure)
-        jour = Fraction(jour)
-        mois = Fraction(mois)
-        annee = Fraction(annee)
-        for salle in self.ch_jour:
-            salle.script["changer"]["jour"].executer(salle=salle,
-                    minute=minute, heure=heure, jour=jour, mois=mois,
-                    annee=annee)
+        self.changer_temps(temps, "jour")
 
     def changer_mois(self, temps):
         """Hook appelé à chaque changement de mois."""
-        minute, heure, jour, mois, annee = temps.minute, temps.heure, \
-                temps.jour + 1, temps.mois + 1, temps.annee
-        minute = Fraction(minute)
-        heure = Fraction(heure)
-        jour = Fraction(jour)
-        mois = Fraction(mois)
-        annee = Fraction(annee)
-        for salle in self.ch_mois:
-            salle.script["changer"]["mois"].executer(salle=salle,
-                    minute=minute, heure=heure, jour=jour, mois=mois,
-                    annee=annee)
+        self.changer_temps(temps, "mois")
 
     def changer_annee(self, temps):
         """Hook appelé à chaque changement d'année."""
-        minute, heure, jour, mois, annee = temps.minute, temps.heure, \
-                temps.jour + 1, temps.mois + 1, temps.annee
-        minute = Fraction(minute)
-        heure = Fraction(heure)
-        jour = Fraction(jour)
-        mois = Fraction(mois)
-        annee = Fraction(annee)
-        for salle in self.ch_annee:
-            salle.script["changer"]["annee"].executer(salle=salle,
-                    minute=minute, heure=heure, jour=jour, mois=mois,
-                    annee=annee)
+        self.changer_temps(temps, "année")
@@ -240,4 +240,3 @@ class Feu(BaseObj):
         """
         for feu in list(importeur.salle.feux.values()):
             feu.bruler()
-        importeur.diffact.ajouter_action("repop_feux", 9, cls.repop)
@@ -598,8 +598,13 @@ class Salle(BaseObj):
         Ils ne recevront pas le message.
 
         """
+        from primaires.joueur.joueur import Joueur
         exceptions = personnages + tuple(kw_personnages.values()) if ignore \
                 else ()
+
+        # Sans paramètres de formatage, le message est le même pour tous
+        # les joueurs : il est diffusé (voir le module connex)
+        joueurs = [] if not personnages and not kw_personnages else None
         for personnage in self.personnages:
             if personnage not in exceptions:
                 if personnage.est_mort() and not mort:
@@ -608,8 +613,15 @@ class Salle(BaseObj):
                 if hasattr(personnage, "instance_connexion") and \
                         personnage.instance_connexion and not prompt:
                     personnage.instance_connexion.sans_prompt()
-                personnage.envoyer(message, *personnages, lisser=lisser,
-                        **kw_personnages)
+
+                if joueurs is not None and isinstance(personnage, Joueur):
+                    joueurs.append(personnage)
+                else:
+                    personnage.envoyer(message, *personnages, lisser=lisser,
+                            **kw_personnages)
+
+        if joueurs:
+            importeur.connex.diffuser(message, joueurs, lisser=lisser)
 
     def envoyer_lisser(self, chaine, *personnages, **kw_personnages):
         """Méthode redirigeant vers envoyer mais lissant la chaîne."""
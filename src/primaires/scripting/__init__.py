@@ -43,6 +43,7 @@ from .boucle import Boucle
 from .condition import Condition
 from .affectation import Affectation
 from .commentaire import Commentaire
+from .abonnements import Abonnements
 from .action import Action, actions as lst_actions
 from . import parser
 from . import commandes
@@ -57,6 +58,7 @@ from .config import *
 from .constantes.aide import *
 from .script import scripts
 from .alerte import Alerte
+from .profileur import Profileur
 from .commande_dynamique import CommandeDynamique
 from .memoires import Memoires
 from .structure import StructureComplete
@@ -106,11 +108,15 @@ class Module(BaseModule):
         self.nb_moy_actions = 0
         self.moy_fonctions = 0
         self.nb_moy_fonctions = 0
+        self.nb_cache_succes = 0
+        self.nb_cache_echecs = 0
         self.tps_script = 0.15
         self.scripts_gourmands = {}
+        self.profileur = Profileur()
 
         # Scriptables
         self.valeurs = {}
+        self.abonnements = Abonnements()
 
         # Paramètres te;poraires
         self.presse_papier = {}
@@ -729,6 +735,14 @@ class Module(BaseModule):
                 if i >= 5:
                     break
 
+        nb_resolutions = self.nb_cache_succes + self.nb_cache_echecs
+        taux = 0
+        if nb_resolutions:
+            taux = round(self.nb_cache_succes * 100 / nb_resolutions, 1)
+
+        taux = str(taux).replace(".", ",")
+        msg += "\n  Résolutions des types en cache : {} sur {} ({}%)".format(
+                self.nb_cache_succes, nb_resolutions, taux)
         msg += "\n  Scripts ayant mis plus de {} secondes pour " \
                 "s'exécuter : {}".format(tps_script,
                 len(self.scripts_gourmands))
@@ -0,0 +1,148 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier définit la classe Abonnements, détaillée plus bas."""
+
+from primaires.format.fonctions import supprimer_accents
+
+class Abonnements:
+
+    """Registre des abonnements aux évènements périodiques.
+
+    Certains évènements (changer.minute d'une salle par exemple) sont
+    appelés régulièrement sur un grand nombre d'objets, alors que très
+    peu d'entre eux les scriptent. Un module déclare les évènements qu'il
+    veut suivre (voir suivre) ; le registre tient alors, pour chaque
+    évènement suivi, le dictionnaire {id(appelant): appelant} des
+    appelants dont l'évènement contient au moins un test.
+
+    Ce dictionnaire est tenu à jour quand un test est ajouté ou retiré
+    (voir Evenement.ajouter_test et Evenement.supprimer_test). Le module
+    n'a donc plus qu'à parcourir les abonnés (voir abonnes) à chaque
+    appel.
+
+    """
+
+    def __init__(self):
+        self.suivis = {}
+        self.variables = (None, {})
+
+    def __repr__(self):
+        return "<Abonnements ({} évènements suivis)>".format(
+                sum(len(suivis) for suivis in self.suivis.values()))
+
+    @staticmethod
+    def normaliser(chemin):
+        """Retourne le chemin sans accents ni majuscules."""
+        return supprimer_accents(chemin).lower()
+
+    def suivre(self, classe, chemin):
+        """Suit l'évènement chemin des scripts des objets de classe.
+
+        Le chemin est le nom complet de l'évènement (par exemple
+        "changer.minute"). Les objets existants doivent ensuite être
+        inscrits (voir inscrire).
+
+        """
+        chemin = self.normaliser(chemin)
+        suivis = self.suivis.setdefault(chemin, {})
+        suivis.setdefault(classe, {})
+
+    def abonnes(self, classe, chemin):
+        """Retourne un tuple des appelants abonnés à l'évènement.
+
+        Le tuple est une copie : un script peut donc modifier les
+        abonnements pendant qu'on le parcourt.
+
+        """
+        chemin = self.normaliser(chemin)
+        return tuple(self.suivis[chemin][classe].values())
+
+    def actualiser(self, evenement):
+        """Actualise l'abonnement de l'appelant de l'évènement."""
+        suivis = self.suivis.get(self.normaliser(evenement.nom_complet))
+        if not suivis:
+            return
+
+        appelant = evenement.appelant
+        if appelant is None:
+            return
+
+        for classe, abonnes in suivis.items():
+            if isinstance(appelant, classe):
+                if evenement.tests:
+                    abonnes[id(appelant)] = appelant
+                else:
+                    abonnes.pop(id(appelant), None)
+
+    def inscrire(self, appelant):
+        """Inscrit l'appelant à tous les évènements suivis qu'il scripte.
+
+        Cette méthode est appelée au chargement des objets.
+
+        """
+        for chemin, suivis in self.suivis.items():
+            for classe in suivis.keys():
+                if isinstance(appelant, classe):
+                    evenement = appelant.script
+                    for nom in chemin.split("."):
+                        evenement = evenement[nom]
+
+                    self.actualiser(evenement)
+                    break
+
+    def desinscrire(self, appelant):
+        """Retire l'appelant de tous les évènements suivis."""
+        for suivis in self.suivis.values():
+            for abonnes in suivis.values():
+                abonnes.pop(id(appelant), None)
+
+    def variables_temps(self, temps):
+        """Retourne les variables de temps communes à tous les abonnés.
+
+        Le dictionnaire n'est construit qu'une fois par valeur de temps :
+        le changement de minute des salles et celui des PNJ partagent
+        donc les mêmes variables.
+
+        """
+        cle = (temps.minute, temps.heure, temps.jour, temps.mois,
+                temps.annee)
+        if self.variables[0] != cle:
+            minute, heure, jour, mois, annee = cle
+            self.variables = (cle, {
+                "minute": minute,
+                "heure": heure,
+                "jour": jour + 1,
+                "mois": mois + 1,
+                "annee": annee,
+            })
+
+        return self.variables[1]
@@ -77,6 +77,8 @@ class Action(Instruction):
     """
 
     _parametres_possibles = None
+    _cache_types = None
+    _methodes = ()
     verifier = True
     entrer_variables = False
 
@@ -119,7 +121,7 @@ class Action(Instruction):
     @classmethod
     def get_methode(self, numero):
         """Retourne la méthode correspondante au numéro d'ordre entré."""
-        return list(self._parametres_possibles.values())[numero]
+        return self._methodes[numero]
 
     @classmethod
     def ajouter_types(cls, methode, *parametres):
@@ -142,6 +144,7 @@ class Action(Instruction):
                     "cette action.".format(parametres))
 
         cls._parametres_possibles[parametres] = methode
+        cls.vider_cache()
 
     @classmethod
     def quelle_action(cls, parametres):
@@ -154,13 +157,21 @@ class Action(Instruction):
         une exception ValueError.
 
         """
-        if not cls.verifier and cls._parametres_possibles:
-            return list(cls._parametres_possibles.values())[0]
+        if not cls.verifier and cls._methodes:
+            return cls._methodes[0]
 
-        ty_p = [type(p) for p in parametres]
+        ty_p = tuple(type(p) for p in parametres)
+        module = importeur.scripting
+        methode = cls._cache_types.get(ty_p)
+        if methode is not None:
+            module.nb_cache_succes += 1
+            return methode
+
+        module.nb_cache_echecs += 1
         for types, methode in cls._parametres_possibles.items():
             if len(ty_p) == len(types) and \
                     all(issubclass(p, t) for p, t in zip(ty_p, types)):
+                cls._cache_types[ty_p] = methode
                 return methode
 
         raise ValueError("aucune interprétation de l'action {} " \
@@ -231,6 +242,20 @@ class Action(Instruction):
             del cls._parametres_possibles[str_types]
             cls._parametres_possibles[tuple(s_types)] = methode
 
+        cls.vider_cache()
+
+    @classmethod
+    def vider_cache(cls):
+        """Vide le cache de résolution des types.
+
+        Le cache associe un tuple de types de paramètres (les types
+        effectifs, pas ceux déclarés) à la méthode à appeler. Il doit
+        être vidé dès que _parametres_possibles est modifié.
+
+        """
+        cls._cache_types = {}
+        cls._methodes = tuple(cls._parametres_possibles.values())
+
     @property
     def code_python(self):
         """Retourne le code Python associé à l'action."""
@@ -33,6 +33,7 @@
 from primaires.interpreteur.commande.commande import Commande
 from .alerte import PrmAlerte
 from .exec import PrmExec
+from .profil import PrmProfil
 
 class CmdScripting(Commande):
 
@@ -52,3 +53,4 @@ class CmdScripting(Commande):
         """Ajout des paramètres."""
         self.ajouter_parametre(PrmAlerte())
         self.ajouter_parametre(PrmExec())
+        self.ajouter_parametre(PrmProfil())
@@ -0,0 +1,64 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Package contenant la commande 'scripting profil'."""
+
+from primaires.interpreteur.masque.parametre import Parametre
+from .profil_basculer import PrmBasculer
+from .profil_exporter import PrmExporter
+from .profil_rapport import PrmRapport
+from .profil_vider import PrmVider
+
+class PrmProfil(Parametre):
+
+    """Commande 'scripting profil'"""
+
+    def __init__(self):
+        """Constructeur du paramètre."""
+        Parametre.__init__(self, "profil", "profile")
+        self.nom_groupe = "administrateur"
+        self.aide_courte = "profile l'exécution des scripts"
+        self.aide_longue = \
+            "Cette commande permet de mesurer le temps passé dans " \
+            "chaque évènement, chaque test et chaque ligne de script. " \
+            "Le profileur est désactivé par défaut, car il ralentit " \
+            "l'exécution des scripts. Activez-le ou désactivez-le " \
+            "avec %scripting:profil:basculer%, consultez les " \
+            "mesures avec %scripting:profil:rapport%, exportez-les " \
+            "pour un flame graph avec %scripting:profil:exporter% et " \
+            "effacez-les avec %scripting:profil:vider%."
+
+    def ajouter_parametres(self):
+        """Ajout des paramètres."""
+        self.ajouter_parametre(PrmBasculer())
+        self.ajouter_parametre(PrmExporter())
+        self.ajouter_parametre(PrmRapport())
+        self.ajouter_parametre(PrmVider())
@@ -0,0 +1,67 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Module contenant la commande 'scripting profil exporter'."""
+
+import os
+
+from primaires.interpreteur.masque.parametre import Parametre
+
+class PrmExporter(Parametre):
+
+    """Commande 'scripting profil exporter'"""
+
+    def __init__(self):
+        """Constructeur du paramètre."""
+        Parametre.__init__(self, "exporter", "export")
+        self.nom_groupe = "administrateur"
+        self.aide_courte = "exporte le profil pour un flame graph"
+        self.aide_longue = \
+            "Cette commande écrit les mesures du profileur dans le " \
+            "fichier profil.txt du répertoire des logs du scripting, " \
+            "au format 'collapsed stacks' : une pile (appelant, " \
+            "évènement, test, ligne) par ligne, suivie de sa durée en " \
+            "microsecondes. Ce fichier peut être donné aux outils " \
+            "générant des flame graphs (flamegraph.pl par exemple)."
+
+    def interpreter(self, personnage, dic_masques):
+        """Méthode d'interprétation de commande"""
+        profileur = importeur.scripting.profileur
+        if not profileur.piles:
+            personnage << "|err|Le profileur n'a aucune mesure.|ff|"
+            return
+
+        logger = importeur.scripting.logger
+        logger.verif_rep()
+        chemin = logger.rep_complet + os.sep + "profil.txt"
+        profileur.ecrire(chemin)
+        personnage << "{} piles exportées dans {}.".format(
+                len(profileur.piles), chemin)
@@ -227,7 +227,7 @@ class Exec(Contexte):
             description = "VRAI"
         elif variable is False:
             description = "FAUX"
-        elif isinstance(variable, Fraction):
+        elif isinstance(variable, (int, Fraction)):
             if int(variable) == float(variable):
                 description = str(int(variable))
             else:
@@ -225,6 +225,7 @@ class Evenement(BaseObj):
         """Ajoute un test à l'évènement."""
         test = Test(self, chaine_test)
         self.__tests.append(test)
+        importeur.scripting.abonnements.actualiser(self)
         return len(self.__tests) - 1
 
     def supprimer_test(self, indice):
@@ -232,6 +233,7 @@ class Evenement(BaseObj):
         test = self.__tests[indice]
         test.detruire()
         del self.__tests[indice]
+        importeur.scripting.abonnements.actualiser(self)
 
     def remonter_test(self, indice):
         """Remonte le test indiqué."""
@@ -34,6 +34,7 @@ from fractions import Fraction
 from time import time
 
 from abstraits.obase import BaseObj
+from .utile.nombres import simplifier
 from .parser import expressions
 
 class Fonction(BaseObj):
@@ -62,6 +63,8 @@ class Fonction(BaseObj):
     """
 
     _parametres_possibles = None
+    _cache_types = None
+    _methodes = ()
     verifier = True
     def __init__(self, fonction):
         """Construction d'une fonction."""
@@ -79,7 +82,7 @@ class Fonction(BaseObj):
         """Exécute la fonction selon l'évènement."""
         t1 = time()
         fonction = cls.quelle_fonction(parametres)
-        retour = fonction(*parametres)
+        retour = simplifier(fonction(*parametres))
         t2 = time()
         cls.enregistrer_stats(t1, t2)
         return retour
@@ -87,7 +90,7 @@ class Fonction(BaseObj):
     @classmethod
     def get_methode(self, numero):
         """Retourne la méthode correspondant au numéro d'ordre entré."""
-        return list(self._parametres_possibles.values())[numero]
+        return self._methodes[numero]
 
     @classmethod
     def ajouter_types(cls, methode, *parametres):
@@ -108,6 +111,7 @@ class Fonction(BaseObj):
                     "cette fonction.".format(parametres))
 
         cls._parametres_possibles[parametres] = methode
+        cls.vider_cache()
 
     @classmethod
     def quelle_fonction(cls, parametres):
@@ -120,13 +124,21 @@ class Fonction(BaseObj):
         une exception ValueError.
 
         """
-        if not cls.verifier and cls._parametres_possibles:
-            return list(cls._parametres_possibles.values())[0]
+        if not cls.verifier and cls._methodes:
+            return cls._methodes[0]
 
-        ty_p = [type(p) for p in parametres]
+        ty_p = tuple(type(p) for p in parametres)
+        module = importeur.scripting
+        methode = cls._cache_types.get(ty_p)
+        if methode is not None:
+            module.nb_cache_succes += 1
+            return methode
+
+        module.nb_cache_echecs += 1
         for types, methode in cls._parametres_possibles.items():
             if len(types) == len(ty_p) and all(issubclass(p, t) for p, t in \
                     zip(ty_p, types)):
+                cls._cache_types[ty_p] = methode
                 return methode
 
         raise ValueError("Aucune interprétation de la fonction {} " \
@@ -147,6 +159,20 @@ class Fonction(BaseObj):
             del cls._parametres_possibles[str_types]
             cls._parametres_possibles[tuple(s_types)] = methode
 
+        cls.vider_cache()
+
+    @classmethod
+    def vider_cache(cls):
+        """Vide le cache de résolution des types.
+
+        Le cache associe un tuple de types de paramètres (les types
+        effectifs, pas ceux déclarés) à la méthode à appeler. Il doit
+        être vidé dès que _parametres_possibles est modifié.
+
+        """
+        cls._cache_types = {}
+        cls._methodes = tuple(cls._parametres_possibles.values())
+
     @classmethod
     def enregistrer_stats(cls, t1, t2):
         """Enregistre le temps d'exécution de la fonction."""
@@ -30,6 +30,7 @@
 
 """Fichier contenant la classe Calcul, détaillée plus bas."""
 
+import ast
 import re
 
 from .expression import Expression
@@ -39,6 +40,8 @@ from . import expressions
 # Regex
 RE_INV = re.compile(r"[A-Za-z_]\(")
 RE_OPERATEURS = re.compile(r"[-+*/()]")
+RE_EXPRESSION = re.compile(r"\{(\d+)\}")
+RE_NOM = re.compile(r"\b_e(\d+)\b")
 
 class Calcul(Expression):
     
@@ -129,6 +132,39 @@ class Calcul(Expression):
     
     @property
     def code_python(self):
-        """Retourne le code Python associé à la fonction."""
+        """Retourne le code Python associé à la fonction.
+
+        Les divisions sont remplacées par des appels à la fonction
+        diviser (voir primaires.scripting.utile.nombres), pour que la
+        division de deux entiers ne retourne pas un flottant.
+
+        """
+        operateurs = self.operateurs
+        if "/" in operateurs:
+            operateurs = remplacer_divisions(operateurs)
+
         expressions = [e.code_python for e in self.expressions]
-        return self.operateurs.format(*expressions)
+        return operateurs.format(*expressions)
+
+def remplacer_divisions(operateurs):
+    """Remplace les divisions du modèle par des appels à diviser.
+
+    Le modèle est la chaîne des opérateurs d'un calcul, les expressions
+    y étant notées {0}, {1}... Le modèle retourné est du même format.
+
+    """
+    source = RE_EXPRESSION.sub(r"_e\1", operateurs)
+    arbre = convertir_division(ast.parse(source.strip(), mode="eval"))
+    return RE_NOM.sub(r"{\1}", ast.unparse(arbre))
+
+def convertir_division(noeud):
+    """Remplace récursivement les noeuds de division."""
+    for champ, valeur in ast.iter_fields(noeud):
+        if isinstance(valeur, ast.AST):
+            setattr(noeud, champ, convertir_division(valeur))
+
+    if isinstance(noeud, ast.BinOp) and isinstance(noeud.op, ast.Div):
+        return ast.Call(func=ast.Name(id="diviser", ctx=ast.Load()),
+                args=[noeud.left, noeud.right], keywords=[])
+
+    return noeud
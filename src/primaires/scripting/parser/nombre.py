@@ -32,6 +32,7 @@
 
 from fractions import Fraction
 
+from primaires.scripting.utile.nombres import simplifier
 from .expression import Expression
 from .delimiteurs import DELIMITEURS
 
@@ -44,7 +45,8 @@ class Nombre(Expression):
         un flottant
         une fraction
     
-    Tous ces nombres sont de toute façon convertis en fraction.
+    Tous ces nombres sont de toute façon convertis en fraction, puis
+    en entier si leur valeur est entière.
     
     """
     
@@ -91,14 +93,14 @@ class Nombre(Expression):
         else:
             fin = None
         chaine_interpreter = chaine[:fin]
-        objet.nombre = Fraction(chaine_interpreter)
+        objet.nombre = simplifier(Fraction(chaine_interpreter))
         return objet, chaine[len(chaine_interpreter):]
     
     def get_valeur(self, evt):
-        """Retourne le nombre sous la forme d'un objet Fraction."""
-        return self.nombre
+        """Retourne le nombre sous la forme d'un entier ou d'une fraction."""
+        return simplifier(self.nombre)
     
     @property
     def code_python(self):
         """Retourne le code Python associé."""
-        return repr(self.nombre)
+        return repr(simplifier(self.nombre))
@@ -0,0 +1,248 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier définit la classe Profileur, détaillée plus bas."""
+
+import sys
+import time
+
+from primaires.format.fonctions import supprimer_couleurs
+
+class Profileur:
+
+    """Profileur des scripts, désactivé par défaut.
+
+    Quand il est actif (voir activer), chaque exécution d'un test
+    (Test.executer_code) passe par la méthode executer : le générateur
+    est exécuté sous sys.settrace et le temps écoulé entre deux lignes
+    du code généré est attribué à l'instruction correspondante. Comme
+    dans Test.erreur_execution, la ligne N du code généré correspond à
+    l'instruction N - 1 (la première ligne est 'def script():').
+
+    Le temps est rangé par pile : appelant, évènement, test puis ligne.
+    Un script exécuté par une instruction d'un autre script (un
+    évènement appelé par une action par exemple) a pour pile celle de
+    cette instruction, suivie de la sienne. Seul le temps propre de
+    chaque ligne est compté : le temps passé dans un script appelé est
+    compté dans la pile de ce dernier.
+
+    Les piles peuvent être exportées au format 'collapsed stacks' (une
+    pile par ligne, les éléments séparés par des points-virgules, suivie
+    de la durée en microsecondes), lu par les outils de flame graph
+    (voir ecrire).
+
+    """
+
+    def __init__(self):
+        self.actif = False
+        self.debut = None
+        self.duree = 0
+        self.piles = {} # {pile: durée}
+        self.etiquettes = {} # {(code, ligne): étiquette}
+        self.executions = [] # [test, code, pile, ligne, début]
+
+    def __repr__(self):
+        return "<Profileur ({}, {} piles)>".format(
+                "actif" if self.actif else "inactif", len(self.piles))
+
+    def activer(self):
+        """Active le profileur."""
+        if not self.actif:
+            self.actif = True
+            self.debut = time.time()
+
+    def desactiver(self):
+        """Désactive le profileur, en conservant les mesures."""
+        if self.actif:
+            self.actif = False
+            self.duree += time.time() - self.debut
+            self.debut = None
+
+    def vider(self):
+        """Efface les mesures."""
+        self.duree = 0
+        if self.actif:
+            self.debut = time.time()
+
+        self.piles.clear()
+        self.etiquettes.clear()
+
+    def executer(self, test, code):
+        """Exécute le générateur code du test en le profilant.
+
+        On retourne la valeur retournée par next(code).
+
+        """
+        maintenant = time.perf_counter()
+        pile = ()
+        if self.executions:
+            parent = self.executions[-1]
+            self.comptabiliser(parent, maintenant)
+            if parent[3] is not None:
+                pile = parent[2] + (self.etiquette(parent[0], parent[1],
+                        parent[3]), )
+
+        pile += self.pile_test(test)
+        execution = [test, code.gi_code, pile, None, maintenant]
+        self.executions.append(execution)
+        ancien = sys.gettrace()
+        sys.settrace(self.tracer)
+        try:
+            return next(code)
+        finally:
+            sys.settrace(ancien)
+            maintenant = time.perf_counter()
+            self.comptabiliser(execution, maintenant)
+            self.executions.pop()
+            if self.executions:
+                self.executions[-1][4] = maintenant
+
+    def tracer(self, frame, evenement, argument):
+        """Fonction de trace globale, ne suivant que le script exécuté."""
+        if evenement == "call" and frame.f_code is self.executions[-1][1]:
+            return self.tracer_ligne
+
+        return None
+
+    def tracer_ligne(self, frame, evenement, argument):
+        """Fonction de trace locale du script exécuté."""
+        if evenement == "line":
+            execution = self.executions[-1]
+            self.comptabiliser(execution, time.perf_counter())
+            execution[3] = frame.f_lineno
+
+        return self.tracer_ligne
+
+    def comptabiliser(self, execution, maintenant):
+        """Attribue le temps écoulé à la ligne en cours de l'exécution."""
+        test, code, pile, ligne, debut = execution
+        if ligne is not None:
+            pile = pile + (self.etiquette(test, code, ligne), )
+            self.piles[pile] = self.piles.get(pile, 0) + maintenant - debut
+
+        execution[4] = maintenant
+
+    def etiquette(self, test, code, ligne):
+        """Retourne l'étiquette de la ligne du code généré.
+
+        Les étiquettes sont conservées par objet code : si le test
+        est modifié, son code est recompilé et les lignes renumérotées.
+
+        """
+        etiquette = self.etiquettes.get((code, ligne))
+        if etiquette is None:
+            instructions = test.instructions
+            no = ligne - 1
+            if 0 < no <= len(instructions):
+                etiquette = "ligne {} : {}".format(no,
+                        instructions[no - 1].sans_couleurs)
+            else:
+                etiquette = "fin du script"
+
+            etiquette = self.etiquettes[(code, ligne)] = nettoyer(
+                    etiquette)
+
+        return etiquette
+
+    @staticmethod
+    def pile_test(test):
+        """Retourne la pile (appelant, évènement, test) du test.
+
+        Les appelants sans nom de scripting (une zone, un tag) sont
+        désignés par le nom de leur classe.
+
+        """
+        appelant = test.appelant
+        nom = getattr(type(appelant), "nom_scripting",
+                type(appelant).__name__)
+        appelant = nom + " " + repr(appelant)
+        evenement = "évènement " + str(test.evenement.nom_complet)
+        tests = "si " + test.sc_tests if test.tests else "sinon"
+        return (nettoyer(appelant), nettoyer(evenement), nettoyer(tests))
+
+    def cumuler(self, profondeur):
+        """Retourne les durées cumulées à la profondeur indiquée.
+
+        La profondeur est le nombre d'éléments de la pile conservés :
+        1 pour les appelants, 2 pour les évènements, 3 pour les tests
+        et 4 pour les lignes. Le temps d'un script appelé par un autre
+        est donc compté dans la ligne qui l'a appelé.
+
+        """
+        durees = {}
+        for pile, duree in self.piles.items():
+            cle = pile[:profondeur]
+            durees[cle] = durees.get(cle, 0) + duree
+
+        return durees
+
+    def rapport(self, nb_lignes=10):
+        """Retourne le rapport sous la forme d'une chaîne.
+
+        Pour les évènements, les tests puis les lignes, on affiche les
+        nb_lignes plus coûteux (temps cumulé, scripts appelés compris).
+
+        """
+        duree = self.duree
+        if self.actif:
+            duree += time.time() - self.debut
+
+        total = sum(self.piles.values())
+        lignes = ["Profil sur {:.1f}s, {:.3f}s dans les scripts".format(
+                duree, total)]
+        for titre, profondeur in (("Évènements", 2), ("Tests", 3),
+                ("Lignes", 4)):
+            lignes.append("")
+            lignes.append(titre + " :")
+            durees = self.cumuler(profondeur)
+            for pile, duree in sorted(durees.items(), key=lambda d: d[1],
+                    reverse=True)[:nb_lignes]:
+                lignes.append("  {:8.3f}s {}".format(duree,
+                        " / ".join(pile)))
+
+        return "\n".join(lignes)
+
+    def ecrire(self, chemin):
+        """Écrit les piles au format 'collapsed stacks'.
+
+        Chaque ligne contient une pile (ses éléments séparés par des
+        points-virgules) suivie de sa durée propre en microsecondes.
+
+        """
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            for pile, duree in sorted(self.piles.items()):
+                fichier.write("{} {}\n".format(";".join(pile),
+                        round(duree * 1000000)))
+
+def nettoyer(etiquette):
+    """Retire les couleurs et les caractères réservés d'une étiquette."""
+    etiquette = supprimer_couleurs(etiquette)
+    return etiquette.replace(";", ",").replace("\n", " ")
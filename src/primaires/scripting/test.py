@@ -43,6 +43,7 @@ from primaires.scripting.jeton import Jeton
 from primaires.scripting.exceptions import InterrompreCommande
 from primaires.scripting.constantes.connecteurs import CONNECTEURS
 from primaires.scripting.utile.fonctions import *
+from primaires.scripting.utile.nombres import diviser
 from .alerte import Alerte
 
 class Test(BaseObj):
@@ -51,6 +52,9 @@ class Test(BaseObj):
 
     """
 
+    _nom = "test_scripting"
+    _version = 1
+
     def __init__(self, evenement, chaine_test=""):
         """Constructeur d'une suite de tests.
 
@@ -74,6 +78,13 @@ class Test(BaseObj):
     def __getnewargs__(self):
         return (None, )
 
+    def __getstate__(self):
+        """Le code compilé n'est pas enregistré."""
+        attrs = BaseObj.__getstate__(self)
+        attrs.pop("_Test__code", None)
+        attrs.pop("_Test__code_tests", None)
+        return attrs
+
     def __str__(self):
         return str(self.__tests)
 
@@ -145,6 +156,33 @@ class Test(BaseObj):
         code += "\n".join(lignes)
         code += "\n    yield None"
         self.__cache = code
+        self.__dict__.pop("_Test__code", None)
+
+    def get_code(self):
+        """Retourne le cache compilé.
+
+        Le code compilé n'est pas enregistré : il est calculé au
+        premier appel (après le chargement ou une modification des
+        instructions, voir calculer_cache) puis conservé. On l'écrit
+        directement dans le dictionnaire de l'objet pour ne pas
+        le marquer comme modifié.
+
+        """
+        code = self.__dict__.get("_Test__code")
+        if code is None:
+            code = compile(self.get_cache(), "<string>", "exec")
+            self.__dict__["_Test__code"] = code
+
+        return code
+
+    def get_code_tests(self):
+        """Retourne le code compilé de la suite de tests."""
+        code = self.__dict__.get("_Test__code_tests")
+        if code is None:
+            code = compile(self.__tests.code_python, "<string>", "eval")
+            self.__dict__["_Test__code_tests"] = code
+
+        return code
 
     def construire(self, chaine_test):
         """Construit la suite de chaînes en fonction de la chaîne.
@@ -152,6 +190,7 @@ class Test(BaseObj):
         """
         # On essaye d'interpréter la suite de tests
         self.__tests = expressions["tests"].parser(chaine_test)[0]
+        self.__dict__.pop("_Test__code_tests", None)
 
     def ajouter_instruction(self, message):
         """Construit et ajoute l'instruction."""
@@ -264,11 +303,10 @@ class Test(BaseObj):
         if not self.__tests:
             return True
 
-        py_code = self.__tests.code_python
         globales = self.get_globales(evenement)
         res = False
         try:
-            res = bool(eval(py_code, globales))
+            res = bool(eval(self.get_code_tests(), globales))
         except Exception as err:
             self.erreur_execution(str(err))
 
@@ -284,6 +322,7 @@ class Test(BaseObj):
             "variables": evenement.espaces.variables,
             "evt": evenement,
             "Fraction": Fraction,
+            "diviser": diviser,
             "formatter": formatter,
             "get_variables": get_variables,
         }
@@ -356,8 +395,12 @@ class Test(BaseObj):
             return
 
         importeur.scripting.execute_test.append(self)
+        profileur = importeur.scripting.profileur
         try:
-            ret = next(code)
+            if profileur.actif:
+                ret = profileur.executer(self, code)
+            else:
+                ret = next(code)
         except ErreurExecution as err:
             self.erreur_execution(str(err))
         except InterrompreCommande as err:
@@ -427,12 +470,10 @@ class Test(BaseObj):
         if etape and self.acteur:
             self.acteur.quetes[etape.quete.cle].deverouiller()
 
-        code = self.get_cache()
-
         # Constitution des globales
         globales = self.get_globales(evenement)
         try:
-            exec(code, globales)
+            exec(self.get_code(), globales)
         except Exception as err:
             self.erreur_execution(str(err))
         else:
@@ -34,6 +34,7 @@ scripting.
 """
 
 from fractions import Fraction
+from numbers import Rational
 
 from abstraits.obase import BaseObj
 from primaires.format.tableau import Tableau
@@ -47,7 +48,15 @@ from primaires.pnj.prototype import Prototype as PrototypePNJ
 from primaires.scripting.structure import StructureSimple as Structure
 
 def get(nom):
-    """Retourne le type portant le nom."""
+    """Retourne le type portant le nom.
+
+    Le type Fraction désigne les nombres du scripting, qui peuvent être
+    des entiers ou des fractions (voir primaires.scripting.utile.nombres).
+
+    """
+    if nom == "Fraction":
+        return Rational
+
     builtins = __builtins__.copy()
     types = __import__("primaires.scripting.types").scripting.types
     try:
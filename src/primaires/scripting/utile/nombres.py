@@ -0,0 +1,74 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier contient la couche numérique du scripting.
+
+Les nombres manipulés par les scripts sont des entiers (int) tant
+qu'ils ont une valeur entière et ne deviennent des fractions (Fraction)
+que quand une division ne tombe pas juste. Les opérations sur les
+entiers sont bien plus rapides que sur les fractions, qui sont
+implémentées en Python.
+
+Fonctions définies :
+    simplifier -- retourne un entier si la fraction a une valeur entière
+    diviser -- divise deux nombres sans perdre de précision
+
+"""
+
+from fractions import Fraction
+
+def simplifier(valeur):
+    """Retourne la valeur sous forme d'entier si c'est possible.
+
+    Seules les fractions de valeur entière sont converties : toute
+    autre valeur est retournée telle quelle.
+
+    """
+    if type(valeur) is Fraction and valeur.denominator == 1:
+        return valeur.numerator
+
+    return valeur
+
+def diviser(dividende, diviseur):
+    """Divise le dividende par le diviseur.
+
+    La division de deux entiers retourne un entier si elle tombe
+    juste, une fraction sinon (jamais un flottant).
+
+    """
+    if type(dividende) is int and type(diviseur) is int:
+        quotient, reste = divmod(dividende, diviseur)
+        if reste == 0:
+            return quotient
+
+        return Fraction(dividende, diviseur)
+
+    return simplifier(dividende / diviseur)
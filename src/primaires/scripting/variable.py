@@ -58,13 +58,7 @@ class Variable(BaseObj):
 
     def _get_type(self):
         types = __import__("primaires.scripting.types").scripting.types
-        builtins = __builtins__.copy()
-        try:
-            type = builtins[self.nom_type]
-        except KeyError:
-            type = getattr(types, self.nom_type)
-
-        return type
+        return types.get(self.nom_type)
     def _set_type(self, type):
         self.nom_type = type.__name__
     type = property(_get_type, _set_type)
@@ -31,8 +31,10 @@
 """Ce fichier contient le module primaire supenr."""
 
 import copy
+from collections import deque
 import os
 import pickle
+import sqlite3
 import sys
 import time
 from yaml import dump, load
@@ -44,7 +46,9 @@ try:
     from bson.objectid import ObjectId
     from pymongo import MongoClient
     from pymongo.errors import ConnectionFailure
+    from primaires.supenr.chargeur_mongo import ChargeurMongo
     from primaires.supenr.fraction import TransformFraction
+    from primaires.supenr.lot_mongo import LotMongo
     transforms.append(TransformFraction())
 except ImportError:
     MongoClient = None
@@ -53,6 +57,9 @@ from abstraits.module import *
 from abstraits.obase import *
 from primaires.supenr import commandes
 from primaires.supenr.config import cfg_supenr
+from primaires.supenr.ecrivain import Ecrivain
+from primaires.supenr.journal import Journal
+from primaires.supenr.sqlite import StockageSQLite
 
 # Dossier d'enregistrement des fichiers-données
 # Vous pouvez changer cette variable, ou bien spécifier l'option en
@@ -84,10 +91,27 @@ class Module(BaseModule):
         self.fichiers = {}
         self.pret = False
         self.met_preparer = []
+        self.journal = None
+        self.stockage = None
+        self.ecrivain = None
+        self.compaction_en_cours = False
+
+        # Statistiques d'enregistrement (pickle et sqlite)
+        self.nb_ecrits = 0
+        self.tps_arret = 0
+        self.tps_ecriture = 0
+        self.nb_compactes = 0
+        self.tps_arret_compaction = 0
+        self.tps_compaction = 0
+        self.nb_nettoyes = 0
+        self.tps_nettoyage = 0
 
         # Objets utiles pour MongoDB
         self.mongo_db = None
         self.mongo_file = set()
+        self.mongo_lot = None
+        self.mongo_chargeur = None
+        self.mongo_table = []
         self.mongo_collections = {}
         self.mongo_objets = {}
         self.mongo_debug = False
@@ -115,8 +139,8 @@ class Module(BaseModule):
         if self.mode == "mongo":
             self.config_mongo()
 
-        # Si le mode d'enregistrement est pickle
-        if self.mode == "pickle":
+        # Si le mode d'enregistrement est pickle ou sqlite
+        if self.mode in ("pickle", "sqlite"):
             if config_globale.chemin_enregistrement:
                 REP_ENRS = config_globale.chemin_enregistrement
 
@@ -128,9 +152,17 @@ class Module(BaseModule):
                 os.makedirs(REP_ENRS)
         elif self.mode != "mongo":
             self.logger.fatal("Mode d'enregistrement {} inconnu.".format(
-                    repr(mode)))
+                    repr(self.mode)))
             sys.exit(1)
 
+        self.journal = Journal(REP_ENRS, self.logger,
+                self.cfg.ratio_compaction, self.cfg.generations)
+        self.stockage = StockageSQLite(REP_ENRS + os.sep + \
+                "enregistrements.db", self.logger,
+                self.cfg.ratio_compaction)
+        self.journal.compact = self.stockage.compact = \
+                self.cfg.format_compact
+
         # On augmente la limite de récursion
         sys.setrecursionlimit(20000)
 
@@ -166,15 +198,37 @@ class Module(BaseModule):
                 self.mode = "pickle"
             else:
                 self.mongo_db = connexion[self.cfg.nom_mongodb]
+                self.mongo_lot = LotMongo(self.mongo_db)
+                self.mongo_chargeur = ChargeurMongo(self.mongo_db,
+                        self.mongo_objets, transforms,
+                        self.cfg.mongo_paresseuses)
                 #self.mongo_db.add_son_manipulator(TransformFraction())
 
     def init(self):
-        """Chargement de tous les objets (pickle)."""
-        if self.mode == "pickle":
+        """Chargement de tous les objets (pickle ou sqlite)."""
+        if self.mode == "sqlite":
+            self.sqlite_charger()
+            if importeur.sauvegarde:
+                self.stockage.activer()
+                importeur.diffact.ajouter_periodique("enregistrement",
+                        self.cfg.intervalle_journal,
+                        self.sqlite_enregistrer_file)
+        elif self.mode == "pickle":
             self.charger()
+            if importeur.sauvegarde:
+                self.journal.activer()
+                if self.cfg.enregistrement_differe:
+                    self.ecrivain = Ecrivain(self.logger)
+                    self.ecrivain.start()
+
+                importeur.diffact.ajouter_periodique("enregistrement",
+                        self.cfg.intervalle_journal, self.ecrire_journal)
         else: # Mongo
             importeur.diffact.ajouter_action("enregistrement", 1,
                     self.mongo_enregistrer_file)
+
+        self.importeur.hook["stats:infos"].ajouter_evenement(
+                self.stats_supenr)
         BaseModule.init(self)
 
     def ajouter_commandes(self):
@@ -198,6 +252,12 @@ class Module(BaseModule):
         """Destruction du module"""
         if self.mode == "pickle":
             self.enregistrer()
+            if self.ecrivain:
+                self.ecrivain.arreter()
+                self.ecrivain = None
+        elif self.mode == "sqlite":
+            self.sqlite_enregistrer_file()
+            self.stockage.fermer()
         else:
             self.mongo_enregistrer_file(False)
 
@@ -220,45 +280,155 @@ class Module(BaseModule):
         fichier.close()
 
     def enregistrer(self):
-        """Méthode appelée pour enregistrer TOUS les objets par pickle."""
+        """Méthode appelée pour enregistrer TOUS les objets par pickle.
+
+        Le journal est compacté : tous les objets enregistrés, et ceux
+        qu'ils référencent, sont réécrits dans la base (voir
+        Journal.compacter). En mode 'sqlite', la base est réécrite
+        de la même façon (voir StockageSQLite.compacter).
+
+        """
         if not importeur.sauvegarde:
             return
 
-        global REP_ENRS
         if not self.pret:
             raise RuntimeError("le supenr n'est pas prêt à enregistrer")
 
         if self.enregistre_actuellement:
             return
 
+        # Les écritures en cours doivent être terminées
+        if self.ecrivain:
+            self.ecrivain.attendre()
+            self.recuperer_taches()
+
+        debut = time.time()
         a_enregistrer = [o for o in objets.values() if o.e_existe]
-        self.logger.info("{} objets, dans {}o sont prêts à être " \
-                "enregistrés.".format(str(len(a_enregistrer)),
-                str(len(pickle.dumps(a_enregistrer)))))
         self.enregistre_actuellement = True
-        chemin_dest = REP_ENRS + os.sep + "enregistrements.bin"
+        if self.mode == "sqlite":
+            try:
+                nb = self.stockage.compacter(a_enregistrer)
+            except sqlite3.Error as err:
+                self.logger.warning("La base {} n'a pas pu être " \
+                        "écrite : {}".format(self.stockage.chemin, err))
+            else:
+                self.nb_compactes = nb
+                self.tps_compaction = time.time() - debut
+                self.logger.info("{} objets enregistrés dans {}o".format(
+                        nb, self.stockage.taille))
+            finally:
+                self.enregistre_actuellement = False
+            return
 
-        # On essaye d'ouvrir le fichier
         try:
-            fichier_enr = open(chemin_dest, 'wb')
+            nb = self.journal.compacter(a_enregistrer)
         except IOError as io_err:
-            self.logger.warning("Le fichier {} destiné à enregistrer " \
-                    "les objets de Kassie n'a pas pu être ouvert : {}".format(
-                    chemin_dest, io_err))
+            self.logger.warning("La base {} destinée à enregistrer " \
+                    "les objets de Kassie n'a pas pu être écrite : {}".format(
+                    self.journal.chemin_base, io_err))
         else:
-            pickler = pickle.Pickler(fichier_enr)
-            pickler.dump(a_enregistrer)
+            self.nb_compactes = nb
+            self.tps_compaction = self.tps_arret_compaction = \
+                    time.time() - debut
+            self.logger.info("{} objets enregistrés dans {}o".format(
+                    nb, self.journal.taille_base))
         finally:
-            if "fichier_enr" in locals():
-                fichier_enr.close()
             self.enregistre_actuellement = False
-            for classe, liste in objets_par_type.items():
-                liste = [o for o in liste if o.e_existe]
+
+    def ecrire_journal(self):
+        """Écrit les objets modifiés dans le journal (pickle).
+
+        Si un écrivain est actif (voir l'option 'enregistrement_differe'),
+        seule la sérialisation des objets modifiés se fait dans le thread
+        principal : l'écriture des fichiers se fait dans le thread de
+        l'écrivain. Si le journal est devenu trop gros, il est compacté
+        (en arrière-plan si possible).
+
+        """
+        if self.enregistre_actuellement:
+            return
+
+        if self.ecrivain:
+            self.recuperer_taches()
+
+        if self.journal.compaction_requise or (self.ecrivain is None and \
+                self.journal.doit_compacter()):
+            self.enregistrer()
+            return
+
+        debut = time.time()
+        try:
+            enregistrements = self.journal.preparer()
+            if self.ecrivain:
+                if enregistrements:
+                    self.ecrivain.ajouter_tache("écriture",
+                            self.journal.ajouter, self.journal.segment,
+                            enregistrements)
+            else:
+                self.journal.ajouter(self.journal.segment, enregistrements)
+                self.tps_ecriture = time.time() - debut
+        except IOError as io_err:
+            # Les objets modifiés seront écrits par la compaction
+            self.journal.signaler_echec()
+            self.logger.warning("Le journal n'a pas pu être écrit, il " \
+                    "sera compacté : {}".format(io_err))
+            return
+
+        if enregistrements:
+            self.nb_ecrits = len(enregistrements)
+            self.tps_arret = time.time() - debut
+
+        if self.ecrivain and self.journal.doit_compacter():
+            self.compacter_journal()
+
+    def compacter_journal(self):
+        """Compacte le journal en arrière-plan.
+
+        Le journal passe à un nouveau segment et les fichiers
+        antérieurs sont fusionnés par l'écrivain (voir Journal.fusionner).
+        Sans écrivain, le journal est compacté en mémoire (voir
+        enregistrer).
+
+        """
+        if self.ecrivain is None or self.journal.compaction_requise:
+            self.enregistrer()
+            return
+
+        if self.compaction_en_cours:
+            return
+
+        debut = time.time()
+        dernier = self.journal.rotation()
+        self.compaction_en_cours = True
+        self.ecrivain.ajouter_tache("compaction", self.journal.fusionner,
+                dernier)
+        self.tps_arret_compaction = time.time() - debut
+
+    def recuperer_taches(self):
+        """Récupère les tâches terminées par l'écrivain."""
+        for nom, resultat, duree, erreur in self.ecrivain.resultats():
+            if nom == "écriture":
+                self.tps_ecriture = duree
+                if erreur is not None:
+                    # Les objets modifiés seront écrits par la compaction
+                    self.journal.signaler_echec()
+                    self.logger.warning("Le journal n'a pas pu être " \
+                            "écrit, il sera compacté : {}".format(erreur))
+            elif nom == "compaction":
+                self.compaction_en_cours = False
+                self.tps_compaction = duree
+                if erreur is None:
+                    self.nb_compactes, supprimes = resultat
+                    self.journal.appliquer(supprimes)
+                    self.logger.info("{} objets enregistrés dans " \
+                            "{}o".format(self.nb_compactes,
+                            self.journal.taille_base))
 
     def enregistrer_periodiquement(self):
         """Cette méthode est appelée périodiquement pour enregistrer (pickle).
 
-        On enregistre tous les objets dans la sauvegarde pickle.
+        Le journal est écrit puis compacté, en arrière-plan si un
+        écrivain est actif.
 
         """
         importeur.diffact.ajouter_action("enregistrement", 60 * 60,
@@ -266,51 +436,93 @@ class Module(BaseModule):
         if self.enregistre_actuellement:
             return
 
-        t1 = time.time()
-        self.enregistrer()
-        t2 = time.time()
-        print("Enregistrement fait en", t2 - t1)
+        self.ecrire_journal()
+        self.compacter_journal()
+
+    def stats_supenr(self, infos):
+        """Ajoute les stats concernant l'enregistrement."""
+        if self.mode not in ("pickle", "sqlite") or \
+                not importeur.sauvegarde:
+            return
+
+        def secondes(tps):
+            return str(round(tps, 3)).replace(".", ",")
+
+        msg = "|tit|Enregistrement :|ff|"
+        if self.mode == "sqlite":
+            msg += "\n  Dernière écriture : {} objet{} en {} " \
+                    "secondes".format(self.nb_ecrits,
+                    "s" if self.nb_ecrits > 1 else "",
+                    secondes(self.tps_ecriture))
+            msg += "\n  Dernière compaction : {} objet{} en {} " \
+                    "secondes".format(self.nb_compactes,
+                    "s" if self.nb_compactes > 1 else "",
+                    secondes(self.tps_compaction))
+            msg += "\n  Dernier nettoyage : {} objet{} supprimé{} en {} " \
+                    "secondes".format(self.nb_nettoyes,
+                    "s" if self.nb_nettoyes > 1 else "",
+                    "s" if self.nb_nettoyes > 1 else "",
+                    secondes(self.tps_nettoyage))
+            msg += "\n  Taille de la sauvegarde : {}o".format(
+                    self.stockage.taille)
+            infos.append(msg)
+            return
+
+        msg += "\n  Dernière écriture du journal : {} objet{} en {} " \
+                "secondes (arrêt de {} secondes)".format(self.nb_ecrits,
+                "s" if self.nb_ecrits > 1 else "",
+                secondes(self.tps_ecriture), secondes(self.tps_arret))
+        msg += "\n  Dernière compaction : {} objet{} en {} secondes " \
+                "(arrêt de {} secondes)".format(self.nb_compactes,
+                "s" if self.nb_compactes > 1 else "",
+                secondes(self.tps_compaction),
+                secondes(self.tps_arret_compaction))
+        if self.compaction_en_cours:
+            msg += "\n  Compaction en cours"
+        msg += "\n  Taille de la sauvegarde : {}o (journal : {}o)".format(
+                self.journal.taille_base, self.journal.taille_journal)
+        infos.append(msg)
 
     def charger(self):
-        """Charge le fichier indiqué et retourne l'objet dépicklé"""
+        """Charge la base et les segments du journal."""
         if not importeur.sauvegarde:
             return
 
-        global REP_ENRS
-        chemin_dest = REP_ENRS + os.sep + "enregistrements.bin"
         try:
-            fichier_enr = open(chemin_dest, 'rb')
-        except IOError as io_err:
-            self.logger.warning("Le fichier {} n'a pas pu être ouvert " \
-                    ": {}".format(chemin_dest, io_err))
+            nb = self.journal.charger()
+        except (IOError, EOFError, pickle.UnpicklingError) as err:
+            self.logger.warning("La base {} n'a pas pu être " \
+                    "chargée : {}".format(self.journal.chemin_base, err))
         else:
-            unpickler = pickle.Unpickler(fichier_enr)
-            try:
-                rec = unpickler.load()
-            except (EOFError, pickle.UnpicklingError):
-                self.logger.warning("Le fichier {} n'a pas pu être " \
-                        "chargé ".format(chemin_dest))
-        finally:
-            if "fichier_enr" in locals():
-                fichier_enr.close()
-            self.logger.info("{} objets récupérés".format(len(objets)))
+            self.logger.info("{} objets récupérés ({} enregistrés)".format(
+                    nb, len(objets)))
+
+        # Le chargement ne doit pas réécrire les objets
+        self.journal.sales.clear()
 
     def ajouter_objet(self, objet):
         """Ajoute les objets à la file des enregistrements."""
         if self.mode == "mongo":
             self.mongo_file.add(objet)
+        elif self.mode == "sqlite":
+            if self.stockage is not None:
+                self.stockage.marquer(objet)
+        elif self.journal is not None:
+            self.journal.marquer(objet)
 
     def detruire_objet(self, objet):
         """Détruit l'objet."""
         if self.mode == "mongo":
+            self.mongo_file.discard(objet)
             nom = self.qualname(type(objet))
             if "_id" in objet.__dict__:
-                self.mongo_db[nom].remove(objet._id)
+                self.mongo_lot.supprimer(nom, objet._id)
 
     def charger_groupe(self, groupe):
         """Cette fonction retourne les objets d'un groupe.
 
-        Le mode 'pickle' se base sur objets_par_type. Le mode 'mongo'
+        Les modes 'pickle' et 'sqlite' se basent sur le registre des
+        objets (tous les objets sont chargés au démarrage). Le mode 'mongo'
         récupère les collections et les fusionne (il peut y avoir
         plusieurs collections pour un seul groupe. Un groupe étant
         une classe, ses classes héritées sont également chargées.
@@ -322,17 +534,15 @@ class Module(BaseModule):
         if not self.pret:
             raise RuntimeError("le supenr n'est pas prêt à charger un groupe")
 
-        objets = []
-        if self.mode == "pickle":
-            for cls in objets_par_type.keys():
-                if issubclass(cls, groupe):
-                    objets.extend(objets_par_type[cls])
-        else:
-            for cls in classes_base.values():
-                if issubclass(cls, groupe):
-                    objets.extend(self.mongo_charger_collection(cls))
+        if self.mode in ("pickle", "sqlite"):
+            return objets.groupe(groupe)
 
-        return objets
+        trouves = []
+        for cls in classes_base.values():
+            if issubclass(cls, groupe):
+                trouves.extend(self.mongo_charger_collection(cls))
+
+        return trouves
 
     def charger_unique(self, groupe):
         """Cette fonction retourne l'objet unique correspondant.
@@ -347,32 +557,85 @@ class Module(BaseModule):
         if not self.pret:
             raise RuntimeError("le supenr n'est pas prêt à charger un groupe")
 
-        if self.mode == "pickle":
-            return objets_par_type.get(groupe, [None])[0]
+        if self.mode in ("pickle", "sqlite"):
+            return objets.premier(groupe)
         else:
-            objets = self.charger_groupe(groupe)
-            if len(objets) == 0:
+            trouves = self.charger_groupe(groupe)
+            if len(trouves) == 0:
                 return None
-            elif len(objets) > 1:
-                print("Plus d'un objet unique du même type: {}".format(objets))
+            elif len(trouves) > 1:
+                print("Plus d'un objet unique du même type: {}".format(
+                        trouves))
 
-            return objets[0]
+            return trouves[0]
+
+    def sqlite_charger(self):
+        """Charge tous les objets de la base SQLite."""
+        if not importeur.sauvegarde:
+            return
+
+        try:
+            nb = self.stockage.charger()
+        except (sqlite3.Error, EOFError, pickle.UnpicklingError) as err:
+            self.logger.warning("La base {} n'a pas pu être " \
+                    "chargée : {}".format(self.stockage.chemin, err))
+        else:
+            self.logger.info("{} objets récupérés ({} enregistrés)".format(
+                    nb, len(objets)))
+
+        # Le chargement ne doit pas réécrire les objets
+        self.stockage.sales.clear()
+
+    def sqlite_enregistrer_file(self):
+        """Écrit les objets modifiés dans la base SQLite.
+
+        Tous les objets modifiés depuis la dernière écriture sont écrits
+        dans une seule transaction (voir StockageSQLite.ecrire). Si
+        assez de lignes ont été écrites depuis le dernier nettoyage,
+        les objets devenus inaccessibles sont ensuite supprimés de la
+        base (voir StockageSQLite.nettoyer).
+
+        """
+        if self.enregistre_actuellement:
+            return
+
+        debut = time.time()
+        try:
+            nb = self.stockage.ecrire()
+        except sqlite3.Error as err:
+            # Les objets restent marqués, ils seront écrits au prochain tour
+            self.logger.warning("La base {} n'a pas pu être écrite, " \
+                    "nouvel essai au prochain tour : {}".format(
+                    self.stockage.chemin, err))
+            return
+
+        if nb:
+            self.nb_ecrits = nb
+            self.tps_ecriture = time.time() - debut
+
+        if self.stockage.doit_nettoyer():
+            debut = time.time()
+            try:
+                nb = self.stockage.nettoyer()
+            except sqlite3.Error as err:
+                self.logger.warning("La base {} n'a pas pu être " \
+                        "nettoyée : {}".format(self.stockage.chemin, err))
+            else:
+                self.nb_nettoyes = nb
+                self.tps_nettoyage = time.time() - debut
+                if nb:
+                    self.logger.info("{} objets inaccessibles supprimés " \
+                            "de la base".format(nb))
 
     def mongo_charger_collection(self, classe):
         """Charge la collection correspondante.
 
         Les objets chargés sont retournés sous la forme d'une liste.
+        Les objets qu'ils référencent sont chargés par lots (voir
+        ChargeurMongo).
 
         """
-        nom = self.qualname(classe)
-        objets = []
-        valeurs = self.mongo_db[nom].find()
-        for attributs in valeurs:
-            _id = attributs["_id"]
-            objet = self.mongo_charger_objet(classe, _id)
-            objets.append(objet)
-
-        return objets
+        return self.mongo_chargeur.charger_collection(classe)
 
     def mongo_charger_objet(self, classe, _id):
         """Récupère un objet individuel.
@@ -382,72 +645,16 @@ class Module(BaseModule):
             Ou charger l'objet depuis MongoDB
 
         """
-        nom = self.qualname(classe)
-        charges = self.mongo_objets.get(nom, {})
-        if _id in charges:
-            return charges[_id]
-
-        collection = self.mongo_db[nom]
-        objet = classe(*classe.__getnewargs__(classe))
-        enr = self.mongo_objets.get(nom, {})
-        enr[_id] = objet
-        self.mongo_objets[nom] = enr
-
-        # Traitement des attributs
-        attributs = collection.find_one(_id)
-
-        if attributs is None:
-            del enr["_d"]
-            return None
-
-        self.mongo_charger_dictionnaire(attributs)
-
-        for transform in transforms:
-            transform.transform_outgoing(attributs, collection)
-
-        objet.__setstate__(attributs)
-        return objet
-
-    def mongo_charger_dictionnaire(self, dictionnaire):
-        """Charge les informations d'un dictionnaire."""
-        for cle, valeur in tuple(dictionnaire.items()):
-            if isinstance(valeur, list) and len(valeur) == 2 and \
-                    isinstance(valeur[0], str) and isinstance(valeur[1],
-                    ObjectId):
-                classe = classes_base[valeur[0]]
-                objet = self.mongo_charger_objet(classe, valeur[1])
-                dictionnaire[cle] = objet
-            elif isinstance(valeur, list):
-                self.mongo_charger_liste(valeur)
-            elif isinstance(valeur, dict):
-                self.mongo_charger_dictionnaire(valeur)
-
-    def mongo_charger_liste(self, liste):
-        """Charge la liste."""
-        copie = []
-        for valeur in liste:
-            if isinstance(valeur, list) and len(valeur) == 2 and \
-                    isinstance(valeur[0], str) and isinstance(valeur[1],
-                    ObjectId):
-                classe = classes_base[valeur[0]]
-                objet = self.mongo_charger_objet(classe, valeur[1])
-                copie.append(objet)
-            elif isinstance(valeur, list):
-                self.mongo_charger_liste(valeur)
-                copie.append(valeur)
-            elif isinstance(valeur, dict):
-                self.mongo_charger_dictionnaire(valeur)
-                copie.append(valeur)
-            else:
-                copie.append(valeur)
-
-        liste[:] = copie
+        return self.mongo_chargeur.charger_objet(classe, _id)
 
     def mongo_enregistrer_file(self, rappel=True, debug=False):
         """Enregistre la file des objets (mongo).
 
         Les objets à enregistrer sont soit à insérer, soit à
-        modifier.
+        modifier. Les objets référencés qui n'ont pas encore été
+        enregistrés reçoivent un identifiant (ObjectId) et sont
+        ajoutés à la file. Les écritures sont regroupées par
+        collection (voir LotMongo).
 
         """
         if not debug:
@@ -457,37 +664,38 @@ class Module(BaseModule):
             importeur.diffact.ajouter_action("enregistrement", 10,
                     self.mongo_enregistrer_file)
 
-        if debug:
-            print("Premier passage")
-
         t1 = time.time()
-        reste = []
-        for objet in self.mongo_file:
-            second, attributs = self.extraire_attributs(objet)
+        file = deque(self.mongo_file)
+        self.mongo_file.clear()
+        enregistres = set()
+        while file:
+            objet = file.popleft()
+            if id(objet) in enregistres or not objet.e_existe:
+                continue
+
+            enregistres.add(id(objet))
+            attributs = self.extraire_attributs(objet, file)
             if debug:
                 print(" ", type(objet), attributs)
             self.mongo_enregistrer_objet(objet, attributs)
-            if second:
-                reste.append(objet)
 
-        if debug:
-            print("Second passage")
-
-        for objet in reste:
-            second, attributs = self.extraire_attributs(objet)
-            if debug:
-                print(" ", type(objet), attributs)
-            self.mongo_enregistrer_objet(objet, attributs)
+        try:
+            self.mongo_lot.envoyer()
+        except InvalidDocument as err:
+            print(err)
+            sys.exit(1)
 
-        self.mongo_file.clear()
+        del self.mongo_table[:-100]
         t2 = time.time()
         self.mongo_debug = False
         return t2 - t1
 
     def mongo_enregistrer_objet(self, objet, attributs):
-        """Enregistre l'objet dans une base MongoDB.
+        """Ajoute l'objet au lot d'écritures MongoDB.
 
-        Si l'objet n'existe pas, l'insert. Sinon le met à jour.
+        L'objet doit avoir un identifiant (voir mongo_identifier) :
+        s'il n'existe pas dans la base, il est inséré. Sinon il est
+        mis à jour.
 
         """
         nom = self.qualname(type(objet))
@@ -495,94 +703,78 @@ class Module(BaseModule):
         for transform in transforms:
             transform.transform_incoming(attributs, collection)
 
-        if "_id" in attributs: # L'objet existe
-            _id = attributs.pop("_id")
-            try:
-                collection.update({"_id": _id}, attributs)
-            except InvalidDocument as err:
-                print(err, objet, type(objet), attributs)
-                sys.exit(1)
-        else:
-            try:
-                _id = collection.insert(attributs)
-            except InvalidDocument as err:
-                print(err, objet, type(objet), attributs)
-                sys.exit(1)
-            objet._id = _id
-            enr = self.mongo_objets.get(nom, {})
-            enr[_id] = objet
-            self.mongo_objets[nom] = enr
-
-    def extraire_attributs(self, objet):
+        _id = attributs["_id"]
+        self.mongo_lot.remplacer(nom, attributs)
+        enr = self.mongo_objets.get(nom, {})
+        enr[_id] = objet
+        self.mongo_objets[nom] = enr
+        self.mongo_table.append((time.time(), nom, _id))
+
+    def mongo_identifier(self, objet, file=None):
+        """Retourne l'identifiant MongoDB (ObjectId) de l'objet.
+
+        Si l'objet n'en a pas encore, on le crée côté client et on
+        ajoute l'objet à la file des objets à enregistrer.
+
+        """
+        _id = objet.__dict__.get("_id")
+        if _id is None:
+            _id = objet.__dict__["_id"] = ObjectId()
+            if file is not None:
+                file.append(objet)
+
+        return _id
+
+    def extraire_attributs(self, objet, file=None):
         """Méthode utilisée par MongoDB pour extraire les attributs d'un objet.
 
         On s'inspire de objet.__dict__ pour lister les attributs
-        et leur valeur respective. Cependant, on retourne second.
+        et leur valeur respective. Un objet BaseObj est toujours
+        enregistré avec son identifiant.
 
-        Le booléen second est utilisé quand l'un des attributs de
-        l'objet fait référence à un autre objet BaseObj. Dans ce cas,
-        on enregistre le nom de sa collection et son ObjetID.
-        Cependant, si l'objet cible n'a pas encore été enregistré,
-        il n'a pas d'_id. Il faut donc enregistrer le premier objet
-        sans cet attribut, puis enregistrer le second, puis réenregistrer
-        le premier qui cette fois peut référencer le second en attribut.
+        Quand l'un des attributs de l'objet fait référence à un autre
+        objet BaseObj, on enregistre le nom de sa collection et son
+        ObjectId. Si l'objet cible n'a pas encore été enregistré, son
+        identifiant est créé et il est ajouté à la file (voir
+        mongo_identifier).
 
         """
         if isinstance(objet, dict):
             attributs = objet
         else:
             attributs = dict(objet.__getstate__())
+            attributs["_id"] = self.mongo_identifier(objet)
 
-        second = False
         for cle, valeur in tuple(attributs.items()):
             if isinstance(valeur, BaseObj):
-                if "_id" in valeur.__dict__:
-                    attributs[cle] = (self.qualname(type(valeur)),
-                    valeur._id)
-                else:
-                    del attributs[cle]
-                    second = True
+                attributs[cle] = (self.qualname(type(valeur)),
+                        self.mongo_identifier(valeur, file))
             elif isinstance(valeur, list):
                 attributs[cle] = valeur = list(valeur)
-                sous = self.extraire_liste(valeur)
-                if sous:
-                    second = True
+                self.extraire_liste(valeur, file)
             elif isinstance(valeur, dict):
                 attributs[cle] = valeur = dict(valeur)
-                sous, r = self.extraire_attributs(valeur)
-                if sous:
-                    second = True
+                self.extraire_attributs(valeur, file)
 
-        return second, attributs
+        return attributs
 
-    def extraire_liste(self, liste):
+    def extraire_liste(self, liste, file=None):
         """Extrait les valeurs de la liste."""
         copie = []
-        second = False
         for valeur in liste:
             if isinstance(valeur, BaseObj):
-                if "_id" in valeur.__dict__:
-                    valeur = (self.qualname(type(valeur)), valeur._id)
-                else:
-                    second = True
-                    continue
+                valeur = (self.qualname(type(valeur)),
+                        self.mongo_identifier(valeur, file))
             elif isinstance(valeur, list):
                 valeur = list(valeur)
-                sous = self.extraire_liste(valeur)
-                if sous:
-                    second = True
-                    continue
+                self.extraire_liste(valeur, file)
             elif isinstance(valeur, dict):
                 valeur = dict(valeur)
-                sous = self.extraire_attributs(valeur)
-                if sous:
-                    second = True
-                    continue
+                self.extraire_attributs(valeur, file)
 
             copie.append(valeur)
 
         liste[:] = copie
-        return second
 
     @staticmethod
     def qualname(classe):
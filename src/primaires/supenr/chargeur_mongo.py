@@ -0,0 +1,286 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier contient la classe ChargeurMongo, détaillée plus bas."""
+
+from bson.objectid import ObjectId
+
+from abstraits.obase import MetaBaseObj, classes_base
+
+class Paresseux:
+
+    """Objet dont l'état n'est chargé qu'au premier accès.
+
+    Cette classe est utilisée comme classe-mère d'une sous-classe
+    créée pour chaque classe dont la collection est chargée à la
+    demande (voir ChargeurMongo.creer_paresseux). Au premier accès à
+    un attribut de l'objet (ou à sa modification), le document est
+    récupéré et l'objet reprend sa vraie classe : les accès suivants
+    ne passent plus par cette classe.
+
+    """
+
+    def __getattribute__(self, nom):
+        if nom in ("__class__", "__dict__"):
+            return object.__getattribute__(self, nom)
+
+        type(self).chargeur.realiser(self)
+        return getattr(self, nom)
+
+    def __setattr__(self, nom, valeur):
+        type(self).chargeur.realiser(self)
+        setattr(self, nom, valeur)
+
+
+class ChargeurMongo:
+
+    """Chargement des objets enregistrés dans MongoDB.
+
+    Les objets référencés par les documents chargés sont récupérés en
+    largeur : à chaque étape, les identifiants de tous les objets
+    référencés et pas encore chargés sont regroupés par collection et
+    récupérés par une seule requête ($in) par paquet de 'taille'
+    identifiants. Le nombre de requêtes dépend donc de la profondeur
+    des références et non du nombre d'objets.
+
+    Les objets des collections indiquées dans 'paresseuses' ne sont
+    pas chargés quand ils sont référencés : ils ne le sont qu'au
+    premier accès (voir Paresseux). Le chargement d'une collection
+    entière (voir charger_collection) charge cependant tous ses
+    objets, paresseux compris : seules les collections jamais
+    chargées en entier profitent donc du chargement à la demande.
+
+    Les objets chargés sont placés dans 'objets', un dictionnaire
+    {nom de collection: {_id: objet}} partagé avec le module supenr.
+
+    """
+
+    def __init__(self, db, objets, transforms=(), paresseuses=(),
+            taille=1000):
+        self.db = db
+        self.objets = objets
+        self.transforms = transforms
+        self.paresseuses = set(paresseuses)
+        self.taille = taille
+        self.classes_paresseuses = {}
+        self.nb_requetes = 0
+
+    def charger_collection(self, classe):
+        """Charge la collection de la classe et retourne ses objets."""
+        nom = qualname(classe)
+        charges = self.objets.get(nom, {})
+        self.objets[nom] = charges
+        objets = []
+        documents = []
+        self.nb_requetes += 1
+        for document in self.db[nom].find():
+            _id = document["_id"]
+            objet = charges.get(_id)
+            if objet is None:
+                objet = charges[_id] = self.creer(classe, _id)
+            elif isinstance(objet, Paresseux):
+                object.__setattr__(objet, "__class__", classe)
+            else:
+                objets.append(objet)
+                continue
+
+            objets.append(objet)
+            documents.append((objet, document))
+
+        self.restaurer(documents)
+        return objets
+
+    def charger_objet(self, classe, _id):
+        """Retourne l'objet indiqué, en le chargeant si besoin.
+
+        Si l'objet n'existe pas, retourne None.
+
+        """
+        nom = qualname(classe)
+        if _id not in self.objets.get(nom, {}):
+            a_charger = {}
+            self.referencer(nom, _id, a_charger)
+            self.restaurer(self.recuperer(a_charger))
+
+        return self.objets.get(nom, {}).get(_id)
+
+    def creer(self, classe, _id):
+        """Crée l'objet, sans l'initialiser."""
+        objet = classe.__new__(classe, *classe.__getnewargs__(classe))
+        objet.__dict__["_id"] = _id
+        return objet
+
+    def creer_paresseux(self, classe, _id):
+        """Crée l'objet, chargé au premier accès (voir Paresseux)."""
+        paresseuse = self.classes_paresseuses.get(classe)
+        if paresseuse is None:
+            # La métaclasse n'est pas appelée : la classe n'est pas
+            # enregistrée dans classes_base
+            paresseuse = MetaBaseObj.__new__(MetaBaseObj, classe.__name__,
+                    (Paresseux, classe), {"__module__": classe.__module__,
+                    "chargeur": self, "classe_reelle": classe})
+            self.classes_paresseuses[classe] = paresseuse
+
+        return self.creer(paresseuse, _id)
+
+    def realiser(self, objet):
+        """Charge l'objet paresseux indiqué."""
+        classe = type(objet).classe_reelle
+        nom = qualname(classe)
+        _id = objet.__dict__["_id"]
+        self.nb_requetes += 1
+        document = self.db[nom].find_one({"_id": _id})
+        object.__setattr__(objet, "__class__", classe)
+        if document is None:
+            self.objets.get(nom, {}).pop(_id, None)
+            objet.__dict__["e_existe"] = False
+        else:
+            self.restaurer([(objet, document)])
+
+    def referencer(self, nom, _id, a_charger):
+        """Crée l'objet référencé s'il n'est pas encore chargé.
+
+        Son identifiant est ajouté au dictionnaire a_charger
+        ({nom de collection: [identifiants]}), sauf si sa collection
+        est chargée à la demande.
+
+        """
+        charges = self.objets.get(nom)
+        if charges is None:
+            charges = self.objets[nom] = {}
+
+        if _id in charges:
+            return
+
+        classe = classes_base[nom]
+        if nom in self.paresseuses:
+            charges[_id] = self.creer_paresseux(classe, _id)
+        else:
+            charges[_id] = self.creer(classe, _id)
+            a_charger.setdefault(nom, []).append(_id)
+
+    def parcourir(self, valeur, a_charger):
+        """Parcourt le document à la recherche de références."""
+        if isinstance(valeur, dict):
+            valeurs = valeur.values()
+        elif isinstance(valeur, list):
+            if est_reference(valeur):
+                self.referencer(valeur[0], valeur[1], a_charger)
+                return
+
+            valeurs = valeur
+        else:
+            return
+
+        for valeur in valeurs:
+            if isinstance(valeur, (dict, list)):
+                self.parcourir(valeur, a_charger)
+
+    def recuperer(self, a_charger):
+        """Récupère les documents des objets à charger.
+
+        On retourne une liste de tuples (objet, document). Les objets
+        dont le document n'a pas été trouvé sont retirés des objets
+        chargés.
+
+        """
+        documents = []
+        for nom, identifiants in a_charger.items():
+            charges = self.objets[nom]
+            collection = self.db[nom]
+            trouves = set()
+            for i in range(0, len(identifiants), self.taille):
+                self.nb_requetes += 1
+                for document in collection.find({"_id": {
+                        "$in": identifiants[i:i + self.taille]}}):
+                    trouves.add(document["_id"])
+                    documents.append((charges[document["_id"]], document))
+
+            for _id in identifiants:
+                if _id not in trouves:
+                    del charges[_id]
+
+        return documents
+
+    def restaurer(self, documents):
+        """Restaure les objets à partir de leurs documents.
+
+        Les objets référencés sont récupérés au préalable, en largeur.
+        L'état des objets n'est restauré qu'une fois tous les
+        documents récupérés.
+
+        """
+        a_restaurer = []
+        while documents:
+            a_charger = {}
+            for objet, document in documents:
+                self.parcourir(document, a_charger)
+                a_restaurer.append((objet, document))
+
+            documents = self.recuperer(a_charger)
+
+        for objet, document in a_restaurer:
+            self.resoudre(document)
+            collection = self.db[qualname(type(objet))]
+            for transform in self.transforms:
+                transform.transform_outgoing(document, collection)
+
+            objet.__setstate__(document)
+
+    def resoudre(self, valeur):
+        """Remplace les références du document par les objets."""
+        if isinstance(valeur, dict):
+            for cle, sous in tuple(valeur.items()):
+                if isinstance(sous, list) and est_reference(sous):
+                    valeur[cle] = self.objets.get(sous[0], {}).get(sous[1])
+                elif isinstance(sous, (dict, list)):
+                    self.resoudre(sous)
+        elif isinstance(valeur, list):
+            copie = []
+            for sous in valeur:
+                if isinstance(sous, list) and est_reference(sous):
+                    sous = self.objets.get(sous[0], {}).get(sous[1])
+                elif isinstance(sous, (dict, list)):
+                    self.resoudre(sous)
+
+                copie.append(sous)
+
+            valeur[:] = copie
+
+
+def est_reference(liste):
+    """Retourne True si la liste représente une référence à un objet."""
+    return len(liste) == 2 and isinstance(liste[0], str) and \
+            isinstance(liste[1], ObjectId)
+
+def qualname(classe):
+    """Retourne le nom de la collection de la classe."""
+    return classe.__module__ + "." + classe.__name__
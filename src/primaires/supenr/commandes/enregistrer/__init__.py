@@ -37,7 +37,7 @@ from primaires.interpreteur.commande.commande import Commande
 ## Constantes
 AIDE = """
 Cette commande force l'enregistrement si la sauvegarde est en mode
-binaire (pickle). L'enregistrement initié peut prendre un certain
+binaire (pickle) ou SQLite. L'enregistrement initié peut prendre un certain
 temps (ceci dépend de la taille de la sauvegarde).
 """.strip("\n")
 
@@ -54,7 +54,7 @@ class CmdEnregistrer(Commande):
 
     def peut_executer(self, personnage):
         """Ne peut exécuter si le mode n'es tpas enregistrer."""
-        return importeur.supenr.mode == "pickle"
+        return importeur.supenr.mode in ("pickle", "sqlite")
 
     def interpreter(self, personnage, dic_masques):
         """Méthode d'interprétation de commande"""
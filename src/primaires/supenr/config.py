@@ -33,9 +33,11 @@
 cfg_supenr = r"""
 # Ce fichier contient la configuration du module primaire supenr.
 # Ce module est responsable de l'enregistrement de tout le MUD en
-# mémoire. Deux modes d'enregistrement sont poroposés : 'pickle', le
+# mémoire. Trois modes d'enregistrement sont poroposés : 'pickle', le
 # mode par défaut, qui enregistre toute la sauvegarde dans un fichier
-# binaire grâce au module 'pickle'. Et 'mongo', qui essaye de se
+# binaire grâce au module 'pickle'. 'sqlite', qui enregistre chaque
+# objet dans une base SQLite (une table par classe), sans bibliothèque
+# supplémentaire. Et 'mongo', qui essaye de se
 # connecter à un serveur MongoDB (grâce à 'pymongo') pour enregistrer
 # ses informations. Pour un MUD aux proportions assez modestes,
 # 'pickle' est préférable car il est bien plus facile à déployer
@@ -44,7 +46,9 @@ cfg_supenr = r"""
 # préférable si la taille de l'univers est assez importante.
 
 ## Mode d'enregistrement
-# Choisissez 'pickle' ou 'mongo' ci-dessous. 'mongo' nécessite la
+# Choisissez 'pickle', 'sqlite' ou 'mongo' ci-dessous. 'sqlite'
+# enregistre les objets dans le fichier 'enregistrements.db' du
+# répertoire d'enregistrement. 'mongo' nécessite la
 # bibliothèque 'pymongo' et la mise en place d'un serveur MongoDB.
 # Si la connexion au serveur échoue, le système repasse automatiquement
 # sur 'pickle' après avoir loggé l'erreur.
@@ -56,4 +60,58 @@ mode = 'pickle'
 # ou lue.
 nom_mongodb = "tsunami"
 
+## Collections chargées à la demande
+# En mode 'mongo', les objets référencés par les objets chargés au
+# démarrage sont récupérés par lots. Les objets des collections
+# indiquées ci-dessous ne sont cependant chargés qu'au premier accès,
+# ce qui est préférable pour les collections rarement consultées.
+# Seules les classes dont les objets ne sont jamais chargés en groupe
+# par un module (charger_groupe) en profitent : une collection chargée
+# en groupe au démarrage, comme celle des joueurs, est lue en entier.
+# Précisez le nom complet des classes, par exemple les messages de
+# la messagerie, qui ne sont accessibles que depuis les boîtes mail :
+# mongo_paresseuses = ["primaires.communication.mudmail.MUDmail"]
+mongo_paresseuses = []
+
+## Intervalle d'écriture du journal
+# En mode 'pickle', seuls les objets modifiés sont enregistrés, à
+# la fin du fichier journal (en mode 'sqlite', dans la base, en une
+# seule transaction). Précisez ci-dessous l'intervalle (en
+# secondes) entre deux écritures du journal.
+intervalle_journal = 10
+
+## Compaction du journal
+# Quand le journal atteint une certaine taille, toute la sauvegarde
+# est réécrite et le journal est vidé. Précisez ci-dessous le ratio
+# maximum entre la taille du journal et celle de la sauvegarde
+# complète (1 signifie que le journal peut atteindre la taille de
+# la sauvegarde). En mode 'sqlite', les objets inaccessibles sont
+# supprimés de la base quand le nombre d'objets écrits depuis le
+# dernier nettoyage dépasse ce ratio du nombre d'objets enregistrés.
+ratio_compaction = 1
+
+## Générations de la sauvegarde
+# La sauvegarde complète est écrite dans un fichier temporaire puis
+# renommée. Les sauvegardes précédentes sont conservées : si la plus
+# récente est corrompue, la précédente est chargée au démarrage.
+# Précisez ci-dessous le nombre de générations à conserver (1 pour
+# ne conserver que la dernière sauvegarde).
+generations = 3
+
+## Enregistrement différé
+# Si cette option est activée, l'écriture du journal et sa compaction
+# se font dans un thread à part : seule la sérialisation des objets
+# modifiés se fait dans la boucle principale. Si elle est désactivée,
+# tout l'enregistrement se fait dans la boucle principale.
+enregistrement_differe = True
+
+## Format compact
+# En modes 'pickle' et 'sqlite', l'état de chaque objet peut être
+# encodé dans un format compact : les noms d'attributs sont remplacés
+# par leur indice dans une table propre à chaque classe et les
+# entiers sont encodés sur un nombre variable d'octets. Si cette
+# option est désactivée, les objets sont sérialisés par 'pickle'. Les
+# deux formats peuvent être relus quelle que soit l'option.
+format_compact = True
+
 """
@@ -0,0 +1,104 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier contient la classe Ecrivain, détaillée plus bas."""
+
+import queue
+import threading
+import time
+import traceback
+
+class Ecrivain(threading.Thread):
+
+    """Thread chargé des écritures du module supenr.
+
+    Les tâches (des fonctions ne manipulant que des fichiers, comme
+    Journal.ajouter ou Journal.fusionner) sont exécutées dans l'ordre
+    où elles ont été ajoutées. Leur résultat, leur durée et l'exception
+    éventuellement levée sont placés dans une file que le thread
+    principal consulte (voir resultats).
+
+    """
+
+    def __init__(self, logger):
+        threading.Thread.__init__(self, name="supenr")
+        self.daemon = True
+        self.logger = logger
+        self.taches = queue.Queue()
+        self.termines = queue.Queue()
+
+    def ajouter_tache(self, nom, fonction, *args):
+        """Ajoute une tâche à exécuter."""
+        self.taches.put((nom, fonction, args))
+
+    def run(self):
+        while True:
+            tache = self.taches.get()
+            if tache is None:
+                self.taches.task_done()
+                break
+
+            nom, fonction, args = tache
+            debut = time.time()
+            resultat = erreur = None
+            try:
+                resultat = fonction(*args)
+            except Exception as err:
+                self.logger.warning("Erreur lors de la tâche {} :\n{}".format(
+                        nom, traceback.format_exc()))
+                erreur = err
+
+            self.termines.put((nom, resultat, time.time() - debut, erreur))
+            self.taches.task_done()
+
+    def resultats(self):
+        """Retourne la liste des tâches terminées.
+
+        Chaque élément est un tuple (nom, résultat, durée, erreur) :
+        erreur est l'exception levée par la tâche (None si elle a
+        réussi, le résultat valant alors None).
+
+        """
+        resultats = []
+        while True:
+            try:
+                resultats.append(self.termines.get_nowait())
+            except queue.Empty:
+                return resultats
+
+    def attendre(self):
+        """Attend que toutes les tâches soient terminées."""
+        self.taches.join()
+
+    def arreter(self):
+        """Termine les tâches en cours et arrête le thread."""
+        self.taches.put(None)
+        self.join()
@@ -0,0 +1,416 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier contient la classe Encodeur, détaillée plus bas."""
+
+import pickle
+import struct
+
+from abstraits.obase import BaseObj
+
+# Premier octet des données encodées (un pickle commence par \x80)
+SIGNATURE = b"\xfe"
+
+# Marqueurs de type des valeurs
+NUL = 0
+FAUX = 1
+VRAI = 2
+ENTIER = 3
+REEL = 4
+CHAINE = 5
+OCTETS = 6
+LISTE = 7
+TUPLE = 8
+DICT = 9
+ENSEMBLE = 10
+OBJET = 11
+PICKLE = 12
+
+# Les entiers de 0 à 127 sont encodés sur un seul octet (marqueur >= 128)
+PETIT_ENTIER = 0x80
+
+# Mode d'encodage de l'état
+CHAMPS = 0
+VALEUR = 1
+
+REEL_BINAIRE = struct.Struct("<d")
+
+class ConteneurPartage(Exception):
+
+    """Conteneur rencontré plusieurs fois dans l'état encodé."""
+
+
+class Encodeur:
+
+    """Encodeur compact de l'état des objets de base.
+
+    Au lieu de sérialiser le dictionnaire renvoyé par __getstate__
+    (et donc le nom de chaque attribut pour chaque objet), l'encodeur
+    attribue à chaque classe une table de champs : un attribut est
+    représenté par son indice dans cette table. Les tables ne font que
+    grandir (un attribut ajouté reçoit l'indice suivant), ce qui permet
+    de relire les données encodées avec une table plus ancienne. Elles
+    doivent être enregistrées avec les données (voir schema et
+    restaurer_schema), l'attribut 'modifie' indiquant qu'elles ont
+    changé depuis le dernier enregistrement.
+
+    Les valeurs sont précédées d'un octet indiquant leur type. Les
+    entiers sont encodés en varint (7 bits par octet, après
+    transformation zigzag des négatifs), ceux de 0 à 127 tenant dans
+    l'octet de type. Les objets de base référencés sont remplacés par
+    leur identifiant (voir Serialiseur.identifier). Les autres types
+    (Fraction, collections de bases.collections...) sont sérialisés par
+    pickle.
+
+    Si une même liste, un même dictionnaire ou un même ensemble est
+    référencé plusieurs fois dans l'état d'un objet (ou se contient
+    lui-même), l'état entier est sérialisé par pickle, qui conserve
+    ces références partagées.
+
+    """
+
+    def __init__(self, serialiseur):
+        self.serialiseur = serialiseur
+        self.classes = []
+        self.indices_classes = {}
+        self.champs = []
+        self.indices_champs = []
+        self.modifie = False
+        self.file = None
+        self.references = None
+        self.vus = None
+        self.encodeurs = {
+            int: self.encoder_entier,
+            float: self.encoder_reel,
+            str: self.encoder_chaine,
+            bytes: self.encoder_octets,
+            list: self.encoder_liste,
+            tuple: self.encoder_tuple,
+            dict: self.encoder_dict,
+            set: self.encoder_ensemble,
+        }
+
+    def indice_classe(self, nom):
+        """Retourne l'indice de la classe, en l'ajoutant si besoin."""
+        indice = self.indices_classes.get(nom)
+        if indice is None:
+            indice = len(self.classes)
+            self.classes.append(nom)
+            self.indices_classes[nom] = indice
+            self.champs.append([])
+            self.indices_champs.append({})
+            self.modifie = True
+
+        return indice
+
+    def schema(self):
+        """Retourne les tables des classes et des champs (bytes)."""
+        return pickle.dumps((self.classes, self.champs),
+                pickle.HIGHEST_PROTOCOL)
+
+    def restaurer_schema(self, donnees):
+        """Restaure les tables retournées par schema."""
+        classes, champs = pickle.loads(donnees)
+        self.classes = list(classes)
+        self.indices_classes = {nom: i for i, nom in enumerate(classes)}
+        self.champs = [list(noms) for noms in champs]
+        self.indices_champs = [{nom: i for i, nom in enumerate(noms)} \
+                for noms in champs]
+        self.modifie = False
+
+    def encoder(self, nom, arguments, etat, file):
+        """Encode l'objet.
+
+        Les objets de base référencés pour la première fois sont ajoutés
+        à la file. On retourne un tuple (données, identifiants
+        référencés).
+
+        Les conteneurs modifiables (listes, dictionnaires, ensembles)
+        de l'état sont suivis par leur id() : si l'un d'eux est
+        rencontré une seconde fois, l'état est réencodé par pickle
+        (marqueur PICKLE).
+
+        """
+        self.file = file
+        self.references = set()
+        tampon = bytearray(SIGNATURE)
+        indice = self.indice_classe(nom)
+        ecrire_varint(tampon, indice)
+        self.encoder_valeur(tampon, arguments)
+        debut = len(tampon)
+        self.vus = set()
+        try:
+            self.encoder_etat(tampon, indice, etat)
+        except ConteneurPartage:
+            del tampon[debut:]
+            tampon.append(VALEUR)
+            self.references = set()
+            self.encoder_pickle(tampon, etat)
+        finally:
+            self.vus = None
+
+        references = self.references
+        self.file = self.references = None
+        return bytes(tampon), references
+
+    def encoder_etat(self, tampon, indice, etat):
+        """Ajoute l'état encodé au tampon."""
+        if type(etat) is dict and all(type(cle) is str for cle in etat):
+            tampon.append(CHAMPS)
+            ecrire_varint(tampon, len(etat))
+            champs = self.champs[indice]
+            indices = self.indices_champs[indice]
+            for champ, valeur in etat.items():
+                position = indices.get(champ)
+                if position is None:
+                    position = len(champs)
+                    champs.append(champ)
+                    indices[champ] = position
+                    self.modifie = True
+
+                ecrire_varint(tampon, position)
+                self.encoder_valeur(tampon, valeur)
+        else:
+            tampon.append(VALEUR)
+            self.encoder_valeur(tampon, etat)
+
+    def suivre(self, conteneur):
+        """Note le conteneur, déjà rencontré s'il est partagé."""
+        if self.vus is None:
+            return
+
+        if id(conteneur) in self.vus:
+            raise ConteneurPartage
+
+        self.vus.add(id(conteneur))
+
+    def encoder_valeur(self, tampon, valeur):
+        """Ajoute la valeur encodée au tampon."""
+        methode = self.encodeurs.get(type(valeur))
+        if methode is not None:
+            methode(tampon, valeur)
+        elif valeur is None:
+            tampon.append(NUL)
+        elif valeur is True:
+            tampon.append(VRAI)
+        elif valeur is False:
+            tampon.append(FAUX)
+        elif isinstance(valeur, BaseObj):
+            self.encoder_objet(tampon, valeur)
+        else:
+            self.encoder_pickle(tampon, valeur)
+
+    def encoder_pickle(self, tampon, valeur):
+        donnees, references = self.serialiseur.pickler(valeur, self.file)
+        self.references.update(references)
+        tampon.append(PICKLE)
+        ecrire_varint(tampon, len(donnees))
+        tampon += donnees
+
+    def encoder_entier(self, tampon, valeur):
+        if 0 <= valeur < 128:
+            tampon.append(PETIT_ENTIER | valeur)
+        else:
+            tampon.append(ENTIER)
+            ecrire_varint(tampon, valeur * 2 if valeur >= 0 else \
+                    -valeur * 2 - 1)
+
+    def encoder_reel(self, tampon, valeur):
+        tampon.append(REEL)
+        tampon += REEL_BINAIRE.pack(valeur)
+
+    def encoder_chaine(self, tampon, valeur):
+        donnees = valeur.encode("utf-8", "surrogatepass")
+        tampon.append(CHAINE)
+        ecrire_varint(tampon, len(donnees))
+        tampon += donnees
+
+    def encoder_octets(self, tampon, valeur):
+        tampon.append(OCTETS)
+        ecrire_varint(tampon, len(valeur))
+        tampon += valeur
+
+    def encoder_liste(self, tampon, valeur):
+        self.suivre(valeur)
+        tampon.append(LISTE)
+        ecrire_varint(tampon, len(valeur))
+        for element in valeur:
+            self.encoder_valeur(tampon, element)
+
+    def encoder_tuple(self, tampon, valeur):
+        tampon.append(TUPLE)
+        ecrire_varint(tampon, len(valeur))
+        for element in valeur:
+            self.encoder_valeur(tampon, element)
+
+    def encoder_ensemble(self, tampon, valeur):
+        self.suivre(valeur)
+        tampon.append(ENSEMBLE)
+        ecrire_varint(tampon, len(valeur))
+        for element in valeur:
+            self.encoder_valeur(tampon, element)
+
+    def encoder_dict(self, tampon, valeur):
+        self.suivre(valeur)
+        tampon.append(DICT)
+        ecrire_varint(tampon, len(valeur))
+        for cle, element in valeur.items():
+            self.encoder_valeur(tampon, cle)
+            self.encoder_valeur(tampon, element)
+
+    def encoder_objet(self, tampon, objet):
+        ident, nouveau = self.serialiseur.identifier(objet)
+        if nouveau:
+            self.file.append(objet)
+
+        self.references.add(ident)
+        nom = type(objet).__module__ + "." + type(objet).__name__
+        tampon.append(OBJET)
+        ecrire_varint(tampon, ident)
+        ecrire_varint(tampon, self.indice_classe(nom))
+        self.encoder_valeur(tampon, objet.__getnewargs__())
+
+    def decoder(self, donnees):
+        """Décode les données retournées par encoder.
+
+        On retourne un tuple (nom de classe, arguments, état).
+
+        """
+        donnees = memoryview(donnees)
+        indice, position = lire_varint(donnees, 1)
+        arguments, position = self.decoder_valeur(donnees, position)
+        mode = donnees[position]
+        position += 1
+        if mode == CHAMPS:
+            champs = self.champs[indice]
+            nb, position = lire_varint(donnees, position)
+            etat = {}
+            for i in range(nb):
+                champ, position = lire_varint(donnees, position)
+                etat[champs[champ]], position = self.decoder_valeur(
+                        donnees, position)
+        else:
+            etat, position = self.decoder_valeur(donnees, position)
+
+        return self.classes[indice], arguments, etat
+
+    def decoder_valeur(self, donnees, position):
+        """Décode la valeur à la position indiquée.
+
+        On retourne un tuple (valeur, position suivante).
+
+        """
+        marqueur = donnees[position]
+        position += 1
+        if marqueur >= PETIT_ENTIER:
+            return marqueur - PETIT_ENTIER, position
+        elif marqueur == NUL:
+            return None, position
+        elif marqueur == FAUX:
+            return False, position
+        elif marqueur == VRAI:
+            return True, position
+        elif marqueur == ENTIER:
+            nombre, position = lire_varint(donnees, position)
+            return (nombre >> 1) if not nombre & 1 else \
+                    -((nombre + 1) >> 1), position
+        elif marqueur == REEL:
+            return REEL_BINAIRE.unpack_from(donnees, position)[0], \
+                    position + REEL_BINAIRE.size
+        elif marqueur == CHAINE:
+            taille, position = lire_varint(donnees, position)
+            return str(donnees[position:position + taille], "utf-8",
+                    "surrogatepass"), position + taille
+        elif marqueur == OCTETS:
+            taille, position = lire_varint(donnees, position)
+            return bytes(donnees[position:position + taille]), \
+                    position + taille
+        elif marqueur in (LISTE, TUPLE, ENSEMBLE):
+            nb, position = lire_varint(donnees, position)
+            elements = []
+            for i in range(nb):
+                element, position = self.decoder_valeur(donnees, position)
+                elements.append(element)
+
+            if marqueur == TUPLE:
+                elements = tuple(elements)
+            elif marqueur == ENSEMBLE:
+                elements = set(elements)
+
+            return elements, position
+        elif marqueur == DICT:
+            nb, position = lire_varint(donnees, position)
+            dictionnaire = {}
+            for i in range(nb):
+                cle, position = self.decoder_valeur(donnees, position)
+                dictionnaire[cle], position = self.decoder_valeur(donnees,
+                        position)
+
+            return dictionnaire, position
+        elif marqueur == OBJET:
+            ident, position = lire_varint(donnees, position)
+            indice, position = lire_varint(donnees, position)
+            arguments, position = self.decoder_valeur(donnees, position)
+            return self.serialiseur.coquille(ident, self.classes[indice],
+                    arguments), position
+        elif marqueur == PICKLE:
+            taille, position = lire_varint(donnees, position)
+            return self.serialiseur.unpickler(
+                    donnees[position:position + taille]), position + taille
+        else:
+            raise ValueError("marqueur de type inconnu : {}".format(
+                    marqueur))
+
+
+def ecrire_varint(tampon, nombre):
+    """Ajoute l'entier positif au tampon, 7 bits par octet."""
+    while nombre > 0x7f:
+        tampon.append((nombre & 0x7f) | 0x80)
+        nombre >>= 7
+
+    tampon.append(nombre)
+
+def lire_varint(donnees, position):
+    """Lit un entier écrit par ecrire_varint.
+
+    On retourne un tuple (entier, position suivante).
+
+    """
+    nombre = 0
+    decalage = 0
+    while True:
+        octet = donnees[position]
+        position += 1
+        nombre |= (octet & 0x7f) << decalage
+        if octet < 0x80:
+            return nombre, position
+
+        decalage += 7
@@ -0,0 +1,567 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier contient la classe Journal, détaillée plus bas."""
+
+from collections import deque
+from contextlib import contextmanager
+import mmap
+import os
+import pickle
+import struct
+import zlib
+
+from primaires.supenr.serialiseur import Serialiseur
+
+# Version du format des fichiers du journal
+FORMAT = 1
+
+# En-tête de la base : signature, format, dernier segment contenu
+# et somme de contrôle des champs précédents
+SIGNATURE = b"KSJ\x00"
+ENTETE = struct.Struct("<4sIQI")
+
+# En-tête de chaque enregistrement : longueur et somme de contrôle
+TRAME = struct.Struct("<II")
+
+class Journal(Serialiseur):
+
+    """Enregistrement incrémental des objets (mode pickle).
+
+    Au lieu de sérialiser tout l'univers à chaque enregistrement, on
+    n'écrit que les objets modifiés depuis la dernière écriture (voir
+    Serialiseur). Un enregistrement est un tuple contenant :
+        l'identifiant de l'objet
+        un booléen indiquant si l'objet est une racine (un objet
+                enregistré et existant)
+        les identifiants des objets qu'il référence
+        les données de l'objet, sérialisées à part.
+
+    Les fichiers sont :
+        enregistrements.bin -- la base, contenant tous les objets
+        enregistrements.bin.<g> -- les générations précédentes de la
+                                   base
+        enregistrements.<n>.journal -- les segments, où sont ajoutés
+                                       les objets modifiés
+        enregistrements.schema -- les tables de l'encodeur (voir
+                                  Encodeur), réécrites quand elles
+                                  changent
+
+    La base commence par un en-tête indiquant le dernier segment
+    qu'elle contient. Chaque enregistrement est précédé de sa longueur
+    et de sa somme de contrôle (CRC32). La base est écrite dans un
+    fichier temporaire, synchronisé sur le disque puis renommé : les
+    générations précédentes sont conservées, ainsi que les segments
+    dont elles ont besoin. Au chargement, on lit la base la plus
+    récente qui soit intègre puis les segments plus récents, le
+    dernier enregistrement d'un objet l'emportant. Les fichiers sont
+    projetés en mémoire (mmap) plutôt que lus.
+
+    Quand les segments deviennent trop gros, le journal est compacté.
+    Il peut l'être à partir des objets en mémoire (compacter) ou à
+    partir des fichiers (fusionner) : dans ce cas, le journal passe
+    d'abord à un nouveau segment (rotation) et la fusion des fichiers
+    antérieurs peut se faire dans un autre thread. Dans les deux cas,
+    les objets qui ne sont plus accessibles depuis une racine
+    disparaissent.
+
+    Si la base est une ancienne sauvegarde (une liste de tous les
+    objets), elle est chargée telle quelle et le journal doit être
+    compacté en mémoire avant toute écriture (voir doit_compacter).
+
+    """
+
+    def __init__(self, repertoire, logger, ratio=1.0, generations=3):
+        Serialiseur.__init__(self, logger)
+        self.repertoire = repertoire
+        self.ratio = ratio
+        self.generations = generations
+        self.segment = 1
+        self.taille_base = 0
+        self.taille_journal = 0
+        self.compaction_requise = False
+
+    def __repr__(self):
+        return "<Journal {} ({} objets)>".format(repr(self.repertoire),
+                len(self.par_ident))
+
+    @property
+    def chemin_base(self):
+        return os.path.join(self.repertoire, "enregistrements.bin")
+
+    @property
+    def chemins_generations(self):
+        """Retourne les chemins des générations de la base.
+
+        La génération la plus récente (la base elle-même) est la
+        première.
+
+        """
+        chemin = self.chemin_base
+        return [chemin] + [chemin + "." + str(i) for i in range(1,
+                self.generations)]
+
+    @property
+    def chemin_schema(self):
+        return os.path.join(self.repertoire, "enregistrements.schema")
+
+    def chemin_segment(self, numero):
+        """Retourne le chemin du segment indiqué."""
+        return os.path.join(self.repertoire,
+                "enregistrements.{}.journal".format(numero))
+
+    @property
+    def segments(self):
+        """Retourne les numéros des segments présents, triés."""
+        numeros = []
+        for nom in os.listdir(self.repertoire):
+            if nom.startswith("enregistrements.") and \
+                    nom.endswith(".journal"):
+                numero = nom[16:-8]
+                if numero.isdigit():
+                    numeros.append(int(numero))
+
+        return sorted(numeros)
+
+    def doit_compacter(self):
+        """Retourne True si le journal doit être compacté."""
+        return self.compaction_requise or \
+                self.taille_journal > self.ratio * self.taille_base
+
+    def emballer(self, file):
+        """Sérialise les objets de la file et ceux qu'ils font découvrir.
+
+        On retourne la liste des enregistrements, sous la forme
+        de bytes.
+
+        """
+        enregistrements = [pickle.dumps((ident, racine, references,
+                donnees), pickle.HIGHEST_PROTOCOL) for ident, nom, racine,
+                references, donnees in self.serialiser(file)]
+        self.ecrire_schema()
+        return enregistrements
+
+    def preparer(self):
+        """Sérialise les objets modifiés depuis la dernière écriture.
+
+        Les enregistrements retournés doivent être ajoutés au segment
+        courant (voir ajouter).
+
+        """
+        if self.compaction_requise:
+            raise RuntimeError("le journal doit être compacté")
+
+        enregistrements = self.emballer(self.a_ecrire())
+        self.taille_journal += sum(TRAME.size + len(e) for e in \
+                enregistrements)
+        return enregistrements
+
+    def ecrire_schema(self):
+        """Écrit les tables de l'encodeur si elles ont changé.
+
+        Les tables ne faisant que grandir, elles peuvent être écrites
+        avant les enregistrements qui les utilisent : la dernière
+        version permet de relire tous les enregistrements.
+
+        """
+        if not self.encodeur.modifie:
+            return
+
+        temporaire = self.chemin_schema + ".tmp"
+        with open(temporaire, "wb") as fichier:
+            fichier.write(encadrer(self.encodeur.schema()))
+            fichier.flush()
+            os.fsync(fichier.fileno())
+
+        os.replace(temporaire, self.chemin_schema)
+        synchroniser_repertoire(self.repertoire)
+        self.encodeur.modifie = False
+
+    def lire_schema(self):
+        """Lit les tables de l'encodeur, si elles existent."""
+        if not os.path.exists(self.chemin_schema):
+            return
+
+        with open(self.chemin_schema, "rb") as fichier:
+            contenu = fichier.read()
+
+        if len(contenu) >= TRAME.size:
+            longueur, somme = TRAME.unpack_from(contenu)
+            donnees = contenu[TRAME.size:TRAME.size + longueur]
+            if len(donnees) == longueur and zlib.crc32(donnees) == somme:
+                self.encodeur.restaurer_schema(donnees)
+                return
+
+        self.logger.warning("Le fichier {} est corrompu".format(
+                self.chemin_schema))
+
+    def ajouter(self, numero, enregistrements):
+        """Ajoute les enregistrements à la fin du segment indiqué.
+
+        Cette méthode ne manipule que les fichiers : elle peut être
+        appelée depuis un autre thread. Si l'écriture échoue, le
+        segment est ramené à sa taille précédente : un enregistrement
+        incomplet empêcherait de lire les suivants. L'exception est
+        ensuite propagée (voir signaler_echec).
+
+        """
+        if not enregistrements:
+            return
+
+        chemin = self.chemin_segment(numero)
+        nouveau = not os.path.exists(chemin)
+        with open(chemin, "ab", buffering=0) as fichier:
+            taille = os.fstat(fichier.fileno()).st_size
+            try:
+                ecrire_tout(fichier, b"".join(encadrer(e) for e in \
+                        enregistrements))
+                os.fsync(fichier.fileno())
+            except OSError:
+                try:
+                    os.ftruncate(fichier.fileno(), taille)
+                except OSError:
+                    pass
+                raise
+
+        if nouveau:
+            synchroniser_repertoire(self.repertoire)
+
+    def signaler_echec(self):
+        """Signale que des enregistrements préparés n'ont pas été écrits.
+
+        Les objets qu'ils contiennent ne sont plus marqués comme
+        modifiés : le journal doit être compacté à partir des objets en
+        mémoire avant toute nouvelle écriture. On passe également au
+        segment suivant, le segment courant pouvant se terminer par un
+        enregistrement incomplet.
+
+        """
+        self.rotation()
+        self.compaction_requise = True
+
+    def ecrire(self):
+        """Écrit les objets modifiés dans le segment courant.
+
+        On retourne le nombre d'objets écrits.
+
+        """
+        enregistrements = self.preparer()
+        try:
+            self.ajouter(self.segment, enregistrements)
+        except OSError:
+            self.signaler_echec()
+            raise
+
+        return len(enregistrements)
+
+    def rotation(self):
+        """Passe au segment suivant et retourne le numéro du précédent."""
+        numero = self.segment
+        self.segment += 1
+        self.taille_journal = 0
+        self.references_recentes = set()
+        return numero
+
+    def ecrire_base(self, dernier, enregistrements):
+        """Écrit une nouvelle génération de la base.
+
+        La base est écrite dans un fichier temporaire, synchronisé
+        puis renommé. Les générations précédentes sont décalées et
+        les segments dont aucune génération n'a plus besoin sont
+        supprimés.
+
+        """
+        chemins = self.chemins_generations
+        temporaire = chemins[0] + ".tmp"
+        with open(temporaire, "wb") as fichier:
+            fichier.write(creer_entete(dernier))
+            for enregistrement in enregistrements:
+                fichier.write(encadrer(enregistrement))
+
+            fichier.flush()
+            os.fsync(fichier.fileno())
+            taille = fichier.tell()
+
+        for i in range(len(chemins) - 1, 0, -1):
+            if os.path.exists(chemins[i - 1]):
+                os.replace(chemins[i - 1], chemins[i])
+
+        os.replace(temporaire, chemins[0])
+        synchroniser_repertoire(self.repertoire)
+        self.taille_base = taille
+
+        # Les segments sont conservés pour les générations précédentes
+        conserves = min(self.lire_dernier(chemin) or 0 for chemin in \
+                chemins if os.path.exists(chemin))
+        for numero in self.segments:
+            if numero <= conserves:
+                os.remove(self.chemin_segment(numero))
+
+    def compacter(self, objets):
+        """Réécrit la base à partir des objets indiqués.
+
+        Les objets sont habituellement tous les objets enregistrés.
+        Tous les objets qu'ils référencent sont également écrits. Les
+        segments antérieurs sont ensuite supprimés. On retourne le
+        nombre d'objets écrits.
+
+        """
+        dernier = max([self.segment] + self.segments)
+        self.par_ident = {}
+        self.sales.clear()
+        del self.nouveaux[:]
+        enregistrements = self.emballer(deque(objets))
+        self.ecrire_base(dernier, enregistrements)
+        self.segment = dernier + 1
+        self.taille_journal = 0
+        self.references_recentes = set()
+        self.compaction_requise = False
+        return len(enregistrements)
+
+    def fusionner(self, dernier):
+        """Compacte la base et les segments jusqu'au numéro indiqué.
+
+        Seuls les fichiers sont lus : cette méthode peut être appelée
+        depuis un autre thread, après une rotation. On retourne le
+        nombre d'objets conservés et l'ensemble des identifiants
+        supprimés (voir appliquer).
+
+        """
+        enregistrements = {}
+        base = self.lire_base(enregistrements)
+        for numero in self.segments:
+            if base < numero <= dernier:
+                self.lire(self.chemin_segment(numero), enregistrements)
+
+        # On parcourt les objets accessibles depuis les racines
+        conserves = set()
+        file = [i for i, e in enregistrements.items() if e[1]]
+        while file:
+            ident = file.pop()
+            if ident in conserves or ident not in enregistrements:
+                continue
+
+            conserves.add(ident)
+            file.extend(enregistrements[ident][2])
+
+        self.ecrire_base(dernier, [pickle.dumps(enregistrements[i],
+                pickle.HIGHEST_PROTOCOL) for i in sorted(conserves)])
+        return len(conserves), set(enregistrements) - conserves
+
+    def appliquer(self, supprimes):
+        """Oublie les identifiants supprimés par une fusion.
+
+        Si un objet supprimé a été référencé depuis la rotation, il
+        est marqué comme modifié pour être réécrit.
+
+        """
+        for ident in supprimes:
+            objet = self.par_ident.get(ident)
+            if objet is None:
+                continue
+
+            if ident in self.references_recentes:
+                self.marquer(objet)
+            else:
+                del self.par_ident[ident]
+
+    def lire(self, chemin, enregistrements, base=False):
+        """Lit les enregistrements du fichier.
+
+        Les enregistrements sont placés dans le dictionnaire
+        {identifiant: enregistrement}. La lecture s'arrête au premier
+        enregistrement incomplet ou corrompu (interrompu par un arrêt
+        brutal, par exemple). Si le fichier est une base, on lit
+        d'abord son en-tête.
+
+        On retourne un tuple (dernier, complet) : dernier est le
+        dernier segment contenu dans la base (None si ce n'est pas une
+        base ou si l'en-tête est invalide), complet est True si tout
+        le fichier a pu être lu.
+
+        """
+        dernier = None
+        with projeter(chemin) as vue:
+            position = 0
+            if base:
+                dernier = lire_entete(vue)
+                if dernier is None:
+                    return None, False
+
+                position = ENTETE.size
+
+            fin = len(vue)
+            while position < fin:
+                debut = position + TRAME.size
+                if debut > fin:
+                    break
+
+                longueur, somme = TRAME.unpack_from(vue, position)
+                position = debut + longueur
+                if position > fin:
+                    break
+
+                with vue[debut:position] as donnees:
+                    if zlib.crc32(donnees) != somme:
+                        break
+
+                    enregistrement = pickle.loads(donnees)
+
+                enregistrements[enregistrement[0]] = enregistrement
+            else:
+                return dernier, True
+
+        self.logger.warning("Lecture de {} interrompue à l'octet {}".format(
+                chemin, position))
+        return dernier, False
+
+    def lire_dernier(self, chemin):
+        """Retourne le dernier segment contenu dans la base indiquée."""
+        with open(chemin, "rb") as fichier:
+            return lire_entete(fichier.read(ENTETE.size))
+
+    def lire_base(self, enregistrements):
+        """Lit la génération la plus récente et intègre de la base.
+
+        On retourne le numéro du dernier segment qu'elle contient.
+
+        """
+        for chemin in self.chemins_generations:
+            if not os.path.exists(chemin):
+                continue
+
+            lus = {}
+            dernier, complet = self.lire(chemin, lus, base=True)
+            if complet:
+                enregistrements.update(lus)
+                self.taille_base = os.path.getsize(chemin)
+                return dernier
+
+            self.logger.warning("La base {} est corrompue, on essaye " \
+                    "la génération précédente".format(chemin))
+
+        return 0
+
+    def charger(self):
+        """Charge la base et les segments.
+
+        On retourne le nombre d'objets chargés.
+
+        """
+        enregistrements = {}
+        chemin = self.chemin_base
+        if os.path.exists(chemin) and not est_base(chemin):
+            # Ancienne sauvegarde : les objets sont déjà chargés
+            with open(chemin, "rb") as fichier:
+                objets = pickle.load(fichier)
+
+            self.logger.info("Ancien format d'enregistrement, " \
+                    "le journal sera compacté")
+            self.compaction_requise = True
+            return len(objets)
+
+        self.lire_schema()
+        dernier = self.lire_base(enregistrements)
+        segments = [n for n in self.segments if n > dernier]
+        for numero in segments:
+            chemin = self.chemin_segment(numero)
+            self.lire(chemin, enregistrements)
+            self.taille_journal += os.path.getsize(chemin)
+
+        # Les prochaines écritures se font dans un nouveau segment
+        self.segment = max([dernier] + self.segments) + 1
+
+        return self.restaurer((ident, donnees) for ident, racine,
+                references, donnees in enregistrements.values())
+
+
+def encadrer(donnees):
+    """Retourne l'enregistrement précédé de sa longueur et de son CRC."""
+    return TRAME.pack(len(donnees), zlib.crc32(donnees)) + donnees
+
+def ecrire_tout(fichier, donnees):
+    """Écrit toutes les données dans le fichier (non tamponné)."""
+    vue = memoryview(donnees)
+    while vue:
+        vue = vue[fichier.write(vue):]
+
+def creer_entete(dernier):
+    """Retourne l'en-tête d'une base."""
+    debut = ENTETE.pack(SIGNATURE, FORMAT, dernier, 0)[:-4]
+    return debut + struct.pack("<I", zlib.crc32(debut))
+
+def lire_entete(donnees):
+    """Retourne le dernier segment indiqué par l'en-tête.
+
+    Si l'en-tête est invalide, retourne None.
+
+    """
+    if len(donnees) < ENTETE.size:
+        return None
+
+    signature, version, dernier, somme = ENTETE.unpack_from(donnees)
+    if signature != SIGNATURE or zlib.crc32(
+            donnees[:ENTETE.size - 4]) != somme:
+        return None
+
+    return dernier
+
+def est_base(chemin):
+    """Retourne True si le fichier commence par la signature d'une base."""
+    with open(chemin, "rb") as fichier:
+        return fichier.read(len(SIGNATURE)) == SIGNATURE
+
+@contextmanager
+def projeter(chemin):
+    """Projette le fichier en mémoire et retourne une vue sur son contenu."""
+    with open(chemin, "rb") as fichier:
+        if os.fstat(fichier.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+
+        with mmap.mmap(fichier.fileno(), 0,
+                access=mmap.ACCESS_READ) as projection:
+            with memoryview(projection) as vue:
+                yield vue
+
+def synchroniser_repertoire(repertoire):
+    """Synchronise le répertoire sur le disque (après un renommage)."""
+    try:
+        descripteur = os.open(repertoire, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(descripteur)
+    except OSError:
+        pass
+    finally:
+        os.close(descripteur)
@@ -0,0 +1,102 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier contient la classe LotMongo, détaillée plus bas."""
+
+from pymongo import DeleteOne, ReplaceOne
+
+class LotMongo:
+
+    """Lot d'écritures à envoyer à MongoDB.
+
+    Les opérations sont regroupées par collection : chaque collection
+    reçoit une seule requête (bulk_write) par paquet de 'taille'
+    opérations. Un document est remplacé (ou inséré s'il n'existe
+    pas encore) d'après son '_id', qui doit donc être attribué avant
+    l'envoi. Un document remplacé puis supprimé dans le même lot est
+    seulement supprimé.
+
+    La base peut être n'importe quel objet retournant une collection
+    par son nom (db[nom]), du moment que la collection possède une
+    méthode bulk_write.
+
+    """
+
+    def __init__(self, db, taille=1000):
+        self.db = db
+        self.taille = taille
+        self.operations = {}
+
+    def __len__(self):
+        return sum(len(o) for o in self.operations.values())
+
+    def remplacer(self, nom, document):
+        """Remplace (ou insère) le document dans la collection."""
+        collection = self.operations.get(nom)
+        if collection is None:
+            collection = self.operations[nom] = {}
+
+        collection[document["_id"]] = document
+
+    def supprimer(self, nom, _id):
+        """Supprime le document de la collection."""
+        collection = self.operations.get(nom)
+        if collection is None:
+            collection = self.operations[nom] = {}
+
+        collection[_id] = None
+
+    def envoyer(self):
+        """Envoie les opérations et vide le lot.
+
+        On retourne le nombre d'opérations envoyées.
+
+        """
+        nb = 0
+        operations = self.operations
+        self.operations = {}
+        for nom, documents in operations.items():
+            requetes = []
+            for _id, document in documents.items():
+                if document is None:
+                    requetes.append(DeleteOne({"_id": _id}))
+                else:
+                    requetes.append(ReplaceOne({"_id": _id}, document,
+                            upsert=True))
+
+            collection = self.db[nom]
+            for i in range(0, len(requetes), self.taille):
+                collection.bulk_write(requetes[i:i + self.taille],
+                        ordered=False)
+
+            nb += len(requetes)
+
+        return nb
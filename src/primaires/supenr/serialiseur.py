@@ -0,0 +1,277 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier contient la classe Serialiseur, détaillée plus bas."""
+
+from collections import deque
+import io
+import pickle
+
+import abstraits.obase
+from abstraits.obase import BaseObj, TYPES_VALEURS, classes_base
+from primaires.supenr.encodeur import Encodeur, SIGNATURE
+
+class PicklerObjets(pickle.Pickler):
+
+    """Pickler remplaçant les objets de base par leur identifiant.
+
+    Chaque objet de base (BaseObj) référencé est remplacé par un
+    tuple (identifiant, nom de classe, arguments de __new__). Les
+    objets rencontrés pour la première fois sont ajoutés à la file
+    des objets à sérialiser. Les identifiants référencés sont conservés
+    dans 'references'.
+
+    """
+
+    def __init__(self, fichier, serialiseur, file):
+        pickle.Pickler.__init__(self, fichier, pickle.HIGHEST_PROTOCOL)
+        self.serialiseur = serialiseur
+        self.file = file
+        self.references = set()
+
+    def persistent_id(self, objet):
+        if type(objet) in TYPES_VALEURS or not isinstance(objet, BaseObj):
+            return None
+
+        ident, nouveau = self.serialiseur.identifier(objet)
+        if nouveau:
+            self.file.append(objet)
+
+        self.references.add(ident)
+        return (ident, nom_classe(type(objet)), objet.__getnewargs__())
+
+
+class UnpicklerObjets(pickle.Unpickler):
+
+    """Unpickler retrouvant les objets de base par leur identifiant."""
+
+    def __init__(self, fichier, serialiseur):
+        pickle.Unpickler.__init__(self, fichier)
+        self.serialiseur = serialiseur
+
+    def persistent_load(self, pid):
+        return self.serialiseur.coquille(*pid)
+
+
+class Serialiseur:
+
+    """Sérialisation individuelle des objets de base.
+
+    Chaque objet est sérialisé séparément et identifié par un entier
+    stable (l'attribut '_id_journal'). Les objets de base qu'il
+    référence ne sont représentés que par leur identifiant : un objet
+    référencé pour la première fois est sérialisé dans la même passe.
+
+    Les objets modifiés sont notifiés par BaseObj.__setattr__ (voir
+    Module.ajouter_objet) et ceux nouvellement enregistrés par
+    BaseObj.ajouter_enr (voir activer). Seuls ces objets sont
+    sérialisés à l'enregistrement suivant (voir a_ecrire).
+
+    Si 'compact' est à True, l'état des objets est encodé par
+    l'Encodeur (plus compact que pickle). Les données des deux formats
+    peuvent être relues quelle que soit l'option : les tables de
+    l'encodeur doivent cependant être enregistrées par la classe-fille.
+
+    Cette classe est la classe-mère des moyens de stockage
+    incrémentaux (voir Journal et StockageSQLite).
+
+    """
+
+    def __init__(self, logger, compact=True):
+        self.logger = logger
+        self.compact = compact
+        self.encodeur = Encodeur(self)
+        self.par_ident = {}
+        self.prochain = 1
+        self.sales = {}
+        self.nouveaux = []
+        self.coquilles = {}
+        self.references_recentes = set()
+
+    def activer(self):
+        """Active le suivi des objets nouvellement enregistrés."""
+        self.nouveaux = []
+        abstraits.obase.nouveaux = self.nouveaux
+
+    def marquer(self, objet):
+        """Marque l'objet comme modifié."""
+        self.sales[id(objet)] = objet
+
+    def identifier(self, objet):
+        """Retourne l'identifiant de l'objet.
+
+        On retourne un tuple (identifiant, nouveau), nouveau étant
+        True si l'objet n'était pas encore connu. Un objet copié
+        (portant l'identifiant d'un autre) reçoit un nouvel
+        identifiant.
+
+        """
+        ident = objet.__dict__.get("_id_journal")
+        if ident is not None:
+            connu = self.par_ident.get(ident)
+            if connu is objet:
+                return ident, False
+            elif connu is None:
+                self.par_ident[ident] = objet
+                return ident, True
+
+        ident = self.prochain
+        self.prochain += 1
+        objet.__dict__["_id_journal"] = ident
+        self.par_ident[ident] = objet
+        return ident, True
+
+    def a_ecrire(self):
+        """Retourne la file des objets modifiés ou nouveaux.
+
+        Les objets modifiés qui n'ont encore jamais été sérialisés
+        sont ignorés : ils le seront quand un objet les référençant le
+        sera.
+
+        """
+        file = deque()
+        for objet in self.sales.values():
+            if objet.__dict__.get("_id_journal") in self.par_ident:
+                file.append(objet)
+
+        for objet in self.nouveaux:
+            if objet.e_existe:
+                self.identifier(objet)
+                file.append(objet)
+
+        self.sales.clear()
+        del self.nouveaux[:]
+        return file
+
+    def serialiser(self, file):
+        """Sérialise les objets de la file et ceux qu'ils font découvrir.
+
+        On retourne une liste de tuples (identifiant, nom de classe,
+        racine, références, données) : racine est True si l'objet est
+        enregistré et existe, références est le tuple des identifiants
+        qu'il référence et données est l'objet sérialisé (bytes).
+
+        """
+        enregistrements = []
+        ecrits = set()
+        while file:
+            objet = file.popleft()
+            ident, nouveau = self.identifier(objet)
+            if ident in ecrits:
+                continue
+
+            ecrits.add(ident)
+            nom = nom_classe(type(objet))
+            if self.compact:
+                donnees, references = self.encodeur.encoder(nom,
+                        objet.__getnewargs__(), objet.__getstate__(), file)
+            else:
+                donnees, references = self.pickler((nom,
+                        objet.__getnewargs__(), objet.__getstate__()), file)
+
+            racine = bool(type(objet).enregistrer and objet.e_existe)
+            enregistrements.append((ident, nom, racine,
+                    tuple(references), donnees))
+            self.references_recentes.update(references)
+
+        return enregistrements
+
+    def pickler(self, valeur, file):
+        """Sérialise la valeur par pickle.
+
+        Les objets de base référencés pour la première fois sont ajoutés
+        à la file. On retourne un tuple (données, identifiants
+        référencés).
+
+        """
+        donnees = io.BytesIO()
+        pickler = PicklerObjets(donnees, self, file)
+        pickler.dump(valeur)
+        return donnees.getvalue(), pickler.references
+
+    def unpickler(self, donnees):
+        """Retourne la valeur sérialisée par pickler."""
+        return UnpicklerObjets(io.BytesIO(donnees), self).load()
+
+    def coquille(self, ident, nom, arguments):
+        """Retourne l'objet correspondant à l'identifiant.
+
+        Si l'objet n'a pas encore été rencontré au chargement, il est
+        créé sans être initialisé (son état sera restauré à la fin
+        du chargement).
+
+        """
+        objet = self.coquilles.get(ident)
+        if objet is None:
+            classe = classes_base[nom]
+            objet = classe.__new__(classe, *arguments)
+            objet.__dict__["_id_journal"] = ident
+            self.coquilles[ident] = objet
+
+        return objet
+
+    def restaurer(self, donnees):
+        """Restaure les objets sérialisés.
+
+        On attend une liste de tuples (identifiant, données). Les
+        objets sont tous créés avant que leur état ne soit restauré.
+        On retourne le nombre d'objets restaurés.
+
+        """
+        self.coquilles = {}
+        etats = []
+        for ident, octets in donnees:
+            if octets[:1] == SIGNATURE:
+                nom, arguments, etat = self.encodeur.decoder(octets)
+            else:
+                nom, arguments, etat = self.unpickler(octets)
+
+            etats.append((self.coquille(ident, nom, arguments), etat))
+
+        for objet, etat in etats:
+            objet.__setstate__(etat)
+
+        incomplets = len(self.coquilles) - len(etats)
+        if incomplets:
+            self.logger.warning("{} objets référencés n'ont pas été " \
+                    "trouvés".format(incomplets))
+
+        self.par_ident = self.coquilles
+        self.coquilles = {}
+        if self.par_ident:
+            self.prochain = max(self.par_ident) + 1
+
+        return len(etats)
+
+
+def nom_classe(classe):
+    """Retourne le nom de la classe, tel qu'enregistré."""
+    return classe.__module__ + "." + classe.__name__
@@ -0,0 +1,341 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Ce fichier contient la classe StockageSQLite, détaillée plus bas."""
+
+from collections import deque
+from contextlib import contextmanager
+import os
+import sqlite3
+
+from primaires.supenr.serialiseur import Serialiseur
+
+class StockageSQLite(Serialiseur):
+
+    """Enregistrement incrémental des objets dans une base SQLite.
+
+    Chaque classe d'objet (entrée de classes_base) possède sa table,
+    contenant une ligne par objet :
+        ident -- l'identifiant de l'objet (clé primaire)
+        racine -- 1 si l'objet est enregistré et existe, 0 sinon
+        refs -- les identifiants référencés, séparés par des virgules
+        donnees -- l'objet sérialisé (voir Serialiseur)
+
+    Les tables de l'encodeur (voir Encodeur) sont conservées dans la
+    table 'schema', mise à jour dans la même transaction que les
+    objets qui les utilisent. La table 'objets' associe chaque
+    identifiant au nom de sa classe (indexé) : elle permet de retrouver
+    un objet par son identifiant ou tous les objets d'une classe sans
+    parcourir la base entière.
+
+    La base est ouverte en mode WAL (write-ahead logging) : une
+    écriture n'ajoute que les pages modifiées au fichier
+    'enregistrements.db-wal' et ne bloque pas les lectures. Chaque
+    écriture (voir ecrire) se fait dans une seule transaction : en cas
+    d'arrêt brutal, la base reste dans l'état de la dernière écriture
+    complète.
+
+    Les lignes des objets devenus inaccessibles restent dans la base
+    jusqu'au prochain nettoyage (voir nettoyer). Quand le nombre de
+    lignes écrites depuis le dernier nettoyage dépasse 'ratio' fois
+    le nombre d'objets connus, la base doit être nettoyée (voir
+    doit_nettoyer).
+
+    """
+
+    def __init__(self, chemin, logger, ratio=1):
+        Serialiseur.__init__(self, logger)
+        self.chemin = chemin
+        self.connexion = None
+        self.tables = set()
+        self.ratio = ratio
+        self.ecrits = 0
+
+    def __repr__(self):
+        return "<StockageSQLite {} ({} objets)>".format(repr(self.chemin),
+                len(self.par_ident))
+
+    @property
+    def taille(self):
+        """Retourne la taille de la base (fichier WAL compris)."""
+        taille = 0
+        for chemin in (self.chemin, self.chemin + "-wal"):
+            try:
+                taille += os.path.getsize(chemin)
+            except OSError:
+                pass
+
+        return taille
+
+    def ouvrir(self):
+        """Ouvre la base, en la créant si besoin."""
+        if self.connexion is not None:
+            return
+
+        self.connexion = sqlite3.connect(self.chemin,
+                isolation_level=None, check_same_thread=False)
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+        self.connexion.execute("CREATE TABLE IF NOT EXISTS objets (" \
+                "ident INTEGER PRIMARY KEY, classe TEXT NOT NULL)")
+        self.connexion.execute("CREATE INDEX IF NOT EXISTS " \
+                "objets_classe ON objets (classe)")
+        self.connexion.execute("CREATE TABLE IF NOT EXISTS schema (" \
+                "ident INTEGER PRIMARY KEY, donnees BLOB NOT NULL)")
+        self.tables = set(ligne[0] for ligne in self.connexion.execute(
+                "SELECT name FROM sqlite_master WHERE type='table'"))
+
+    def fermer(self):
+        """Ferme la base."""
+        if self.connexion is not None:
+            self.connexion.close()
+            self.connexion = None
+
+    def creer_table(self, nom):
+        """Crée la table de la classe si elle n'existe pas."""
+        if nom not in self.tables:
+            self.connexion.execute("CREATE TABLE IF NOT EXISTS {} (" \
+                    "ident INTEGER PRIMARY KEY, racine INTEGER NOT NULL, " \
+                    "refs TEXT NOT NULL, donnees BLOB NOT NULL)".format(
+                    table(nom)))
+            self.tables.add(nom)
+
+    def ecrire(self, file=None):
+        """Écrit les objets modifiés depuis la dernière écriture.
+
+        Si file est précisé, ce sont ses objets (et ceux qu'ils font
+        découvrir) qui sont écrits. Les lignes sont regroupées par
+        classe et insérées dans une seule transaction. On retourne le
+        nombre d'objets écrits.
+
+        Si la transaction échoue (base verrouillée, disque plein), elle
+        est annulée et les objets sérialisés sont de nouveau marqués
+        comme modifiés : ils seront écrits à la prochaine écriture.
+        L'exception est ensuite propagée.
+
+        """
+        if file is None:
+            file = self.a_ecrire()
+
+        par_classe = {}
+        for ident, nom, racine, references, donnees in \
+                self.serialiser(file):
+            par_classe.setdefault(nom, []).append((ident, int(racine),
+                    ",".join(str(r) for r in references), donnees))
+
+        if not par_classe:
+            return 0
+
+        nb = 0
+        tables = None
+        try:
+            self.ouvrir()
+            tables = set(self.tables)
+            with self.transaction():
+                if self.encodeur.modifie:
+                    self.connexion.execute("INSERT OR REPLACE INTO " \
+                            "schema VALUES (1, ?)", (self.encodeur.schema(), ))
+
+                for nom, lignes in par_classe.items():
+                    self.creer_table(nom)
+                    self.connexion.executemany("INSERT OR REPLACE INTO " \
+                            "{} VALUES (?, ?, ?, ?)".format(table(nom)),
+                            lignes)
+                    self.connexion.executemany("INSERT OR REPLACE INTO " \
+                            "objets VALUES (?, ?)", [(ligne[0], nom) for \
+                            ligne in lignes])
+                    nb += len(lignes)
+        except sqlite3.Error:
+            # Les tables créées pendant la transaction ont été annulées
+            if tables is not None:
+                self.tables = tables
+
+            for lignes in par_classe.values():
+                for ligne in lignes:
+                    self.marquer(self.par_ident[ligne[0]])
+
+            raise
+
+        self.encodeur.modifie = False
+        self.ecrits += nb
+        return nb
+
+    @contextmanager
+    def transaction(self):
+        """Ouvre une transaction, validée ou annulée à la sortie.
+
+        La connexion étant en mode autocommit (isolation_level=None),
+        la transaction est ouverte explicitement.
+
+        """
+        self.connexion.execute("BEGIN")
+        try:
+            yield self.connexion
+        except BaseException:
+            self.connexion.execute("ROLLBACK")
+            raise
+        else:
+            self.connexion.execute("COMMIT")
+
+    def lire_classe(self, nom):
+        """Retourne les lignes (ident, donnees) de la classe nom."""
+        self.ouvrir()
+        if nom not in self.tables:
+            return []
+
+        return self.connexion.execute("SELECT ident, donnees FROM " \
+                "{}".format(table(nom))).fetchall()
+
+    def lire_objet(self, ident):
+        """Retourne la ligne (classe, donnees) de l'objet ou None."""
+        self.ouvrir()
+        ligne = self.connexion.execute("SELECT classe FROM objets " \
+                "WHERE ident=?", (ident, )).fetchone()
+        if ligne is None:
+            return None
+
+        nom = ligne[0]
+        ligne = self.connexion.execute("SELECT donnees FROM {} " \
+                "WHERE ident=?".format(table(nom)), (ident, )).fetchone()
+        if ligne is None:
+            return None
+
+        return nom, ligne[0]
+
+    def classes(self):
+        """Retourne les noms des classes enregistrées."""
+        self.ouvrir()
+        return [ligne[0] for ligne in self.connexion.execute(
+                "SELECT DISTINCT classe FROM objets")]
+
+    def charger(self):
+        """Charge tous les objets de la base.
+
+        On retourne le nombre d'objets chargés.
+
+        """
+        if not os.path.exists(self.chemin):
+            return 0
+
+        self.ouvrir()
+        ligne = self.connexion.execute("SELECT donnees FROM schema " \
+                "WHERE ident=1").fetchone()
+        if ligne is not None:
+            self.encodeur.restaurer_schema(ligne[0])
+
+        donnees = []
+        for nom in self.classes():
+            donnees.extend(self.lire_classe(nom))
+
+        return self.restaurer(donnees)
+
+    def doit_nettoyer(self):
+        """Retourne True si la base doit être nettoyée."""
+        return self.ecrits > self.ratio * len(self.par_ident)
+
+    def nettoyer(self, racines=()):
+        """Supprime les objets qui ne sont plus accessibles.
+
+        Les objets accessibles sont ceux atteignables, en suivant les
+        références, depuis les racines (les objets enregistrés et
+        existants, ainsi que les identifiants précisés dans 'racines').
+        Les objets modifiés doivent avoir été écrits auparavant : un
+        objet de nouveau référencé par un objet pas encore écrit serait
+        supprimé. On retourne le nombre d'objets supprimés.
+
+        """
+        self.ouvrir()
+        references = {}
+        racines = deque(racines)
+        for nom in self.classes():
+            if nom not in self.tables:
+                continue
+
+            for ident, racine, refs in self.connexion.execute(
+                    "SELECT ident, racine, refs FROM {}".format(
+                    table(nom))):
+                references[ident] = (nom, refs)
+                if racine:
+                    racines.append(ident)
+
+        accessibles = set()
+        while racines:
+            ident = racines.popleft()
+            if ident in accessibles or ident not in references:
+                continue
+
+            accessibles.add(ident)
+            refs = references[ident][1]
+            if refs:
+                racines.extend(int(r) for r in refs.split(","))
+
+        supprimes = {}
+        for ident, (nom, refs) in references.items():
+            if ident not in accessibles:
+                supprimes.setdefault(nom, []).append((ident, ))
+
+        self.ecrits = 0
+        if not supprimes:
+            return 0
+
+        nb = 0
+        with self.transaction():
+            for nom, idents in supprimes.items():
+                self.connexion.executemany("DELETE FROM {} WHERE " \
+                        "ident=?".format(table(nom)), idents)
+                self.connexion.executemany("DELETE FROM objets WHERE " \
+                        "ident=?", idents)
+                nb += len(idents)
+                for ident, in idents:
+                    self.par_ident.pop(ident, None)
+
+        return nb
+
+    def compacter(self, objets):
+        """Réécrit entièrement la base à partir des objets précisés.
+
+        Tous les objets atteignables depuis 'objets' sont écrits,
+        puis les objets inaccessibles sont supprimés. On retourne
+        le nombre d'objets écrits.
+
+        """
+        self.sales.clear()
+        del self.nouveaux[:]
+        self.par_ident = {}
+        nb = self.ecrire(deque(objets))
+        self.nettoyer([self.identifier(objet)[0] for objet in objets])
+        self.connexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return nb
+
+
+def table(nom):
+    """Retourne le nom de la table (échappé) de la classe."""
+    return '"' + nom.replace('"', '""') + '"'
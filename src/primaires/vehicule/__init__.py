@@ -74,3 +74,10 @@ class Module(BaseModule):
             for coords in masque:
                 self.map[coords] = vehicule
         self.temps_precedant = time.time()
+    
+    def delai_boucle(self):
+        """Les véhicules avancent au moins tous les dixièmes de seconde."""
+        if self.vehicules:
+            return 0.1
+        
+        return None
@@ -0,0 +1,249 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Ce fichier définit la classe BoucleAsynchrone, détaillée plus bas.
+
+Elle permet de remplacer la boucle synchro (voir kassie.py) par une
+boucle d'évènements asyncio :
+
+>>> serveur = ConnexionServeur(4000)
+>>> serveur.init()
+>>> BoucleAsynchrone(serveur, importeur).lancer()
+
+"""
+
+import asyncio
+import selectors
+import time
+
+class SelecteurAsynchrone:
+
+    """Sélecteur relié à une boucle d'évènements asyncio.
+
+    Cette classe reprend l'interface utilisée par le serveur et les
+    clients connectés (register, unregister, modify, get_map) mais
+    inscrit les sockets auprès de la boucle asyncio. Le serveur et ses
+    fonctions de callback restent ainsi inchangés.
+
+    """
+
+    def __init__(self, asynchrone):
+        """Constructeur du sélecteur."""
+        self.asynchrone = asynchrone
+        self.boucle = asynchrone.boucle
+        self.cles = {} # {fileno: SelectorKey}
+
+    @staticmethod
+    def get_fileno(fichier):
+        """Retourne le fileno du fichier ou socket."""
+        if isinstance(fichier, int):
+            return fichier
+
+        return fichier.fileno()
+
+    def get_map(self):
+        """Retourne le dictionnaire {fileno: clé}."""
+        return self.cles
+
+    def register(self, fichier, evenements, donnees=None):
+        """Inscrit le fichier ou socket."""
+        fileno = self.get_fileno(fichier)
+        if fileno in self.cles:
+            raise KeyError("{} est déjà inscrit".format(fileno))
+
+        self.cles[fileno] = selectors.SelectorKey(fichier, fileno,
+                evenements, donnees)
+        self._surveiller(fileno, evenements, donnees)
+
+    def unregister(self, fichier):
+        """Désinscrit le fichier ou socket."""
+        fileno = self.get_fileno(fichier)
+        del self.cles[fileno]
+        self.boucle.remove_reader(fileno)
+        self.boucle.remove_writer(fileno)
+
+    def modify(self, fichier, evenements, donnees=None):
+        """Modifie les évènements surveillés."""
+        fileno = self.get_fileno(fichier)
+        cle = self.cles[fileno]
+        self.cles[fileno] = cle._replace(events=evenements, data=donnees)
+        if not evenements & selectors.EVENT_WRITE:
+            self.boucle.remove_writer(fileno)
+        self._surveiller(fileno, evenements, donnees)
+
+    def close(self):
+        """Désinscrit tous les fichiers."""
+        for fileno in list(self.cles.keys()):
+            self.unregister(fileno)
+
+    def _surveiller(self, fileno, evenements, donnees):
+        """Relie le fileno à la boucle asyncio."""
+        asynchrone = self.asynchrone
+        if evenements & selectors.EVENT_READ:
+            if donnees is None:
+                self.boucle.add_reader(fileno, asynchrone.accepter)
+            else:
+                self.boucle.add_reader(fileno, asynchrone.receptionner,
+                        donnees)
+
+        if evenements & selectors.EVENT_WRITE:
+            self.boucle.add_writer(fileno, asynchrone.ecrire, donnees)
+
+
+class BoucleAsynchrone:
+
+    """Boucle synchro basée sur asyncio.
+
+    Plutôt que de tourner en permanence, la boucle asyncio est réveillée
+    quand un client se connecte, quand un message est reçu, quand un
+    client saturé peut de nouveau recevoir des données, ou quand une
+    action différée doit être exécutée.
+
+    Un tour de boucle synchro (méthode 'tour') appelle la méthode boucle
+    des modules qui la redéfinissent. Le tour suivant est programmé
+    (grâce à 'call_at') en fonction du délai retourné par
+    Importeur.delai_boucle : il est avancé si un évènement réseau demande
+    un travail plus tôt.
+
+    Les fonctions de callback du serveur (connexion, déconnexion,
+    réception) sont appelées comme dans la boucle synchro habituelle.
+
+    """
+
+    def __init__(self, serveur, importeur, console=None):
+        """Constructeur de la boucle."""
+        self.serveur = serveur
+        self.importeur = importeur
+        self.console = console
+        self.boucle = None
+        self.programme = None # le prochain tour programmé
+        self.fin_travail = None # fin du dernier travail effectué
+
+    def lancer(self):
+        """Lance la boucle jusqu'à l'arrêt du serveur."""
+        if not self.serveur.lance:
+            return
+
+        self.boucle = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.boucle)
+        serveur = self.serveur
+        if serveur.socket:
+            if serveur.selecteur:
+                serveur.selecteur.close()
+
+            serveur.socket.setblocking(False)
+            serveur.selecteur = SelecteurAsynchrone(self)
+            serveur.selecteur.register(serveur.socket, selectors.EVENT_READ)
+            for client in serveur.clients.values():
+                serveur.selecteur.register(client.fileno,
+                        selectors.EVENT_READ, client)
+                client.selecteur = serveur.selecteur
+
+        self.programme = self.boucle.call_soon(self.tour)
+        try:
+            self.boucle.run_forever()
+        finally:
+            self.boucle.close()
+            asyncio.set_event_loop(None)
+
+    def debut_travail(self):
+        """Compte le temps d'attente écoulé depuis le dernier travail.
+
+        Ce temps n'est pas pris en compte dans le Watch Dog (voir le
+        module secondaire stat).
+
+        """
+        if self.fin_travail is not None:
+            self.serveur.tps_attente += time.time() - self.fin_travail
+
+    def fin_de_travail(self):
+        """Programme le prochain tour de boucle."""
+        self.fin_travail = time.time()
+        self.programmer()
+
+    def programmer(self):
+        """Programme le prochain tour, si il doit être avancé."""
+        if not self.serveur.lance:
+            self.boucle.stop()
+            return
+
+        delai = self.importeur.delai_boucle(self.serveur.attente_maximum)
+        moment = self.boucle.time() + delai
+        if self.programme is not None:
+            if not self.programme.cancelled() and \
+                    self.programme.when() <= moment:
+                return
+
+            self.programme.cancel()
+
+        self.programme = self.boucle.call_at(moment, self.tour)
+
+    def tour(self):
+        """Un tour de boucle synchro."""
+        self.debut_travail()
+        self.programme = None
+        try:
+            if self.console:
+                self.console.console.runcodes()
+
+            self.importeur.boucle()
+            self.serveur.verifier_deconnexions()
+        finally:
+            self.fin_de_travail()
+
+    def accepter(self):
+        """Accepte les clients en attente de connexion."""
+        self.debut_travail()
+        try:
+            self.serveur.verifier_deconnexions()
+            while self.serveur.accepter():
+                pass
+        finally:
+            self.fin_de_travail()
+
+    def receptionner(self, client):
+        """Réceptionne les messages d'un client."""
+        self.debut_travail()
+        try:
+            if client.connecte:
+                self.serveur.receptionner(client)
+
+            self.serveur.verifier_deconnexions()
+        finally:
+            self.fin_de_travail()
+
+    def ecrire(self, client):
+        """Vide le tampon de sortie d'un client prêt en écriture."""
+        self.debut_travail()
+        try:
+            if client.connecte:
+                client.ecrire()
+        finally:
+            self.fin_de_travail()
@@ -32,12 +32,25 @@
 
 try:
     import socket
-    import telnetlib
-    DO, DONT, WILL, WONT = telnetlib.DO[0], telnetlib.DONT[0], \
-            telnetlib.WILL[0], telnetlib.WONT[0]
 except ImportError:
     socket = None
 
+try:
+    import selectors
+except ImportError:
+    selectors = None
+
+from reseau.connexions.decodeur_telnet import DecodeurTelnet
+
+# Politiques en cas de débordement du tampon de sortie
+IGNORER = "ignorer" # le message qui déborde est ignoré
+TRONQUER = "tronquer" # on garde la partie du message qui tient
+DECONNECTER = "deconnecter" # le client est déconnecté
+POLITIQUES = (IGNORER, TRONQUER, DECONNECTER)
+
+# Taille par défaut du tampon de sortie (en octets)
+TAILLE_TAMPON = 256 * 1024
+
 ENCODAGES = [
     'utf-8',
     'iso-8859-15',
@@ -56,13 +69,21 @@ class ClientConnecte:
     Cette classe est appelée pour héberger un client connecté, c'est-à-dire
     dont la demande de connexion a été validée par le serveur.
 
+    Le socket est non bloquant : ce qui ne peut être envoyé immédiatement
+    est placé dans un tampon de sortie, vidé quand le socket est de
+    nouveau prêt en écriture (voir la méthode 'ecrire'). Ce tampon a une
+    taille limitée : un client qui ne lit pas ce qu'on lui envoie ne peut
+    pas bloquer le serveur. Quand le tampon déborde, on applique la
+    politique précisée ('ignorer', 'tronquer' ou 'deconnecter').
+
     On définit pour chaque connexion instanciée un numéro d'identification
     nommé 'id'. L'id courant sera contenu comme variable statique de cette classe.
 
     """
 
     id_courant = 0
-    def __init__(self, socket_connecte, infos):
+    def __init__(self, socket_connecte, infos, taille_tampon=TAILLE_TAMPON,
+            debordement=DECONNECTER):
         """Constructeur standard.
 
         On donne à la connexion créée un ID qui lui sera propre.
@@ -71,16 +92,35 @@ class ClientConnecte:
         - les infos de connexion, un tuple contenant :
             - l'adresse IP du client
             - le port sortant du client
+        - la taille maximum du tampon de sortie (en octets)
+        - la politique à appliquer en cas de débordement du tampon
 
         """
+        if debordement not in POLITIQUES:
+            raise ValueError("politique de débordement inconnue : " \
+                    "{}".format(repr(debordement)))
+
         self.n_id = ClientConnecte.id_courant
         ClientConnecte.id_courant += 1
 
         # Notre socket connecté
         self.socket = socket_connecte
+        # On garde le fileno : il n'est plus accessible une fois le
+        # socket fermé
+        self.fileno = socket_connecte.fileno()
         # Configuration du socket
         # On traite les messages MSG_OOB comme des messages standards
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_OOBINLINE, True)
+        self.socket.setblocking(False)
+
+        # Tampon de sortie
+        self.tampon = bytearray()
+        self.taille_tampon = taille_tampon
+        self.debordement = debordement
+        self.nb_octets_perdus = 0
+
+        # Sélecteur dans lequel le socket est inscrit (voir ConnexionServeur)
+        self.selecteur = None
 
         # Informations de connexion
         self.adresse_ip = infos[0]
@@ -89,10 +129,11 @@ class ClientConnecte:
         # Statut de connexion
         self.connecte = True
 
-        # Message en cours (il contient la chaîne que le client
+        # Décodeur des messages reçus (il contient la chaîne que le client
         # est en train d'écrire, dans le cas d'un client qui envoie
-        # au fur et à mesure les caractères entrés)
-        self.message = b""
+        # au fur et à mesure les caractères entrés, ainsi que les lignes
+        # complètes pas encore traitées)
+        self.decodeur = DecodeurTelnet()
 
         # Information d'encodage
         self._encodage = ""
@@ -116,6 +157,11 @@ class ClientConnecte:
             self._encodage = encodage
     encodage = property(_get_encodage, _set_encodage)
 
+    @property
+    def message(self):
+        """Retourne le message en cours (ligne incomplète)."""
+        return bytes(self.decodeur.ligne)
+
     def est_connecte(self):
         """Retourne True si connecté, False sinon.
 
@@ -124,60 +170,6 @@ class ClientConnecte:
         """
         return self.socket and self.socket.fileno() > 0
 
-    def nettoyer(self, message):
-        """Cette méthode se charge de nettoyer le message passé en paramètre.
-
-        Elle retourne le message nettoyé.
-
-        Les nettoyages effectués sont :
-        -   compatibilité telnet Windows : on retire les caractères
-            d'effacement et les caractères derrière ce signe
-        -   compatibilité tintin++ : on supprime les caractères préfixant
-            un accent, sans accent derrière
-
-        """
-        # Compatibilité telnet
-        car_eff = b"\x08"
-        while message.count(car_eff) > 0:
-            pos = message.find(car_eff)
-            if pos > 0:
-                message = message[:pos-1] + message[pos+1:]
-            else:
-                message = message[pos+1:]
-
-        # Compatibilité Tintin++
-        car_eff = 195
-        n_message = b""
-        for i, car in enumerate(message):
-            if not (car == car_eff and i+1<len(message) and \
-                    bytes([message[i+1]]).isalpha()):
-                n_message += bytes([car])
-
-        message = n_message
-        return message
-
-    def interpreter_options(self, message):
-        """Interprète les options du protocole Telnet.
-
-        Retourne le message nettoyé des options.
-
-        Cette fonction est récursive tant que le message n'est pas nettoyé
-        d'options.
-
-        """
-        index = message.find(telnetlib.IAC)
-        if index < 0:
-            return message
-        else:
-            sub = message[index + 1:index + 3]
-            if sub and sub[0] in (DO, DONT, WILL, WONT):
-                fin = index + 3
-            else:
-                fin = index + 2
-
-            message = message[:index] + message[fin:]
-            return self.interpreter_options(message)
-
     def decoder(self, message, decodage=0, encodages=[]):
         """Test de décodage.
 
@@ -205,16 +197,102 @@ class ClientConnecte:
         except UnicodeError:
             return self.decoder(message, decodage + 1, encodages)
 
+    @property
+    def sature(self):
+        """Retourne True si des données attendent d'être envoyées.
+
+        Tant que le client est saturé, il est préférable de garder les
+        messages de côté pour les lui envoyer en une seule fois.
+
+        """
+        return bool(self.tampon)
+
     def envoyer(self, message):
         """Envoi d'un message au socket.
 
         Le message est déjà encodé. Ce n'est plus un type str.
 
+        Si le tampon de sortie est vide, on essaye d'envoyer directement
+        le message. Ce qui n'a pas pu être envoyé est placé dans le
+        tampon de sortie.
+
         """
+        if not self.connecte:
+            return
+
+        if self.tampon:
+            self.mettre_en_tampon(message)
+            return
+
+        try:
+            envoye = self.socket.send(message)
+        except (BlockingIOError, InterruptedError):
+            envoye = 0
+        except socket.error:
+            self.deconnecter("perte de la connexion")
+            return
+
+        if envoye < len(message):
+            self.mettre_en_tampon(memoryview(message)[envoye:])
+
+    def mettre_en_tampon(self, message):
+        """Ajoute le message au tampon de sortie.
+
+        Si le tampon déborde, on applique la politique de débordement.
+
+        """
+        place = self.taille_tampon - len(self.tampon)
+        if len(message) > place:
+            if self.debordement == DECONNECTER:
+                self.deconnecter("tampon de sortie saturé")
+                return
+            elif self.debordement == TRONQUER:
+                self.nb_octets_perdus += len(message) - max(place, 0)
+                message = message[:max(place, 0)]
+            else:
+                self.nb_octets_perdus += len(message)
+                return
+
+        if message:
+            vide = not self.tampon
+            self.tampon += message
+            if vide:
+                self.surveiller_ecriture(True)
+
+    def ecrire(self):
+        """Envoie ce qui peut l'être du tampon de sortie.
+
+        Cette méthode est appelée quand le socket est prêt en écriture.
+
+        """
+        if not self.tampon:
+            return
+
         try:
-            self.socket.send(message)
+            envoye = self.socket.send(self.tampon)
+        except (BlockingIOError, InterruptedError):
+            return
         except socket.error:
             self.deconnecter("perte de la connexion")
+            return
+
+        del self.tampon[:envoye]
+        if not self.tampon:
+            self.surveiller_ecriture(False)
+
+    def surveiller_ecriture(self, surveiller):
+        """Demande (ou non) au sélecteur de surveiller l'écriture."""
+        if self.selecteur is None or not self.connecte:
+            return
+
+        evenements = selectors.EVENT_READ
+        if surveiller:
+            evenements |= selectors.EVENT_WRITE
+
+        try:
+            self.selecteur.modify(self.fileno, evenements, self)
+        except (KeyError, ValueError, OSError):
+            pass
 
     def recevoir(self):
         """Cette méthode se charge de réceptionner le message en attente.
@@ -225,44 +303,33 @@ class ClientConnecte:
         """
         try:
             message = self.socket.recv(1024)
+        except (BlockingIOError, InterruptedError):
+            return
         except socket.error:
             self.deconnecter("perte de la connexion")
             return
         if message == b"":
             self.deconnecter("perte de la connexion")
         else:
-            self.message += message
+            self.decodeur.recevoir(message)
 
     def message_est_complet(self):
-        """Retourne True si le message se termine par un caractère de fin de
-        ligne, False sinon.
+        """Retourne True si au moins un message complet (terminé par un
+        caractère de fin de ligne) a été reçu, False sinon.
 
         """
-        fin_lignes = [b"\r", b"\n"]
-        est_complet = False
-        for code in fin_lignes:
-            if not est_complet:
-                est_complet = self.message.endswith(code)
-        return est_complet
+        return bool(self.decodeur)
 
     def get_message(self):
         """Cette méthode retourne le message complet.
 
-        Elle met à jour self.message en supprimant le message retourné.
+        Le message retourné est retiré du décodeur, déjà nettoyé des
+        options Telnet et caractères d'effacement (voir DecodeurTelnet).
         Si plusieurs messages complets sont contenus, on ne retourne que le
         premier.
 
         """
-        message = self.message
-        message = message.replace(b"\r", b"\n")
-        while message.count(b"\n\n")>0:
-            message = message.replace(b"\n\n", b"\n")
-        messages = message.split(b"\n")
-        self.message = b"\n".join(messages[1:])
-        message = messages[0] # on retourne le premier message
-        message = self.nettoyer(message)
-        message = self.interpreter_options(message)
-        return message
+        return self.decodeur.extraire()
 
     def get_message_decode(self):
         """Cette méthode travaille avec get_message et retourne le message
@@ -274,11 +341,20 @@ class ClientConnecte:
     def deconnecter(self, message):
         """Méthode appelée pour déconnecter un client.
 
+        - on tente d'envoyer ce qui reste dans le tampon de sortie
         - on ferme la connexion du socket
         - on met à jour le booléen self.connecte
         - on stocke le message retourné dans self.retour
 
         """
+        if self.tampon and self.connecte:
+            try:
+                self.socket.send(self.tampon)
+            except socket.error:
+                pass
+
+            self.tampon.clear()
+
         self.socket.close()
         self.connecte = False
         self.retour = message
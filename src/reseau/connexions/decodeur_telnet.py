@@ -0,0 +1,138 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Ce fichier définit la classe DecodeurTelnet, détaillée plus bas."""
+
+from collections import deque
+import re
+
+# Octets interprétés par le décodeur
+IAC = 255
+DONT = 254
+DO = 253
+WONT = 252
+WILL = 251
+EFFACEMENT = 8
+
+# États du décodeur
+NORMAL = 0 # on lit le message
+COMMANDE = 1 # on a lu IAC, on attend la commande
+OPTION = 2 # on a lu IAC DO/DONT/WILL/WONT, on attend l'option
+
+# Expressions régulières
+RE_SPECIAUX = re.compile(rb"[\r\n\x08\xff]")
+RE_TINTIN = re.compile(rb"\xc3(?=[A-Za-z])")
+
+class DecodeurTelnet:
+
+    """Décodeur des messages Telnet envoyés par un client.
+
+    Les données reçues sont traitées au fur et à mesure de leur
+    réception (méthode 'recevoir'), en une seule passe :
+    -   les options du protocole Telnet (IAC ...) sont retirées
+    -   les caractères d'effacement (compatibilité telnet Windows)
+        retirent le caractère qui les précède
+    -   les lignes complètes (terminées par \\r ou \\n) sont placées dans
+        une file d'attente, les fins de ligne consécutives d'une même
+        réception ne comptant que pour une.
+
+    Les lignes complètes sont retirées de la file grâce à la méthode
+    'extraire', qui supprime également les caractères préfixant un accent
+    sans accent derrière (compatibilité Tintin++).
+
+    """
+
+    def __init__(self):
+        """Constructeur du décodeur."""
+        self.ligne = bytearray() # la ligne en cours
+        self.lignes = deque() # les lignes complètes
+        self.etat = NORMAL
+
+    def __bool__(self):
+        """Retourne True si au moins une ligne complète est en attente."""
+        return bool(self.lignes)
+
+    def recevoir(self, donnees):
+        """Décode les données reçues.
+
+        Les caractères ordinaires sont copiés par blocs dans la ligne en
+        cours : seuls les octets spéciaux (fins de ligne, effacement et
+        IAC) sont traités un par un.
+
+        """
+        ligne = self.ligne
+        fin_ligne = False
+        taille = len(donnees)
+        i = 0
+        while i < taille:
+            if self.etat == COMMANDE:
+                commande = donnees[i]
+                i += 1
+                if commande in (DO, DONT, WILL, WONT):
+                    self.etat = OPTION
+                else:
+                    self.etat = NORMAL
+                continue
+            elif self.etat == OPTION:
+                i += 1
+                self.etat = NORMAL
+                continue
+
+            special = RE_SPECIAUX.search(donnees, i)
+            if special is None:
+                ligne += donnees[i:]
+                break
+
+            position = special.start()
+            if position > i:
+                ligne += donnees[i:position]
+                fin_ligne = False
+
+            octet = donnees[position]
+            i = position + 1
+            if octet == IAC:
+                self.etat = COMMANDE
+                fin_ligne = False
+            elif octet == EFFACEMENT:
+                if ligne:
+                    del ligne[-1]
+                fin_ligne = False
+            elif not fin_ligne:
+                self.lignes.append(bytes(ligne))
+                ligne.clear()
+                fin_ligne = True
+
+    def extraire(self):
+        """Retourne la première ligne complète, nettoyée.
+
+        Si aucune ligne n'est complète, lève IndexError.
+
+        """
+        return RE_TINTIN.sub(b"", self.lignes.popleft())
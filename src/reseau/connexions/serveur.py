@@ -35,8 +35,13 @@ Pour créer un serveur opérationnel, quelques instructions suffisent :
 >>> serveur = ConnexionServeur(4000) # test sur le port 4000
 >>> serveur.init() # initialisation, indispensable
 >>> while True: # le serveur ne s'arrête pas naturellement
-...     serveur.verifier_connexions()
-...     serveur.verifier_receptions()
+...     serveur.verifier_evenements()
+
+Si le module selectors est disponible, 'verifier_evenements' attend en
+une seule fois les nouvelles connexions et les messages des clients,
+grâce à un sélecteur (epoll sous Linux) dans lequel les sockets sont
+inscrits une fois pour toutes. Sinon, on se rabat sur les méthodes
+'verifier_connexions' et 'verifier_receptions', basées sur select.select.
 
 Note importante: une fonction de Callback est utilisée pour définir
 des instructions à effectuer dans les cas suivants :
@@ -58,9 +63,15 @@ try:
 except ImportError:
     print("Le réseau n'a pas pu démarrer.")
     socket = select = None
+
+try:
+    import selectors
+except ImportError:
+    selectors = None
 import time
 
-from reseau.connexions.client_connecte import ClientConnecte
+from reseau.connexions.client_connecte import ClientConnecte, \
+        TAILLE_TAMPON, DECONNECTER
 from bases.fonction import *
 
 class ConnexionServeur:
@@ -81,7 +92,9 @@ class ConnexionServeur:
     """
 
     def __init__(self, port, nb_clients_attente=5, nb_max_connectes=-1, \
-            attente_connexion=0.05, attente_reception=0.05):
+            attente_connexion=0.05, attente_reception=0.05,
+            attente_maximum=1, avec_selecteur=True,
+            taille_tampon=TAILLE_TAMPON, debordement=DECONNECTER):
         """Crée un socket en écoute sur le port spécifié.
         - port : le port sur lequel on écoute (>1024)
         - nb_clients_attente : le nombre maximum de clients en attente de
@@ -102,6 +115,15 @@ class ConnexionServeur:
           de surveiller les sockets connectés. Ce temps est précisé en secondes
           (0.05 s = 50 ms)
           Si on souhaite un Time Out infini mettre cette variable à None.
+        - attente_maximum : temps d'attente maximum des évènements quand
+          on utilise le sélecteur (voir 'verifier_evenements'). Ce temps
+          est précisé en secondes
+        - avec_selecteur : doit-on utiliser un sélecteur (module selectors)
+          plutôt que select.select, si possible
+        - taille_tampon : la taille maximum du tampon de sortie de chaque
+          client, en octets (voir ClientConnecte)
+        - debordement : la politique à appliquer quand le tampon de sortie
+          d'un client déborde ('ignorer', 'tronquer' ou 'deconnecter')
 
         Petite précision sur l'utilité de select.select :
             On utilise cette fonction pour surveiller un certain nombre
@@ -123,6 +145,10 @@ class ConnexionServeur:
         self.nb_max_connectes = nb_max_connectes
         self.attente_connexion = attente_connexion
         self.attente_reception = attente_reception
+        self.attente_maximum = attente_maximum
+        self.avec_selecteur = avec_selecteur
+        self.taille_tampon = taille_tampon
+        self.debordement = debordement
 
         self.clients = {} # un dictionnaire {id_client:client}
 
@@ -132,6 +158,12 @@ class ConnexionServeur:
         # Socket serveur
         self.socket  = None
 
+        # Sélecteur (None si on utilise select.select)
+        self.selecteur = None
+
+        # Temps total passé à attendre des évènements dans le sélecteur
+        self.tps_attente = 0
+
         # Fonctions de callback
         self.callbacks = {
             # déclencheur : (fonction, parametres)
@@ -169,6 +201,12 @@ class ConnexionServeur:
             # On met en écoute le socket serveur
             self.socket.listen(self.nb_clients_attente)
 
+            # Inscription du socket serveur dans le sélecteur
+            if self.avec_selecteur and selectors:
+                self.socket.setblocking(False)
+                self.selecteur = selectors.DefaultSelector()
+                self.selecteur.register(self.socket, selectors.EVENT_READ)
+
     def get_client_depuis_socket(self, socket):
         """Cette méthode retourne le client connecté, en fonction du
         socket passé en paramètre. On se base sur le fileno() du socket
@@ -201,12 +239,27 @@ class ConnexionServeur:
         On retourne le client créé et ajouté.
 
         """
-        client = ClientConnecte(socket, infos)
+        client = ClientConnecte(socket, infos, self.taille_tampon,
+                self.debordement)
         # On ajoute le client au dictionnaire des clients (id-client)
         self.clients[client.n_id] = client
 
         # On renseigne le dictionnaire {socket.fileno():id_client}
-        self.filenos[socket.fileno()] = client.n_id
+        self.filenos[client.fileno] = client.n_id
+
+        # On inscrit le socket dans le sélecteur
+        # On passe par le fileno : le socket sera peut-être déjà fermé
+        # quand on voudra le désinscrire
+        if self.selecteur:
+            try:
+                self.selecteur.register(client.fileno,
+                        selectors.EVENT_READ, client)
+            except KeyError:
+                self.selecteur.unregister(client.fileno)
+                self.selecteur.register(client.fileno,
+                        selectors.EVENT_READ, client)
+
+            client.selecteur = self.selecteur
 
         # On appelle la fonction de callback "connexion"
         self.callbacks["connexion"].executer(client)
@@ -230,8 +283,14 @@ class ConnexionServeur:
             del self.clients[client.n_id]
 
         # On supprime le socket des filenos enregistrés
-        if client.socket.fileno() in self.filenos.keys():
-            del self.filenos[client.socket.fileno()]
+        if self.filenos.get(client.fileno) == client.n_id:
+            del self.filenos[client.fileno]
+
+        # On désinscrit le socket du sélecteur
+        if self.selecteur:
+            cle = self.selecteur.get_map().get(client.fileno)
+            if cle is not None and cle.data is client:
+                self.selecteur.unregister(client.fileno)
 
     def verifier_deconnexions(self):
         """Cette méthode doit être appelée régulièrement pour retirer
@@ -263,6 +322,7 @@ class ConnexionServeur:
         # Si aucune connexion ne se présente, au bout du temps indiqué
         # dans self.attente_connexion, select.select s'arrête
         # en levant une exception select.error
+        connexions = []
         try:
             connexions, none, none = select.select(
                 [self.socket], [], [], self.attente_connexion)
@@ -273,22 +333,40 @@ class ConnexionServeur:
         # En toute logique, elle ne possède qu'un client puisque select.select
         # s'interrompt dès qu'elle reçoit une demande de connexion
         for connexion in connexions:
-            # On tente d'accepter la connexion
+            self.accepter()
+
+    def accepter(self):
+        """Accepte un client en attente de connexion.
+
+        On vérifie qu'on peut ajouter un nouveau client. Dans le cas
+        contraire, on envoie au client un message par défaut et on le
+        déconnecte du serveur.
+
+        Retourne True si un client a été accepté (ou refusé), False si
+        aucune connexion n'a pu être acceptée.
+
+        """
+        # On tente d'accepter la connexion
+        try:
+            connecte, infos = self.socket.accept()
+        except socket.error:
+            return False
+
+        # On vérifie qu'on peut ajouter un nouveau client
+        if self.nb_max_connectes >= 0 \
+                and len(self.clients) >= self.nb_max_connectes:
+            # On refuse la connexion
             try:
-                socket, infos = connexion.accept()
+                connecte.send("Ce serveur ne peut accueillir de " \
+                        "connexions supplementaires.".encode())
             except socket.error:
                 pass
-            else:
-                # On vérifie qu'on peut ajouter un nouveau client
-                if self.nb_max_connectes >= 0 \
-                        and len(self.clients) >= self.nb_max_connectes:
-                    # On refuse la connexion
-                    socket.send("Ce serveur ne peut accueillir de connexions " \
-                        "supplementaires.".encode())
-                    socket.close()
-                else:
-                    # On crée notre client
-                    client = self.ajouter_client(socket, infos)
+            connecte.close()
+        else:
+            # On crée notre client
+            self.ajouter_client(connecte, infos)
+
+        return True
 
     def verifier_receptions(self):
         """Cette méthode vérifie si des clients ont envoyé des messages
@@ -304,12 +382,24 @@ class ConnexionServeur:
         # dans self.attente_reception, select.select s'arrête
         # en levant une exception select.error
         receptions = []
+        ecritures = []
+        a_ecrire = [c.socket for c in self.clients.values() if c.tampon]
         try:
-            receptions, none, none = select.select(
-                self.get_clients_sockets(), [], [], self.attente_reception)
+            receptions, ecritures, none = select.select(
+                self.get_clients_sockets(), a_ecrire, [],
+                self.attente_reception)
         except select.error:
             self.test_select()
 
+        # On vide le tampon de sortie des clients prêts en écriture
+        for socket in ecritures:
+            try:
+                client = self.get_client_depuis_socket(socket)
+            except KeyError:
+                continue
+
+            client.ecrire()
+
         # On parcourt la boucle des clients possédant un message à réceptionner
         for socket in receptions:
             # On récupère le client correspondant
@@ -318,21 +408,85 @@ class ConnexionServeur:
             except KeyError:
                 continue
 
-            client.recevoir()
-            # On part du principe que le message est récupéré au fur et à
-            # mesure dans les fonctions de callback. Sans quoi, cette
-            # instruction provoque une boucle infinie
-            while client.message_est_complet():
-                # On récupère le message décodé
-                msg = client.get_message_decode()
-
-                # On appelle la fonction de callback "reception"
-                self.callbacks["reception"].executer(client, msg)
+            self.receptionner(client)
 
         # On vérifie une dernière fois que tous les clients sont bien
         # connectés
         self.verifier_deconnexions()
 
+    def receptionner(self, client):
+        """Réceptionne les messages en attente du client.
+
+        Pour chaque message complet, on appelle la fonction de
+        callback "reception".
+
+        """
+        client.recevoir()
+        # On part du principe que le message est récupéré au fur et à
+        # mesure dans les fonctions de callback. Sans quoi, cette
+        # instruction provoque une boucle infinie
+        while client.message_est_complet():
+            # On récupère le message décodé
+            msg = client.get_message_decode()
+
+            # On appelle la fonction de callback "reception"
+            self.callbacks["reception"].executer(client, msg)
+
+    def verifier_evenements(self, delai=None):
+        """Attend et traite les évènements réseau.
+
+        Cette méthode remplace les appels successifs à
+        'verifier_connexions' et 'verifier_receptions' : les sockets sont
+        inscrits dans le sélecteur une fois pour toutes et on attend en
+        une seule fois les connexions, les messages des clients et la
+        disponibilité en écriture des clients dont le tampon de sortie
+        n'est pas vide.
+
+        Le délai est le temps d'attente maximum (en secondes). Il est
+        habituellement déduit de la prochaine action à exécuter (voir
+        Importeur.delai_boucle). Si il n'est pas précisé, on utilise
+        'attente_maximum'.
+
+        Si le sélecteur n'est pas disponible, on se rabat sur
+        'verifier_connexions' et 'verifier_receptions'.
+
+        """
+        if self.selecteur is None:
+            self.verifier_connexions()
+            self.verifier_receptions()
+            return
+
+        if delai is None or delai > self.attente_maximum:
+            delai = self.attente_maximum
+
+        self.verifier_deconnexions()
+        debut = time.time()
+        try:
+            evenements = self.selecteur.select(delai)
+        except OSError:
+            evenements = []
+            self.test_select()
+        self.tps_attente += time.time() - debut
+
+        connexion = False
+        for cle, masque in evenements:
+            client = cle.data
+            if client is None:
+                connexion = True
+                continue
+
+            if masque & selectors.EVENT_WRITE and client.connecte:
+                client.ecrire()
+            if masque & selectors.EVENT_READ and client.connecte:
+                self.receptionner(client)
+
+        # On retire les clients déconnectés avant d'en accepter de
+        # nouveaux, qui pourraient réutiliser leur fileno
+        self.verifier_deconnexions()
+        if connexion:
+            while self.accepter():
+                pass
+
     def test_select(self):
         """Test grâce à select que tous les clients sont bien en écoute.
 
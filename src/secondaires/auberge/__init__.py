@@ -99,6 +99,8 @@ class Module(BaseModule):
 
     def preparer(self):
         """Préparation du module."""
+        importeur.diffact.ajouter_periodique("auberges", 3600,
+                self.verifier_auberges)
         self.verifier_auberges()
 
     @property
@@ -116,8 +118,6 @@ class Module(BaseModule):
 
     def verifier_auberges(self):
         """Vérification cyclique des auberges et expirations."""
-        importeur.diffact.ajouter_action("auberges", 3600,
-                self.verifier_auberges)
         for auberge in self.auberges.values():
             auberge.verifier_chambres()
 
@@ -301,13 +301,13 @@ class Module(BaseModule):
             __import__(nom_fichier)
 
         # Ajout des actions différées
-        self.importeur.diffact.ajouter_action("dep_navire", TPS_VIRT,
+        self.importeur.diffact.ajouter_periodique("dep_navire", TPS_VIRT,
                 self.avancer_navires)
-        self.importeur.diffact.ajouter_action("vir_navire", 3,
+        self.importeur.diffact.ajouter_periodique("vir_navire", 3,
                 self.virer_navires)
-        self.importeur.diffact.ajouter_action("nauffrages", 5,
+        self.importeur.diffact.ajouter_periodique("nauffrages", 5,
                 self.nauffrages)
-        self.importeur.diffact.ajouter_action("tick_chantiers", 60,
+        self.importeur.diffact.ajouter_periodique("tick_chantiers", 60,
                 self.tick_chantiers)
 
         # Ajout des bateaux au module salle
@@ -470,14 +470,18 @@ class Module(BaseModule):
         self.navires[cle] = navire
 
         # Créé les actions différées
-        self.importeur.diffact.ajouter_action("tick_equipages_{}".format(cle),
-                1, self.tick_equipages, navire)
-        self.importeur.diffact.ajouter_action("tick_vigies_{}".format(cle),
-                randint(0, 20), self.tick_vigies, navire)
-        self.importeur.diffact.ajouter_action("controle_equipages_{}".format(
-                cle), randint(0, 5), self.controle_equipages, navire)
-        self.importeur.diffact.ajouter_action("objectif_equipages_{}".format(
-                cle), randint(0, 15), self.objectif_equipages, navire)
+        self.importeur.diffact.ajouter_periodique(
+                "tick_equipages_{}".format(cle), 1, self.tick_equipages,
+                navire)
+        self.importeur.diffact.ajouter_periodique(
+                "tick_vigies_{}".format(cle), 5, self.tick_vigies, navire,
+                delai=randint(0, 20))
+        self.importeur.diffact.ajouter_periodique(
+                "controle_equipages_{}".format(cle), 3,
+                self.controle_equipages, navire, delai=randint(0, 5))
+        self.importeur.diffact.ajouter_periodique(
+                "objectif_equipages_{}".format(cle), 5,
+                self.objectif_equipages, navire, delai=randint(0, 15))
 
     def supprimer_navire(self, cle):
         """Supprime le navire dont la clé est passée en paramètre."""
@@ -487,14 +491,14 @@ class Module(BaseModule):
         navire = self.navires[cle]
 
         # Destruction des action différées
-        self.importeur.diffact.retirer_action("tick_equipages_{}".format(cle),
-                False)
-        self.importeur.diffact.retirer_action("tick_vigies_{}".format(cle),
-                False)
-        self.importeur.diffact.retirer_action("controle_equipages_{}".format(
-                cle), False)
-        self.importeur.diffact.retirer_action("objectif_equipages_{}".format(
-                cle), False)
+        self.importeur.diffact.retirer_periodique(
+                "tick_equipages_{}".format(cle), False)
+        self.importeur.diffact.retirer_periodique(
+                "tick_vigies_{}".format(cle), False)
+        self.importeur.diffact.retirer_periodique(
+                "controle_equipages_{}".format(cle), False)
+        self.importeur.diffact.retirer_periodique(
+                "objectif_equipages_{}".format(cle), False)
 
         navire.detruire()
         del self.navires[cle]
@@ -659,16 +663,12 @@ class Module(BaseModule):
 
     def avancer_navires(self):
         """Fait avancer les navires."""
-        self.importeur.diffact.ajouter_action("dep_navire", TPS_VIRT,
-                self.avancer_navires)
         for navire in list(self.navires.values()):
             if navire.etendue:
                 navire.avancer(DIST_AVA)
 
     def virer_navires(self):
         """Fait virer les navires."""
-        self.importeur.diffact.ajouter_action("vir_navire", 3,
-                self.virer_navires)
         for navire in self.navires.values():
             if not navire.immobilise:
                 orientation = navire.orientation
@@ -677,8 +677,6 @@ class Module(BaseModule):
 
     def nauffrages(self):
         """Gère les naufrages."""
-        self.importeur.diffact.ajouter_action("nauffrages", 5,
-                self.nauffrages)
         for navire in list(self.navires.values()):
             for salle in navire.salles.values():
                 if salle.noyable and salle.voie_eau == COQUE_OUVERTE:
@@ -693,17 +691,11 @@ class Module(BaseModule):
 
     def tick_chantiers(self):
         """Tick des chantiers navals."""
-        self.importeur.diffact.ajouter_action("tick_chantiers", 60,
-                self.tick_chantiers)
         for chantier in self.chantiers.values():
             chantier.executer_commandes()
 
     def tick_equipages(self, navire):
         """Tick des équipages."""
-        cle = navire.cle
-        self.importeur.diffact.ajouter_action("tick_equipages_{}".format(cle),
-                1, self.tick_equipages, navire)
-
         if not navire.equipage.matelots:
             return
 
@@ -711,10 +703,6 @@ class Module(BaseModule):
 
     def tick_vigies(self, navire):
         """Tick les vigies."""
-        cle = navire.cle
-        self.importeur.diffact.ajouter_action("tick_vigies_{}".format(
-                cle), 5, self.tick_vigies, navire)
-
         if not navire.equipage.matelots:
             return
 
@@ -723,10 +711,6 @@ class Module(BaseModule):
 
     def controle_equipages(self, navire):
         """Contrôle des équipages."""
-        cle = navire.cle
-        self.importeur.diffact.ajouter_action("controle_equipages_{}".format(
-                cle), 3, self.controle_equipages, navire)
-
         if not navire.equipage.matelots:
             return
 
@@ -738,10 +722,6 @@ class Module(BaseModule):
 
     def objectif_equipages(self, navire):
         """Travail sur les objectifs des équipages."""
-        cle = navire.cle
-        self.importeur.diffact.ajouter_action("objectif_equipages_{}".format(
-                cle), 5, self.objectif_equipages, navire)
-
         if not navire.equipage.matelots:
             return
 
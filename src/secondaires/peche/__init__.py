@@ -73,7 +73,7 @@ class Module(BaseModule):
         for banc in bancs:
             self.bancs[banc.cle] = banc
 
-        importeur.diffact.ajouter_action("bancs", 60,
+        importeur.diffact.ajouter_periodique("bancs", 60,
                 self.tick_bancs)
 
         BaseModule.init(self)
@@ -124,8 +124,6 @@ class Module(BaseModule):
 
     def tick_bancs(self):
         """Tick les bancs."""
-        importeur.diffact.ajouter_action("bancs", 60,
-                self.tick_bancs)
         for banc in self.bancs.values():
             banc.tick()
 
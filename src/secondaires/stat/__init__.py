@@ -109,9 +109,16 @@ class Module(BaseModule):
         BaseModule.detruire(self)
 
     def boucle(self):
-        """Fonction appelée à chaque boucle synchro"""
+        """Fonction appelée à chaque boucle synchro.
+
+        Le temps passé par le serveur à attendre des évènements (voir
+        ConnexionServeur.verifier_evenements) n'est pas compté dans le
+        Watch Dog.
+
+        """
         if self.stats:
-            self.stats.surveiller_watch_dog(time.time())
+            serveur = type(self.importeur).serveur
+            self.stats.surveiller_watch_dog(time.time() - serveur.tps_attente)
 
     def cb_reception(self, serveur, importeur, logger, client, msg):
         """Callback appelée quand on réceptionne un message"""
@@ -0,0 +1,77 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest de abstraits.obase.migration."""
+
+import unittest
+
+from abstraits.obase import BaseObj, objets_base, plans_migration
+from abstraits.obase.migration import PlanMigration
+from bases.collections.liste import Liste
+
+class Objet(BaseObj):
+
+    """Objet de base simplifié."""
+
+    def __init__(self):
+        BaseObj.__init__(self)
+        self.noms = []
+
+    def __getnewargs__(self):
+        return ()
+
+class TestPlanMigration(unittest.TestCase):
+
+    """Unittest des plans de mise à jour."""
+
+    def test_plan(self):
+        """Vérifie que le plan contient les classes suivies."""
+        plan = PlanMigration(Objet, objets_base)
+        self.assertEqual(plan.versions, {"base_obj": BaseObj._version})
+        self.assertEqual([classe for classe, methodes in plan.etapes],
+                [BaseObj])
+
+    def test_mise_a_jour(self):
+        """Vérifie la mise à jour d'un objet ancien."""
+        objet = Objet()
+        objet._dict_version = {}
+        objet.noms = Liste(["a"])
+        objet._update(Objet)
+        self.assertEqual(objet.noms, ["a"])
+        self.assertEqual(objet.version_actuelle(BaseObj), BaseObj._version)
+        self.assertIsInstance(plans_migration[Objet], PlanMigration)
+
+    def test_objet_a_jour(self):
+        """Vérifie qu'un objet à jour n'est pas modifié."""
+        objet = Objet()
+        objet.noms = Liste(["a"])
+        objet._update(Objet)
+        self.assertIsInstance(objet.noms, Liste)
@@ -0,0 +1,93 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Fichier définissant les unittest de abstraits.obase.reference."""
+
+import unittest
+
+from abstraits.obase import BaseObj
+from abstraits.obase.reference import Reference
+
+class Objet(BaseObj):
+
+    """Objet de base simplifié."""
+
+    cible_par_defaut = None
+
+    def __init__(self):
+        BaseObj.__init__(self)
+        self.nom = "objet"
+        self._construire()
+
+    def __getnewargs__(self):
+        return ()
+
+    @property
+    def nom_majuscule(self):
+        return self.nom.upper()
+
+class TestReference(unittest.TestCase):
+
+    """Unittest des attributs référençant des objets."""
+
+    def test_objet_detruit(self):
+        """Vérifie qu'un objet détruit n'est plus retourné."""
+        objet = Objet()
+        cible = Objet()
+        objet.cible = cible
+        self.assertIs(objet.cible, cible)
+        self.assertIsInstance(Objet.__dict__["cible"], Reference)
+        cible.detruire()
+        self.assertIsNone(objet.cible)
+
+    def test_valeurs_simples(self):
+        """Vérifie que les valeurs simples ne sont pas surveillées."""
+        objet = Objet()
+        objet.nom = "autre"
+        self.assertEqual(objet.nom, "autre")
+        self.assertNotIsInstance(Objet.__dict__.get("nom"), Reference)
+
+    def test_defaut(self):
+        """Vérifie que la valeur définie par la classe est conservée."""
+        objet = Objet()
+        autre = Objet()
+        objet.cible_par_defaut = Objet()
+        self.assertIsNone(autre.cible_par_defaut)
+        self.assertIsNone(Objet.cible_par_defaut)
+        del objet.cible_par_defaut
+        self.assertIsNone(objet.cible_par_defaut)
+
+    def test_propriete(self):
+        """Vérifie que les propriétés ne sont pas remplacées."""
+        objet = Objet()
+        with self.assertRaises(AttributeError):
+            objet.nom_majuscule = Objet()
+
+        self.assertEqual(objet.nom_majuscule, "OBJET")
@@ -0,0 +1,97 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest de abstraits.obase.registre."""
+
+import gc
+import unittest
+import weakref
+
+from abstraits.obase.registre import Registre
+
+class Lieu:
+
+    """Objet simplifié."""
+
+class Salle(Lieu):
+
+    """Objet hérité."""
+
+class Cabine(Salle):
+
+    """Objet hérité au second degré."""
+
+class TestRegistre(unittest.TestCase):
+
+    """Unittest du registre des objets."""
+
+    def test_ajouter_retirer(self):
+        """Vérifie l'ajout et le retrait des objets."""
+        registre = Registre()
+        salle = Salle()
+        self.assertTrue(registre.ajouter(salle))
+        self.assertFalse(registre.ajouter(salle))
+        self.assertIn(salle, registre)
+        self.assertEqual(len(registre), 1)
+        registre.retirer(salle)
+        registre.retirer(salle)
+        self.assertNotIn(salle, registre)
+        self.assertEqual(len(registre), 0)
+
+    def test_groupe(self):
+        """Vérifie la récupération des objets des classes héritées."""
+        registre = Registre()
+        lieu, salle, cabine = Lieu(), Salle(), Cabine()
+        for objet in (cabine, salle, lieu):
+            registre.ajouter(objet)
+
+        self.assertEqual(registre.groupe(Salle), [cabine, salle])
+        self.assertEqual(len(registre.groupe(Lieu)), 3)
+        self.assertEqual(registre.groupe(int), [])
+        self.assertIs(registre.premier(Salle), salle)
+        registre.retirer(cabine)
+        self.assertEqual(registre.groupe(Salle), [salle])
+        self.assertEqual(registre.vider(Lieu), [lieu])
+        self.assertEqual(len(registre), 1)
+
+    def test_classe_remplacee(self):
+        """Vérifie qu'une classe sans objets disparaît du registre."""
+        registre = Registre()
+        Remplacee = type("Remplacee", (Salle, ), {})
+        objet = Remplacee()
+        registre.ajouter(objet)
+        self.assertEqual(registre.groupe(Salle), [objet])
+        registre.retirer(objet)
+        reference = weakref.ref(Remplacee)
+        del objet, Remplacee
+        gc.collect()
+        self.assertIsNone(reference())
+        self.assertEqual(registre.groupe(Salle), [])
@@ -0,0 +1,93 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Fichier définissant les unittest de bases.anaconf.analyseur."""
+
+import os
+import tempfile
+import unittest
+
+from bases.anaconf.analyseur import Analyseur
+from bases.logs import man_logs
+
+MODELE = r"""
+# Modèle de test
+nombre = 3 * 4
+nom = "kassie"
+couleurs = ["rouge", "vert"]
+hasard = suivant()
+"""
+
+class TestAnalyseur(unittest.TestCase):
+
+    """Unittest de l'analyseur de fichiers de configuration."""
+
+    def setUp(self):
+        """Crée l'analyseur dans un dossier temporaire."""
+        self.dossier = tempfile.TemporaryDirectory()
+        chemin = os.path.join(self.dossier.name, "test.cfg")
+        logger = man_logs.creer_logger("anaconf", "test_analyseur")
+        self.analyseur = Analyseur(chemin, "modèle test", MODELE, logger)
+        self.compteur = 0
+        self.analyseur._set_globales({"suivant": self.suivant})
+
+    def tearDown(self):
+        self.dossier.cleanup()
+
+    def suivant(self):
+        """Retourne un nombre différent à chaque appel."""
+        self.compteur += 1
+        return self.compteur
+
+    def test_valeurs(self):
+        """Vérifie l'interprétation des données."""
+        self.assertEqual(self.analyseur.nombre, 12)
+        self.assertEqual(self.analyseur.nombre, 12)
+        self.assertEqual(self.analyseur.nom, "kassie")
+
+    def test_valeurs_modifiables(self):
+        """Vérifie que les listes ne sont pas partagées."""
+        couleurs = self.analyseur.couleurs
+        couleurs.append("bleu")
+        self.assertEqual(self.analyseur.couleurs, ["rouge", "vert"])
+
+    def test_dynamiques(self):
+        """Vérifie que les données dynamiques sont réinterprétées."""
+        self.assertEqual(self.analyseur.hasard, 1)
+        self.assertEqual(self.analyseur.hasard, 1)
+        self.analyseur._set_dynamiques("hasard")
+        self.assertEqual(self.analyseur.hasard, 2)
+        self.assertEqual(self.analyseur.hasard, 3)
+
+    def test_redefinition(self):
+        """Vérifie qu'une donnée redéfinie est réinterprétée."""
+        self.assertEqual(self.analyseur.nombre, 12)
+        self.analyseur.nombre = "5"
+        self.assertEqual(self.analyseur.nombre, 5)
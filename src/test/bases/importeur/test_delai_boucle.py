@@ -0,0 +1,97 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest du délai de la boucle synchro."""
+
+import unittest
+
+from abstraits.module import BaseModule
+from bases.importeur import Importeur
+
+class ModuleDelai(BaseModule):
+
+    """Module de test dont le délai est fixé."""
+
+    def __init__(self, nom, delai):
+        """Constructeur du module de test."""
+        BaseModule.__init__(self, None, nom, "secondaire")
+        self.delai = delai
+
+    def delai_boucle(self):
+        """Retourne le délai fixé."""
+        return self.delai
+
+
+class TestDelaiBoucle(unittest.TestCase):
+
+    """Unittest de Importeur.delai_boucle."""
+
+    def setUp(self):
+        """On crée un importeur sans passer par le constructeur."""
+        self.redefinitions = dict(Importeur.redefinitions)
+        Importeur.redefinitions.clear()
+        self.importeur = Importeur.__new__(Importeur)
+
+    def tearDown(self):
+        """On restaure le cache des redéfinitions."""
+        Importeur.redefinitions.clear()
+        Importeur.redefinitions.update(self.redefinitions)
+
+    def ajouter(self, nom, delai):
+        """Ajoute un module au délai fixé."""
+        setattr(self.importeur, nom, ModuleDelai(nom, delai))
+
+    def test_redefinitions(self):
+        """Vérifie que seuls les modules redéfinissant sont interrogés."""
+        self.ajouter("a", 0.2)
+        self.importeur.b = BaseModule(None, "b", "secondaire")
+        self.assertEqual(self.importeur.get_redefinitions("delai_boucle"),
+                (self.importeur.a, ))
+
+    def test_minimum(self):
+        """Vérifie que le plus petit délai des modules est retenu."""
+        self.ajouter("a", 0.5)
+        self.ajouter("b", 0.2)
+        self.ajouter("c", None)
+        self.assertEqual(self.importeur.delai_boucle(1), 0.2)
+
+    def test_maximum(self):
+        """Vérifie que le délai ne dépasse pas le maximum."""
+        self.ajouter("a", 3)
+        self.ajouter("b", None)
+        self.assertEqual(self.importeur.delai_boucle(1), 1)
+        self.assertEqual(self.importeur.delai_boucle(0.1), 0.1)
+
+    def test_echeance_depassee(self):
+        """Vérifie qu'une échéance dépassée donne un délai nul."""
+        self.ajouter("a", 0.5)
+        self.ajouter("b", -2)
+        self.assertEqual(self.importeur.delai_boucle(1), 0)
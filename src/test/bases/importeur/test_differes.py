@@ -0,0 +1,102 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest du chargement des modules différés."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from abstraits.module import BaseModule
+from bases.importeur import Importeur
+from bases.importeur.profil import ProfilDemarrage
+from bases.logs import man_logs
+
+class ImporteurTest(Importeur):
+
+    """Importeur dont les modules sont créés sans être importés."""
+
+    def charger_module(self, m_type, nom):
+        setattr(self, nom, BaseModule(self, nom, m_type))
+
+
+class TestDifferes(unittest.TestCase):
+
+    """Unittest du profil de démarrage avec des modules différés."""
+
+    attributs = ("differes", "demarre", "profil", "parser_cmd", "logger",
+            "redefinitions")
+
+    def setUp(self):
+        """On crée un importeur sans passer par le constructeur."""
+        self.sauves = {nom: getattr(Importeur, nom) for nom in \
+                self.attributs}
+        self.repertoire = tempfile.mkdtemp()
+        self.chemin = os.path.join(self.repertoire, "profil.txt")
+        Importeur.redefinitions = {}
+        Importeur.differes = ["tags", "navigation"]
+        Importeur.demarre = True
+        Importeur.profil = ProfilDemarrage()
+        Importeur.parser_cmd = {"profil-demarrage": self.chemin}
+        Importeur.logger = man_logs.creer_logger("", "test_differes")
+        self.importeur = ImporteurTest.__new__(ImporteurTest)
+
+    def tearDown(self):
+        for nom, valeur in self.sauves.items():
+            setattr(Importeur, nom, valeur)
+
+        shutil.rmtree(self.repertoire)
+
+    def lire(self):
+        """Retourne le contenu du rapport."""
+        with open(self.chemin, encoding="utf-8") as fichier:
+            return fichier.read()
+
+    def test_reecriture(self):
+        """Vérifie que le rapport est réécrit après les modules différés."""
+        self.importeur.ecrire_profil()
+        self.assertNotIn("chargement différé", self.lire())
+        fin = Importeur.profil.fin
+        self.assertIsNotNone(fin)
+
+        self.importeur.boucle()
+        self.assertEqual(Importeur.differes, ["navigation"])
+        self.assertNotIn("chargement différé", self.lire())
+
+        # Le premier accès charge le dernier module différé
+        self.assertEqual(self.importeur.navigation.nom, "navigation")
+        self.assertEqual(Importeur.differes, [])
+        rapport = self.lire()
+        self.assertIn("chargement différé : ", rapport)
+        self.assertIn("  tags", rapport)
+        self.assertIn("  navigation", rapport)
+        self.assertEqual(Importeur.profil.fin, fin)
@@ -0,0 +1,80 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest du profil de démarrage."""
+
+import time
+import unittest
+
+from bases.importeur.profil import ProfilDemarrage
+
+class TestProfilDemarrage(unittest.TestCase):
+
+    """Unittest du profil de démarrage."""
+
+    def test_rapport(self):
+        """Vérifie que les durées sont cumulées par phase et module."""
+        profil = ProfilDemarrage()
+        with profil.mesurer("importation", "salle"):
+            time.sleep(0.01)
+        with profil.mesurer("importation", "joueur"):
+            pass
+        with profil.mesurer("configuration", "salle"):
+            pass
+
+        self.assertEqual(profil.phases, ["importation", "configuration"])
+        self.assertGreater(profil.durees["importation"]["salle"],
+                profil.durees["importation"]["joueur"])
+        lignes = profil.rapport().split("\n")
+        self.assertTrue(lignes[0].startswith("Démarrage en"))
+        self.assertTrue(lignes[3].strip().startswith("salle"))
+        self.assertIn("Par module :", lignes)
+
+    def test_exception(self):
+        """Vérifie que la durée est mesurée si le module échoue."""
+        profil = ProfilDemarrage()
+        with self.assertRaises(ValueError):
+            with profil.mesurer("initialisation", "salle"):
+                raise ValueError
+
+        self.assertIn("salle", profil.durees["initialisation"])
+
+    def test_terminer(self):
+        """Vérifie que la durée du démarrage s'arrête à sa fin."""
+        profil = ProfilDemarrage()
+        profil.terminer()
+        time.sleep(0.02)
+        with profil.mesurer("chargement différé", "tags"):
+            pass
+
+        duree = float(profil.rapport().split("\n")[0][13:-1])
+        self.assertLess(duree, 0.02)
+        self.assertEqual(profil.phases, ["chargement différé"])
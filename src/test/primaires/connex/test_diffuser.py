@@ -0,0 +1,204 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest de la diffusion des messages."""
+
+import unittest
+
+from primaires.connex import Module
+from primaires.connex.instance_connexion import InstanceConnexion
+
+class Charte:
+
+    """Charte graphique simplifiée."""
+
+    couleur_titre = "|mr|"
+    couleur_cmd = "|grf|"
+    couleur_entree = "|grf|"
+    couleur_attention = "|vr|"
+    couleur_erreur = "|rg|"
+
+class Anaconf:
+
+    """Analyseur de configuration retournant la charte simplifiée."""
+
+    charte = Charte()
+
+    def get_config(self, nom):
+        return self.charte
+
+class ImporteurTest:
+
+    """Importeur simplifié ne contenant que l'analyseur de configuration."""
+
+    anaconf = Anaconf()
+
+class Compte:
+
+    """Compte simplifié."""
+
+    def __init__(self, encodage, couleur):
+        self.encodage = encodage
+        self.couleur = couleur
+
+class Options:
+
+    """Options de contexte simplifiées."""
+
+    def __init__(self, sup_accents, aff_sp_cars):
+        self.sup_accents = sup_accents
+        self.aff_sp_cars = aff_sp_cars
+
+class Contexte:
+
+    """Contexte simplifié."""
+
+    def __init__(self, opts):
+        self.opts = opts
+
+class InstanceTest(InstanceConnexion):
+
+    """Instance de connexion sans client, au profil choisi."""
+
+    importeur = ImporteurTest()
+
+    def __init__(self, encodage="utf-8", couleur=True, sup_accents=False,
+            aff_sp_cars=False):
+        self.client = None
+        self.joueur = None
+        self.compte = Compte(encodage, couleur)
+        self.contexte = Contexte(Options(sup_accents, aff_sp_cars))
+        self.file_attente = []
+        self.nb_msg = 0
+
+    @property
+    def messages(self):
+        """Retourne les messages de la file d'attente."""
+        return [msg for nl, msg in self.file_attente]
+
+class InstanceEnvoyer(InstanceTest):
+
+    """Instance redéfinissant 'envoyer'."""
+
+    def envoyer(self, msg, nl=2):
+        self.file_attente.append((nl, msg))
+
+class Joueur:
+
+    """Joueur simplifié."""
+
+    def __init__(self, instance):
+        self.instance_connexion = instance
+
+class TestDiffuser(unittest.TestCase):
+
+    """Unittest de la méthode 'diffuser' du module connex."""
+
+    message = "|rg|Été|ff| : _b_ à |cmd|l'étage|ff|."
+
+    def setUp(self):
+        """Crée le module sans passer par le constructeur."""
+        self.connex = Module.__new__(Module)
+        self.connex.derniere_diffusion = (None, {})
+
+    def diffuser(self, *instances):
+        """Diffuse le message aux instances."""
+        self.connex.diffuser(self.message, [Joueur(i) for i in instances])
+
+    def test_profils(self):
+        """Vérifie que le message n'est formaté qu'une fois par profil."""
+        a1 = InstanceTest()
+        a2 = InstanceTest()
+        sans_couleur = InstanceTest(couleur=False)
+        latin = InstanceTest(encodage="iso-8859-15")
+        sans_accents = InstanceTest(sup_accents=True)
+        sp_cars = InstanceTest(aff_sp_cars=True)
+        instances = (a1, a2, sans_couleur, latin, sans_accents, sp_cars)
+        self.diffuser(*instances)
+
+        rendus = self.connex.derniere_diffusion[1]
+        self.assertEqual(len(rendus), 5)
+        self.assertEqual(set(rendus.keys()),
+                set(i.profil for i in instances))
+        for instance in instances:
+            self.assertEqual(len(instance.messages), 1)
+            self.assertEqual(instance.nb_msg, 1)
+            self.assertIs(instance.messages[0], rendus[instance.profil])
+
+        # Les instances de même profil partagent le même objet bytes
+        self.assertIs(a1.messages[0], a2.messages[0])
+
+    def test_rendus(self):
+        """Vérifie que chaque profil reçoit le bon message."""
+        instances = (InstanceTest(), InstanceTest(couleur=False),
+                InstanceTest(encodage="iso-8859-15"),
+                InstanceTest(sup_accents=True),
+                InstanceTest(aff_sp_cars=True))
+        self.diffuser(*instances)
+
+        # Le message est celui qu'aurait produit 'envoyer'
+        for instance in instances:
+            self.assertEqual(instance.messages[0],
+                    instance.formater_message(self.message))
+
+        normal, sans_couleur, latin, sans_accents, sp_cars = \
+                [i.messages[0] for i in instances]
+        self.assertEqual(len(set((normal, sans_couleur, latin,
+                sans_accents, sp_cars))), 5)
+        self.assertIn("Été".encode(), normal)
+        self.assertIn("\x1b[".encode(), normal)
+        self.assertNotIn("\x1b[".encode(), sans_couleur)
+        self.assertIn("Été".encode("iso-8859-15"), latin)
+        self.assertNotIn("Été".encode(), latin)
+        self.assertNotIn("É".encode(), sans_accents)
+        self.assertIn(b"Ete", sans_accents)
+        self.assertIn(b" | ", normal)
+        self.assertIn(b"_b_", sp_cars)
+
+    def test_derniere_diffusion(self):
+        """Vérifie que les rendus du dernier message sont réutilisés."""
+        premiere = InstanceTest()
+        seconde = InstanceTest()
+        self.diffuser(premiere)
+        self.diffuser(seconde)
+        self.assertIs(premiere.messages[0], seconde.messages[0])
+
+        self.connex.diffuser("Autre message.", [Joueur(seconde)])
+        self.assertEqual(list(self.connex.derniere_diffusion[1].values()),
+                [seconde.messages[1]])
+        self.assertIsNot(premiere.messages[0], seconde.messages[1])
+
+    def test_envoyer_redefini(self):
+        """Vérifie que les instances redéfinissant 'envoyer' le gardent."""
+        instance = InstanceEnvoyer()
+        self.connex.diffuser(self.message, [Joueur(instance), Joueur(None)])
+        self.assertEqual(instance.messages, [self.message])
+        self.assertEqual(self.connex.derniere_diffusion[1], {})
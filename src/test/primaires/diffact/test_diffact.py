@@ -0,0 +1,87 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest du module primaire diffact."""
+
+import time
+import unittest
+
+from bases.logs import man_logs
+from primaires.diffact import Module
+from primaires.diffact.echeancier import Echeancier
+from primaires.diffact.roue import Roue
+
+class TestDiffact(unittest.TestCase):
+
+    """Unittest de l'exécution des actions périodiques."""
+
+    def setUp(self):
+        """Crée le module sans passer par le constructeur."""
+        self.diffact = Module.__new__(Module)
+        self.diffact.id_unique = 1
+        self.diffact.echeancier = Echeancier()
+        self.diffact.periodiques = {}
+        self.diffact.roue = Roue(time.time())
+        self.diffact.longues = []
+        self.diffact.logger = man_logs.creer_logger("diffact",
+                "test_diffact")
+        self.executees = []
+
+    def executer(self, nom, a_retirer=None):
+        """Action de test : retire éventuellement une autre action."""
+        self.executees.append(nom)
+        if a_retirer:
+            self.diffact.retirer_periodique(a_retirer)
+
+    def test_retrait_meme_tour(self):
+        """Vérifie qu'une action retirée dans le même tour est ignorée."""
+        diffact = self.diffact
+        diffact.ajouter_periodique("supprimer", 60, self.executer,
+                "supprimer", "tick", delai=-2)
+        diffact.ajouter_periodique("tick", 60, self.executer, "tick",
+                delai=-1)
+        diffact.mettre_a_jour_actions()
+        self.assertEqual(self.executees, ["supprimer"])
+        self.assertNotIn("tick", diffact.periodiques)
+        self.assertEqual(len(diffact.roue), 1)
+
+    def test_reprogrammer(self):
+        """Vérifie que les actions exécutées sont reprogrammées."""
+        diffact = self.diffact
+        diffact.ajouter_periodique("tick", 60, self.executer, "tick",
+                delai=-1)
+        diffact.ajouter_periodique("retire", 60, self.executer, "retire",
+                "retire", delai=-1)
+        diffact.mettre_a_jour_actions()
+        self.assertEqual(sorted(self.executees), ["retire", "tick"])
+        self.assertEqual(list(diffact.periodiques), ["tick"])
+        self.assertEqual(len(diffact.roue), 1)
+        self.assertGreater(diffact.periodiques["tick"].echeance, time.time())
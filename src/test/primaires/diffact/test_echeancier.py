@@ -0,0 +1,101 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Fichier définissant les unittest de primaires.diffact.echeancier."""
+
+import unittest
+
+from primaires.diffact.echeancier import Echeancier
+
+class Action:
+
+    """Action différée simplifiée, avec une échéance fixe."""
+
+    def __init__(self, nom, echeance):
+        self.nom = nom
+        self.echeance = echeance
+
+class TestEcheancier(unittest.TestCase):
+
+    """Unittest de l'échéancier des actions différées."""
+
+    def extraire_tout(self, echeancier, moment):
+        """Retourne les noms des actions échues à 'moment'."""
+        noms = []
+        action = echeancier.extraire(moment)
+        while action is not None:
+            noms.append(action.nom)
+            action = echeancier.extraire(moment)
+
+        return noms
+
+    def test_ordre(self):
+        """Vérifie que les actions sont extraites par échéance."""
+        echeancier = Echeancier()
+        for nom, echeance in (("c", 3), ("a", 1), ("b", 2), ("b2", 2)):
+            echeancier.ajouter(Action(nom, echeance))
+
+        self.assertEqual(self.extraire_tout(echeancier, 2), ["a", "b", "b2"])
+        self.assertEqual(len(echeancier), 1)
+        self.assertEqual(echeancier.prochaine_echeance(), 3)
+
+    def test_retirer(self):
+        """Vérifie que les actions retirées ne sont pas extraites."""
+        echeancier = Echeancier()
+        for i in range(200):
+            echeancier.ajouter(Action(str(i), i))
+
+        for i in range(0, 200, 2):
+            self.assertIsNotNone(echeancier.retirer(str(i)))
+
+        self.assertIsNone(echeancier.retirer("0"))
+        self.assertNotIn("0", echeancier)
+        self.assertEqual(echeancier.prochaine_echeance(), 1)
+        noms = self.extraire_tout(echeancier, 1000)
+        self.assertEqual(noms, [str(i) for i in range(1, 200, 2)])
+        self.assertEqual(echeancier.prochaine_echeance(), None)
+
+    def test_remplacer(self):
+        """Vérifie qu'une action remplacée n'est exécutée qu'une fois."""
+        echeancier = Echeancier()
+        echeancier.ajouter(Action("a", 1))
+        echeancier.ajouter(Action("a", 5))
+        self.assertEqual(self.extraire_tout(echeancier, 2), [])
+        self.assertEqual(self.extraire_tout(echeancier, 5), ["a"])
+
+    def test_limite(self):
+        """Vérifie que les actions ajoutées après la limite attendent."""
+        echeancier = Echeancier()
+        echeancier.ajouter(Action("a", 1))
+        limite = echeancier.numero
+        echeancier.ajouter(Action("b", 1))
+        self.assertEqual(echeancier.extraire(1, limite).nom, "a")
+        self.assertIsNone(echeancier.extraire(1, limite))
+        self.assertEqual(echeancier.extraire(1).nom, "b")
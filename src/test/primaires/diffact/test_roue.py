@@ -0,0 +1,98 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Fichier définissant les unittest de primaires.diffact.roue."""
+
+import unittest
+
+from primaires.diffact.periodique import Periodique
+from primaires.diffact.roue import Roue
+
+class Action:
+
+    """Action simplifiée, avec une échéance fixe."""
+
+    def __init__(self, nom, echeance):
+        self.nom = nom
+        self.echeance = echeance
+        self.position = None
+
+class TestRoue(unittest.TestCase):
+
+    """Unittest de la roue temporelle."""
+
+    def test_echeances(self):
+        """Vérifie que chaque action est échue au bon pas."""
+        roue = Roue(1000, resolution=1, taille=4, niveaux=3)
+        echeances = (1001, 1003, 1004, 1010, 1017, 1050, 1200)
+        for echeance in echeances:
+            roue.ajouter(Action(str(echeance), echeance))
+
+        self.assertEqual(len(roue), len(echeances))
+        echues = []
+        for moment in range(1000, 1201):
+            for action in roue.avancer(moment):
+                self.assertEqual(action.echeance, moment)
+                echues.append(action.echeance)
+
+        self.assertEqual(tuple(echues), echeances)
+        self.assertEqual(len(roue), 0)
+
+    def test_retard(self):
+        """Vérifie qu'un grand retard libère les actions dans l'ordre."""
+        roue = Roue(0, resolution=1, taille=4, niveaux=2)
+        for echeance in (30, 2, 9):
+            roue.ajouter(Action(str(echeance), echeance))
+
+        echues = [a.echeance for a in roue.avancer(40)]
+        self.assertEqual(echues, [2, 9, 30])
+
+    def test_retirer(self):
+        """Vérifie qu'une action retirée n'est pas libérée."""
+        roue = Roue(0, resolution=1, taille=4, niveaux=2)
+        action = Action("a", 6)
+        roue.ajouter(action)
+        roue.retirer(action)
+        self.assertEqual(roue.avancer(10), [])
+        self.assertEqual(len(roue), 0)
+
+class TestPeriodique(unittest.TestCase):
+
+    """Unittest des actions périodiques."""
+
+    def test_reprogrammer(self):
+        """Vérifie que le retard de la boucle ne s'accumule pas."""
+        periodique = Periodique("p", 60, 0, None)
+        debut = periodique.echeance
+        periodique.reprogrammer(debut + 2)
+        self.assertEqual(periodique.echeance, debut + 60)
+        periodique.reprogrammer(debut + 200)
+        self.assertEqual(periodique.echeance, debut + 240)
+        self.assertEqual(periodique.nb_sautees, 2)
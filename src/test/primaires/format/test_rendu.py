@@ -0,0 +1,96 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Fichier définissant les unittest de primaires.format.rendu."""
+
+import unittest
+
+from primaires.format.fonctions import *
+from primaires.format.rendu import get_rendu
+
+class Charte:
+
+    """Charte graphique simplifiée."""
+
+    couleur_titre = "|mr|"
+    couleur_cmd = "|grf|"
+    couleur_entree = "|grf|"
+    couleur_attention = "|vr|"
+    couleur_erreur = "|rg|"
+
+class TestRendu(unittest.TestCase):
+
+    """Unittest du rendu compilé des messages."""
+
+    messages = (
+        "Entrez |cmd|regarder|ff| pour |tit|voir|ff|.\n",
+        "|err|Erreur|ff| : _b_ n'est pas accepté à l'été.\n\n",
+        "|rgc|x|ff||bc|y|ff| |inconnu| |",
+    )
+
+    def rendre_pas_a_pas(self, message, charte, sp_cars, accents):
+        """Rend le message en appliquant les fonctions une à une."""
+        message = ajouter_couleurs(message, charte)
+        if sp_cars:
+            message = remplacer_sp_cars(message)
+        if accents:
+            message = supprimer_accents(message)
+
+        return convertir_nl(message)
+
+    def test_equivalence(self):
+        """Vérifie que le rendu équivaut aux fonctions de formatage."""
+        charte = Charte()
+        for message in self.messages:
+            message = message.encode()
+            for sp_cars in (True, False):
+                for accents in (True, False):
+                    rendu = get_rendu(charte, True, sp_cars, accents)
+                    self.assertEqual(rendu.rendre(message),
+                            self.rendre_pas_a_pas(message, charte, sp_cars,
+                            accents))
+                    self.assertEqual(rendu.rendre(message.decode()),
+                            self.rendre_pas_a_pas(message, charte, sp_cars,
+                            accents).decode())
+
+    def test_sans_couleur(self):
+        """Vérifie que les couleurs peuvent être retirées."""
+        charte = Charte()
+        rendu = get_rendu(charte, False)
+        for message in self.messages:
+            self.assertEqual(rendu.rendre(message),
+                    convertir_nl(remplacer_sp_cars(supprimer_couleurs(
+                    message).encode())).decode())
+
+    def test_cache(self):
+        """Vérifie que le rendu n'est compilé qu'une fois."""
+        charte = Charte()
+        self.assertIs(get_rendu(charte), get_rendu(charte))
+        self.assertIsNot(get_rendu(charte), get_rendu(charte, False))
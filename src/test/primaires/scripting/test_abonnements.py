@@ -0,0 +1,60 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Tests unitaires des abonnements aux évènements périodiques."""
+
+import unittest
+
+from primaires.salle.salle import Salle
+
+class TestAbonnements(unittest.TestCase):
+
+    """Tests unitaires du registre des abonnements."""
+
+    def test_ajout_suppression_test(self):
+        """Vérifie que l'abonnement suit l'ajout et le retrait des tests."""
+        abonnements = importeur.scripting.abonnements
+        salle = list(importeur.salle.salles.values())[0]
+        evenement = salle.script["changer"]["minute"]
+        self.assertNotIn(salle, abonnements.abonnes(Salle, "changer.minute"))
+        indice = evenement.ajouter_test("minute = 5")
+        self.assertIn(salle, abonnements.abonnes(Salle, "changer.minute"))
+        self.assertNotIn(salle, abonnements.abonnes(Salle, "changer.heure"))
+        evenement.supprimer_test(indice)
+        self.assertNotIn(salle, abonnements.abonnes(Salle, "changer.minute"))
+
+    def test_variables_temps(self):
+        """Vérifie que les variables de temps sont partagées."""
+        abonnements = importeur.scripting.abonnements
+        temps = importeur.temps.temps
+        variables = abonnements.variables_temps(temps)
+        self.assertIs(abonnements.variables_temps(temps), variables)
+        self.assertEqual(variables["jour"], temps.jour + 1)
@@ -53,3 +53,16 @@ class TestCache(ManipulationScripting, unittest.TestCase):
             """)
             cache = test.get_cache()
             self.assertEqual(cache, CACHE_SIMPLE)
+
+    def test_code_compile(self):
+        """Vérifie que le code compilé est conservé puis invalidé."""
+        salle = list(importeur.salle.salles.values())[0]
+        with self.scripter(salle, "dit") as test:
+            test.ajouter_instructions("""
+                dire personnage "Coucou"
+            """)
+            code = test.get_code()
+            self.assertIs(test.get_code(), code)
+            self.assertNotIn("_Test__code", test.__getstate__())
+            test.ajouter_instruction("dire personnage \"Au revoir\"")
+            self.assertIsNot(test.get_code(), code)
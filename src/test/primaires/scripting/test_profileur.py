@@ -0,0 +1,79 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Tests unitaires du profileur des scripts."""
+
+from types import SimpleNamespace
+import unittest
+
+from primaires.scripting.profileur import Profileur
+
+CODE = """
+def script():
+    a = 1
+    b = a + 1
+    yield None
+""".strip()
+
+class TestProfileur(unittest.TestCase):
+
+    """Tests unitaires de la classe Profileur."""
+
+    def test_lignes(self):
+        """Vérifie que le temps est attribué aux lignes du script."""
+        salle = list(importeur.salle.salles.values())[0]
+        instructions = [SimpleNamespace(sans_couleurs="a = 1"),
+                SimpleNamespace(sans_couleurs="b = a + 1")]
+        test = SimpleNamespace(appelant=salle, instructions=instructions,
+                evenement=SimpleNamespace(nom_complet="changer.minute"),
+                tests=None)
+        globales = {}
+        exec(compile(CODE, "<string>", "exec"), globales)
+        profileur = Profileur()
+        profileur.activer()
+        self.assertIsNone(profileur.executer(test, globales["script"]()))
+        lignes = [pile[-1] for pile in profileur.piles]
+        self.assertIn("ligne 1 : a = 1", lignes)
+        self.assertIn("ligne 2 : b = a + 1", lignes)
+        pile = profileur.pile_test(test)
+        self.assertEqual(list(profileur.cumuler(3)), [pile])
+
+    def test_appelant_sans_nom(self):
+        """Vérifie la pile d'un appelant sans nom de scripting."""
+        class Zone:
+            def __repr__(self):
+                return "<zone depart>"
+
+        test = SimpleNamespace(appelant=Zone(), instructions=[],
+                evenement=SimpleNamespace(nom_complet="changer.minute"),
+                tests=None)
+        self.assertEqual(Profileur.pile_test(test), ("Zone <zone depart>",
+                "évènement changer.minute", "sinon"))
@@ -0,0 +1,58 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Tests unitaires de la résolution des types des fonctions et actions."""
+
+import unittest
+
+class TestResolution(unittest.TestCase):
+
+    """Tests unitaires du cache de résolution des types."""
+
+    def test_cache_fonction(self):
+        """Vérifie que la méthode résolue est mise en cache par types."""
+        fonction = importeur.scripting.fonctions["longueur"]
+        fonction.vider_cache()
+        succes = importeur.scripting.nb_cache_succes
+        echecs = importeur.scripting.nb_cache_echecs
+        methode = fonction.quelle_fonction(([1, 2], ))
+        self.assertIs(fonction.quelle_fonction(([3], )), methode)
+        self.assertEqual(importeur.scripting.nb_cache_echecs, echecs + 1)
+        self.assertEqual(importeur.scripting.nb_cache_succes, succes + 1)
+        self.assertIs(fonction.get_methode(0), methode)
+
+    def test_types_invalides(self):
+        """Vérifie qu'une combinaison invalide n'est pas mise en cache."""
+        action = importeur.scripting.actions["dire"]
+        with self.assertRaises(ValueError):
+            action.quelle_action((1, 2, 3))
+
+        self.assertNotIn((int, int, int), action._cache_types)
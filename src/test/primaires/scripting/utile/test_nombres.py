@@ -0,0 +1,63 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Tests unitaires de la couche numérique du scripting."""
+
+from fractions import Fraction
+import unittest
+
+from primaires.scripting.parser.calcul import remplacer_divisions
+from primaires.scripting.utile.nombres import diviser, simplifier
+
+class TestNombres(unittest.TestCase):
+
+    """Tests unitaires des fonctions de primaires.scripting.utile.nombres."""
+
+    def test_simplifier(self):
+        """Vérifie que seules les fractions entières sont simplifiées."""
+        self.assertIs(type(simplifier(Fraction(6, 3))), int)
+        self.assertEqual(simplifier(Fraction(1, 3)), Fraction(1, 3))
+        self.assertEqual(simplifier(2.5), 2.5)
+
+    def test_diviser(self):
+        """Vérifie que la division ne retourne jamais de flottant."""
+        self.assertIs(type(diviser(6, 3)), int)
+        self.assertEqual(diviser(7, 2), Fraction(7, 2))
+        self.assertIs(type(diviser(Fraction(9, 2), Fraction(3, 2))), int)
+        with self.assertRaises(ZeroDivisionError):
+            diviser(1, 0)
+
+    def test_remplacer_divisions(self):
+        """Vérifie la conversion des divisions d'un calcul."""
+        self.assertEqual(remplacer_divisions("{0} * {1} / {2} + {3}"),
+                "diviser({0} * {1}, {2}) + {3}")
+        self.assertEqual(remplacer_divisions("{0} /({1} + {2})"),
+                "diviser({0}, {1} + {2})")
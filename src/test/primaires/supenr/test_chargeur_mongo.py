@@ -0,0 +1,140 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest de ChargeurMongo."""
+
+import copy
+import unittest
+
+from abstraits.obase import BaseObj
+
+try:
+    from bson.objectid import ObjectId
+    from primaires.supenr.chargeur_mongo import ChargeurMongo, Paresseux
+except ImportError:
+    ChargeurMongo = None
+
+class Noeud(BaseObj):
+
+    """Objet de base simplifié."""
+
+    def __init__(self):
+        BaseObj.__init__(self)
+        self.voisins = []
+
+    def __getnewargs__(self):
+        return ()
+
+class Feuille(Noeud):
+
+    """Objet de base rarement consulté."""
+
+    pass
+
+NOEUD = Noeud.__module__ + ".Noeud"
+FEUILLE = Feuille.__module__ + ".Feuille"
+
+class Collection:
+
+    """Collection MongoDB simplifiée, en mémoire."""
+
+    def __init__(self, base):
+        self.base = base
+        self.documents = {}
+
+    def find(self, filtre=None):
+        self.base.requetes += 1
+        identifiants = self.documents.keys()
+        if filtre:
+            identifiants = filtre["_id"]["$in"]
+
+        return [copy.deepcopy(self.documents[i]) for i in identifiants \
+                if i in self.documents]
+
+    def find_one(self, filtre):
+        documents = self.find({"_id": {"$in": [filtre["_id"]]}})
+        return documents[0] if documents else None
+
+class Base(dict):
+
+    """Base MongoDB simplifiée, en mémoire."""
+
+    def __init__(self):
+        dict.__init__(self)
+        self.requetes = 0
+
+    def __missing__(self, nom):
+        collection = self[nom] = Collection(self)
+        return collection
+
+    def ajouter(self, nom, *voisins):
+        """Ajoute un document et retourne son identifiant."""
+        _id = ObjectId()
+        self[nom].documents[_id] = {"_id": _id, "voisins": list(voisins)}
+        return _id
+
+@unittest.skipIf(ChargeurMongo is None, "pymongo n'est pas installé")
+class TestChargeurMongo(unittest.TestCase):
+
+    """Unittest du chargement par lots depuis MongoDB."""
+
+    def setUp(self):
+        """Crée une chaîne de références de profondeur 3."""
+        self.base = Base()
+        feuilles = [[FEUILLE, self.base.ajouter(FEUILLE)] for i in range(5)]
+        fils = [[NOEUD, self.base.ajouter(NOEUD, *feuilles)] for i in range(5)]
+        self.racine = self.base.ajouter(NOEUD, *fils)
+        self.absent = ObjectId()
+        self.base[NOEUD].documents[self.racine]["voisins"].append(
+                [NOEUD, self.absent])
+
+    def test_en_largeur(self):
+        """Vérifie qu'une requête est faite par niveau de références."""
+        chargeur = ChargeurMongo(self.base, {})
+        racine = chargeur.charger_objet(Noeud, self.racine)
+        self.assertEqual(self.base.requetes, 3)
+        self.assertEqual(len(racine.voisins), 6)
+        self.assertIsNone(racine.voisins[5])
+        feuille = racine.voisins[0].voisins[0]
+        self.assertIs(type(feuille), Feuille)
+        self.assertIs(feuille, racine.voisins[4].voisins[0])
+        self.assertNotIn(self.absent, chargeur.objets[NOEUD])
+
+    def test_paresseux(self):
+        """Vérifie que les collections paresseuses sont chargées au besoin."""
+        chargeur = ChargeurMongo(self.base, {}, paresseuses=[FEUILLE])
+        racine = chargeur.charger_objet(Noeud, self.racine)
+        self.assertEqual(self.base.requetes, 2)
+        feuille = racine.voisins[0].voisins[0]
+        self.assertIsInstance(feuille, Paresseux)
+        self.assertEqual(feuille.voisins, [])
+        self.assertIs(type(feuille), Feuille)
+        self.assertEqual(self.base.requetes, 3)
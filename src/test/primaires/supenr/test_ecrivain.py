@@ -0,0 +1,79 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest de l'écrivain de supenr."""
+
+import errno
+import unittest
+
+from bases.logs import man_logs
+from primaires.supenr.ecrivain import Ecrivain
+
+class TestEcrivain(unittest.TestCase):
+
+    """Unittest du thread d'écriture."""
+
+    def setUp(self):
+        self.ecrivain = Ecrivain(man_logs.creer_logger("supenr",
+                "test_ecrivain"))
+        self.ecrivain.start()
+
+    def tearDown(self):
+        self.ecrivain.arreter()
+
+    def test_resultats(self):
+        """Vérifie que les tâches sont exécutées dans l'ordre."""
+        self.ecrivain.ajouter_tache("somme", sum, (1, 2))
+        self.ecrivain.ajouter_tache("maximum", max, 1, 3)
+        self.ecrivain.attendre()
+        resultats = self.ecrivain.resultats()
+        self.assertEqual([(nom, resultat, erreur) for nom, resultat, duree,
+                erreur in resultats], [("somme", 3, None),
+                ("maximum", 3, None)])
+        self.assertEqual(self.ecrivain.resultats(), [])
+
+    def test_erreur(self):
+        """Vérifie que l'échec d'une tâche est signalé."""
+        def ecrire():
+            raise OSError(errno.ENOSPC, "plus de place")
+
+        self.ecrivain.ajouter_tache("écriture", ecrire)
+        self.ecrivain.ajouter_tache("somme", sum, ())
+        self.ecrivain.attendre()
+        (nom, resultat, duree, erreur), suivante = self.ecrivain.resultats()
+        self.assertEqual(nom, "écriture")
+        self.assertIsNone(resultat)
+        self.assertIsInstance(erreur, OSError)
+        self.assertEqual(erreur.errno, errno.ENOSPC)
+
+        # Les tâches suivantes sont exécutées
+        self.assertEqual(suivante[:2], ("somme", 0))
+        self.assertIsNone(suivante[3])
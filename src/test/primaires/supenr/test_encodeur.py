@@ -0,0 +1,121 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest de l'encodeur compact de supenr."""
+
+from collections import deque
+from fractions import Fraction
+import pickle
+import unittest
+
+from bases.logs import man_logs
+from primaires.supenr.serialiseur import Serialiseur
+from test.primaires.supenr.test_journal import Noeud
+
+class TestEncodeur(unittest.TestCase):
+
+    """Unittest de l'encodeur compact."""
+
+    def setUp(self):
+        self.logger = man_logs.creer_logger("supenr", "test_encodeur")
+
+    def recharger(self, serialiseur, enregistrements):
+        """Restaure les enregistrements dans un nouveau sérialiseur."""
+        nouveau = Serialiseur(self.logger)
+        nouveau.encodeur.restaurer_schema(serialiseur.encodeur.schema())
+        nouveau.restaurer([(e[0], e[4]) for e in enregistrements])
+        return {o.nom: o for o in nouveau.par_ident.values()}
+
+    def test_valeurs(self):
+        """Vérifie l'encodage des différents types de valeurs."""
+        a = Noeud("a")
+        b = Noeud("b")
+        a.voisins.append(b)
+        a.valeurs = [None, True, False, 0, 127, 128, -1, -2 ** 70,
+                2 ** 70, 1.5, "é", b"\x00", (1, "x"), {"cle": [1, 2]},
+                {3}, Fraction(1, 3), {1: b}]
+        serialiseur = Serialiseur(self.logger)
+        enregistrements = serialiseur.serialiser(deque([a]))
+        self.assertEqual(len(enregistrements), 2)
+        self.assertEqual(enregistrements[0][3], (b._id_journal, ))
+
+        noeuds = self.recharger(serialiseur, enregistrements)
+        self.assertEqual(noeuds["a"].valeurs[:-1], a.valeurs[:-1])
+        self.assertIs(noeuds["a"].valeurs[-1][1], noeuds["b"])
+        self.assertIs(noeuds["a"].voisins[0], noeuds["b"])
+
+    def test_taille(self):
+        """Vérifie que l'encodage est plus compact que pickle."""
+        noeuds = [Noeud(str(i)) for i in range(10)]
+        for noeud in noeuds:
+            noeud.voisins.extend(noeuds)
+
+        serialiseur = Serialiseur(self.logger)
+        compact = sum(len(e[4]) for e in serialiseur.serialiser(
+                deque(noeuds)))
+        serialiseur = Serialiseur(self.logger, compact=False)
+        complet = sum(len(e[4]) for e in serialiseur.serialiser(
+                deque(noeuds)))
+        self.assertLess(compact, complet)
+
+    def test_formats(self):
+        """Vérifie que les deux formats peuvent être relus ensemble."""
+        a = Noeud("a")
+        b = Noeud("b")
+        a.voisins.append(b)
+        serialiseur = Serialiseur(self.logger, compact=False)
+        enregistrements = serialiseur.serialiser(deque([a]))
+        serialiseur.compact = True
+        b.nom = "c"
+        enregistrements[1] = serialiseur.serialiser(deque([b]))[0]
+        self.assertEqual(enregistrements[1][4][:1], b"\xfe")
+
+        noeuds = self.recharger(serialiseur, enregistrements)
+        self.assertIs(noeuds["a"].voisins[0], noeuds["c"])
+
+    def test_conteneurs_partages(self):
+        """Vérifie que les conteneurs partagés ne sont pas copiés."""
+        a = Noeud("a")
+        b = Noeud("b")
+        partagee = [b]
+        cycle = {}
+        cycle["cycle"] = cycle
+        a.valeurs = [partagee, partagee, cycle]
+        serialiseur = Serialiseur(self.logger)
+        enregistrements = serialiseur.serialiser(deque([a]))
+        self.assertEqual(len(enregistrements), 2)
+        self.assertEqual(enregistrements[0][3], (b._id_journal, ))
+
+        noeuds = self.recharger(serialiseur, enregistrements)
+        valeurs = noeuds["a"].valeurs
+        self.assertIs(valeurs[0], valeurs[1])
+        self.assertIs(valeurs[0][0], noeuds["b"])
+        self.assertIs(valeurs[2]["cycle"], valeurs[2])
@@ -0,0 +1,260 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest du journal de supenr."""
+
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+
+from abstraits.obase import BaseObj, objets
+from bases.logs import man_logs
+from primaires.supenr import journal as module_journal
+from primaires.supenr.journal import Journal
+
+class Noeud(BaseObj):
+
+    """Objet de base simplifié."""
+
+    def __init__(self, nom):
+        BaseObj.__init__(self)
+        self.nom = nom
+        self.voisins = []
+
+    def __getnewargs__(self):
+        return ("", )
+
+class Racine(Noeud):
+
+    """Objet enregistré."""
+
+    enregistrer = True
+
+class TestJournal(unittest.TestCase):
+
+    """Unittest de l'enregistrement incrémental."""
+
+    def setUp(self):
+        self.repertoire = tempfile.mkdtemp()
+        self.logger = man_logs.creer_logger("supenr", "test_journal")
+
+    def tearDown(self):
+        shutil.rmtree(self.repertoire)
+
+    def recharger(self):
+        """Charge un nouveau journal et retourne ses objets par nom."""
+        journal = Journal(self.repertoire, self.logger)
+        journal.charger()
+        return journal, {o.nom: o for o in journal.par_ident.values()}
+
+    def test_compacter(self):
+        """Vérifie que la base contient les objets référencés."""
+        a = Noeud("a")
+        b = Noeud("b")
+        a.voisins.append(b)
+        b.voisins.append(a)
+        journal = Journal(self.repertoire, self.logger)
+        self.assertEqual(journal.compacter([a]), 2)
+
+        journal, noeuds = self.recharger()
+        self.assertEqual(sorted(noeuds), ["a", "b"])
+        self.assertIs(noeuds["a"].voisins[0], noeuds["b"])
+        self.assertIs(noeuds["b"].voisins[0], noeuds["a"])
+
+    def test_ecrire(self):
+        """Vérifie que seuls les objets modifiés sont écrits."""
+        a = Noeud("a")
+        b = Noeud("b")
+        journal = Journal(self.repertoire, self.logger)
+        journal.compacter([a, b])
+        c = Noeud("c")
+        a.voisins.append(c)
+        journal.marquer(a)
+        self.assertEqual(journal.ecrire(), 2)
+        self.assertEqual(journal.ecrire(), 0)
+
+        journal, noeuds = self.recharger()
+        self.assertEqual(sorted(noeuds), ["a", "b", "c"])
+        self.assertIs(noeuds["a"].voisins[0], noeuds["c"])
+
+        # Le segment est conservé pour la génération précédente
+        journal.compacter([noeuds["a"]])
+        self.assertEqual(journal.segments, [2])
+        journal.compacter([noeuds["a"]])
+        journal.compacter([noeuds["a"]])
+        self.assertEqual(journal.segments, [])
+        journal, noeuds = self.recharger()
+        self.assertEqual(sorted(noeuds), ["a", "c"])
+
+    def test_segment_tronque(self):
+        """Vérifie qu'un enregistrement incomplet est ignoré."""
+        a = Noeud("a")
+        journal = Journal(self.repertoire, self.logger)
+        journal.compacter([a])
+        a.nom = "b"
+        journal.marquer(a)
+        journal.ecrire()
+        a.nom = "c"
+        journal.marquer(a)
+        journal.ecrire()
+        chemin = journal.chemin_segment(journal.segment)
+        taille = os.path.getsize(chemin)
+        with open(chemin, "r+b") as fichier:
+            fichier.truncate(taille - 3)
+
+        journal, noeuds = self.recharger()
+        self.assertEqual(list(noeuds), ["b"])
+        self.assertEqual(journal.segment, 3)
+
+    def test_fusionner(self):
+        """Vérifie la compaction à partir des fichiers."""
+        a = Racine("a")
+        b = Noeud("b")
+        a.voisins.append(b)
+        try:
+            journal = Journal(self.repertoire, self.logger)
+            journal.compacter([a])
+            a.voisins.remove(b)
+            a.nom = "c"
+            journal.marquer(a)
+            journal.ecrire()
+            dernier = journal.rotation()
+            self.assertEqual(journal.fusionner(dernier),
+                    (1, {b._id_journal}))
+            self.assertEqual(journal.segments, [2])
+
+            # L'objet supprimé est réécrit s'il a été référencé depuis
+            a.voisins.append(b)
+            journal.marquer(a)
+            journal.ecrire()
+            journal.appliquer({b._id_journal})
+            self.assertEqual(journal.ecrire(), 1)
+
+            journal, noeuds = self.recharger()
+        finally:
+            objets.vider(Racine)
+
+        self.assertEqual(sorted(noeuds), ["b", "c"])
+        self.assertIs(noeuds["c"].voisins[0], noeuds["b"])
+
+    def test_generations(self):
+        """Vérifie le chargement d'une génération précédente."""
+        a = Noeud("a")
+        journal = Journal(self.repertoire, self.logger)
+        journal.compacter([a])
+        a.nom = "b"
+        journal.marquer(a)
+        journal.ecrire()
+        journal.compacter([a])
+
+        # On corrompt la dernière génération
+        with open(journal.chemin_base, "r+b") as fichier:
+            fichier.seek(-1, 2)
+            fichier.write(b"\xff")
+
+        journal, noeuds = self.recharger()
+        self.assertEqual(list(noeuds), ["b"])
+
+    def ecrire_en_echec(self, journal, tronquer=True):
+        """Écrit le journal, l'écriture s'interrompant à la moitié.
+
+        Si tronquer est False, l'enregistrement incomplet ne peut pas
+        être retiré du segment.
+
+        """
+        def ecrire_moitie(fichier, donnees):
+            fichier.write(donnees[:len(donnees) // 2])
+            raise OSError(errno.ENOSPC, "plus de place")
+
+        def echouer(descripteur, taille):
+            raise OSError(errno.EIO, "erreur d'entrée/sortie")
+
+        ecrire_tout = module_journal.ecrire_tout
+        ftruncate = os.ftruncate
+        module_journal.ecrire_tout = ecrire_moitie
+        if not tronquer:
+            os.ftruncate = echouer
+        try:
+            with self.assertRaises(OSError):
+                journal.ecrire()
+        finally:
+            module_journal.ecrire_tout = ecrire_tout
+            os.ftruncate = ftruncate
+
+    def test_ecriture_interrompue(self):
+        """Vérifie qu'un enregistrement partiel est retiré du segment."""
+        a = Noeud("a")
+        b = Noeud("b")
+        journal = Journal(self.repertoire, self.logger)
+        journal.compacter([a, b])
+        a.nom = "c"
+        journal.marquer(a)
+        journal.ecrire()
+        chemin = journal.chemin_segment(journal.segment)
+        taille = os.path.getsize(chemin)
+        a.nom = "d"
+        journal.marquer(a)
+        self.ecrire_en_echec(journal)
+        self.assertEqual(os.path.getsize(chemin), taille)
+
+        # L'objet modifié n'est plus à écrire : le journal doit être
+        # compacté avant toute autre écriture
+        self.assertTrue(journal.compaction_requise)
+        self.assertTrue(journal.doit_compacter())
+        with self.assertRaises(RuntimeError):
+            journal.ecrire()
+
+        journal.compacter([a, b])
+        journal, noeuds = self.recharger()
+        self.assertEqual(sorted(noeuds), ["b", "d"])
+
+    def test_enregistrement_incomplet(self):
+        """Vérifie les écritures suivant un enregistrement incomplet."""
+        a = Noeud("a")
+        b = Noeud("b")
+        journal = Journal(self.repertoire, self.logger)
+        journal.compacter([a, b])
+        a.nom = "c"
+        journal.marquer(a)
+        self.ecrire_en_echec(journal, tronquer=False)
+        chemin = journal.chemin_segment(2)
+        self.assertGreater(os.path.getsize(chemin), 0)
+        self.assertEqual(journal.segment, 3)
+
+        # Les objets sont retrouvés après la compaction
+        journal.compacter([a, b])
+        b.nom = "e"
+        journal.marquer(b)
+        journal.ecrire()
+        journal, noeuds = self.recharger()
+        self.assertEqual(sorted(noeuds), ["c", "e"])
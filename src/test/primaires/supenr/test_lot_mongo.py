@@ -0,0 +1,93 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest de LotMongo."""
+
+import unittest
+
+try:
+    from pymongo import DeleteOne, ReplaceOne
+    from primaires.supenr.lot_mongo import LotMongo
+except ImportError:
+    LotMongo = None
+
+class Collection:
+
+    """Collection MongoDB simplifiée, en mémoire."""
+
+    def __init__(self):
+        self.requetes = []
+
+    def bulk_write(self, requetes, ordered=True):
+        self.requetes.append(requetes)
+
+class Base(dict):
+
+    """Base MongoDB simplifiée, en mémoire."""
+
+    def __missing__(self, nom):
+        collection = self[nom] = Collection()
+        return collection
+
+@unittest.skipIf(LotMongo is None, "pymongo n'est pas installé")
+class TestLotMongo(unittest.TestCase):
+
+    """Unittest du lot d'écritures MongoDB."""
+
+    def test_regroupement(self):
+        """Vérifie que les écritures sont regroupées par collection."""
+        base = Base()
+        lot = LotMongo(base, taille=2)
+        for i in range(3):
+            lot.remplacer("salle", {"_id": i})
+        lot.remplacer("perso", {"_id": 5})
+        self.assertEqual(len(lot), 4)
+        self.assertEqual(lot.envoyer(), 4)
+        self.assertEqual(len(lot), 0)
+        self.assertEqual(base["salle"].requetes, [
+                [ReplaceOne({"_id": 0}, {"_id": 0}, upsert=True),
+                ReplaceOne({"_id": 1}, {"_id": 1}, upsert=True)],
+                [ReplaceOne({"_id": 2}, {"_id": 2}, upsert=True)]])
+        self.assertEqual(len(base["perso"].requetes), 1)
+
+    def test_suppression(self):
+        """Vérifie qu'un document supprimé n'est pas remplacé."""
+        base = Base()
+        lot = LotMongo(base)
+        lot.remplacer("salle", {"_id": 1, "titre": "ancien"})
+        lot.remplacer("salle", {"_id": 1, "titre": "nouveau"})
+        lot.supprimer("salle", 2)
+        lot.remplacer("salle", {"_id": 2})
+        lot.supprimer("salle", 2)
+        lot.envoyer()
+        self.assertEqual(base["salle"].requetes, [[
+                ReplaceOne({"_id": 1}, {"_id": 1, "titre": "nouveau"},
+                upsert=True), DeleteOne({"_id": 2})]])
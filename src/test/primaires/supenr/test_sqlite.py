@@ -0,0 +1,161 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest du stockage SQLite de supenr."""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from abstraits.obase import objets
+from bases.logs import man_logs
+from primaires.supenr.sqlite import StockageSQLite
+from test.primaires.supenr.test_journal import Noeud, Racine
+
+class TestSQLite(unittest.TestCase):
+
+    """Unittest du stockage SQLite."""
+
+    def setUp(self):
+        self.repertoire = tempfile.mkdtemp()
+        self.chemin = os.path.join(self.repertoire, "enregistrements.db")
+        self.logger = man_logs.creer_logger("supenr", "test_sqlite")
+        self.stockages = []
+
+    def tearDown(self):
+        for stockage in self.stockages:
+            stockage.fermer()
+
+        objets.vider(Racine)
+
+        shutil.rmtree(self.repertoire)
+
+    def ouvrir(self):
+        """Retourne un nouveau stockage sur la base de test."""
+        stockage = StockageSQLite(self.chemin, self.logger)
+        self.stockages.append(stockage)
+        return stockage
+
+    def recharger(self):
+        """Charge un nouveau stockage et retourne ses objets par nom."""
+        stockage = self.ouvrir()
+        stockage.charger()
+        return stockage, {o.nom: o for o in stockage.par_ident.values()}
+
+    def test_ecrire(self):
+        """Vérifie que seuls les objets modifiés sont réécrits."""
+        a = Noeud("a")
+        b = Noeud("b")
+        a.voisins.append(b)
+        b.voisins.append(a)
+        stockage = self.ouvrir()
+        self.assertEqual(stockage.compacter([a]), 2)
+        c = Noeud("c")
+        a.voisins.append(c)
+        stockage.marquer(a)
+        self.assertEqual(stockage.ecrire(), 2)
+        self.assertEqual(stockage.ecrire(), 0)
+
+        stockage, noeuds = self.recharger()
+        self.assertEqual(sorted(noeuds), ["a", "b", "c"])
+        self.assertIs(noeuds["a"].voisins[0], noeuds["b"])
+        self.assertIs(noeuds["b"].voisins[0], noeuds["a"])
+        self.assertIs(noeuds["a"].voisins[1], noeuds["c"])
+
+    def test_lire(self):
+        """Vérifie les recherches par classe et par identifiant."""
+        a = Racine("a")
+        b = Noeud("b")
+        a.voisins.append(b)
+        stockage = self.ouvrir()
+        stockage.compacter([a])
+        nom = Racine.__module__ + ".Racine"
+        self.assertEqual(len(stockage.lire_classe(nom)), 1)
+        self.assertEqual(stockage.lire_objet(a._id_journal)[0], nom)
+        self.assertIsNone(stockage.lire_objet(1000))
+
+    def test_nettoyer(self):
+        """Vérifie que les objets inaccessibles sont supprimés."""
+        a = Racine("a")
+        b = Noeud("b")
+        a.voisins.append(b)
+        stockage = self.ouvrir()
+        stockage.compacter([a])
+        a.voisins.remove(b)
+        stockage.marquer(a)
+        stockage.ecrire()
+        self.assertEqual(stockage.nettoyer(), 1)
+
+        stockage, noeuds = self.recharger()
+        self.assertEqual(sorted(noeuds), ["a"])
+
+    def test_ecriture_interrompue(self):
+        """Vérifie qu'une transaction échouée est rejouée."""
+        a = Noeud("a")
+        stockage = self.ouvrir()
+        stockage.compacter([a])
+        b = Racine("b") # sa table est créée dans la transaction
+        a.voisins.append(b)
+        a.nom = "c"
+        stockage.marquer(a)
+
+        # La base refuse les écritures : la transaction est annulée
+        stockage.connexion.execute("PRAGMA query_only=1")
+        with self.assertRaises(sqlite3.OperationalError):
+            stockage.ecrire()
+
+        stockage.connexion.execute("PRAGMA query_only=0")
+        self.assertEqual(stockage.ecrire(), 2)
+        self.assertEqual(stockage.ecrire(), 0)
+
+        stockage, noeuds = self.recharger()
+        self.assertEqual(sorted(noeuds), ["b", "c"])
+        self.assertIs(noeuds["c"].voisins[0], noeuds["b"])
+
+    def test_doit_nettoyer(self):
+        """Vérifie que le nettoyage est requis après assez d'écritures."""
+        a = Racine("a")
+        b = Noeud("b")
+        a.voisins.append(b)
+        stockage = self.ouvrir()
+        stockage.compacter([a])
+        self.assertFalse(stockage.doit_nettoyer())
+        a.voisins.remove(b)
+        for i in range(3):
+            a.nom = "a{}".format(i)
+            stockage.marquer(a)
+            stockage.ecrire()
+
+        self.assertTrue(stockage.doit_nettoyer())
+        self.assertEqual(stockage.nettoyer(), 1)
+        self.assertFalse(stockage.doit_nettoyer())
@@ -0,0 +1,143 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest de reseau.connexions.asynchrone."""
+
+import socket
+import time
+import unittest
+
+from primaires.diffact.echeancier import Echeancier
+from reseau.connexions.asynchrone import BoucleAsynchrone
+from reseau.connexions.serveur import ConnexionServeur
+
+class Action:
+
+    """Action différée simplifiée, exécutée à son échéance."""
+
+    def __init__(self, nom, echeance, fonction):
+        self.nom = nom
+        self.echeance = echeance
+        self.fonction = fonction
+
+
+class ImporteurTest:
+
+    """Importeur simplifié ne contenant qu'un échéancier d'actions."""
+
+    def __init__(self):
+        self.echeancier = Echeancier()
+        self.nb_tours = 0
+
+    def delai_boucle(self, maximum):
+        """Retourne le délai avant la prochaine action."""
+        echeance = self.echeancier.prochaine_echeance()
+        if echeance is None:
+            return maximum
+
+        return min(maximum, max(echeance - time.time(), 0))
+
+    def boucle(self):
+        """Exécute les actions échues."""
+        self.nb_tours += 1
+        action = self.echeancier.extraire(time.time())
+        while action is not None:
+            action.fonction()
+            action = self.echeancier.extraire(time.time())
+
+
+class TestBoucleAsynchrone(unittest.TestCase):
+
+    """Unittest de la boucle synchro basée sur asyncio."""
+
+    def setUp(self):
+        """Met en écoute un serveur sur un port libre."""
+        # Le délai maximum est long : la boucle ne doit être réveillée
+        # que par le réseau ou l'échéance des actions
+        self.serveur = ConnexionServeur(0, attente_maximum=30)
+        self.serveur.init()
+        self.importeur = ImporteurTest()
+        self.receptions = []
+        self.serveur.callbacks["reception"].fonction = self.recevoir
+        port = self.serveur.socket.getsockname()[1]
+        self.distant = socket.create_connection(("127.0.0.1", port))
+        self.distant.settimeout(1)
+
+    def tearDown(self):
+        """Ferme les sockets ouverts."""
+        self.distant.close()
+        for client in list(self.serveur.clients.values()):
+            client.socket.close()
+        self.serveur.socket.close()
+
+    def recevoir(self, client, message):
+        """Callback de réception : on répond en passant par le tampon."""
+        self.receptions.append(message)
+        client.mettre_en_tampon("reçu {}".format(message).encode())
+
+    def programmer(self, delai, fonction):
+        """Programme une action dans 'delai' secondes."""
+        echeance = time.time() + delai
+        self.importeur.echeancier.ajouter(Action(str(echeance), echeance,
+                fonction))
+        return echeance
+
+    def arreter(self):
+        """Arrête le serveur, et donc la boucle."""
+        self.serveur.lance = False
+
+    def test_boucle(self):
+        """Vérifie la réception, l'écriture et le réveil à l'échéance."""
+        executions = []
+        def executer():
+            executions.append(time.time())
+            self.arreter()
+
+        self.distant.sendall(b"abc\r\n")
+        echeance = self.programmer(0.3, executer)
+        # Garde-fou si l'action n'est jamais exécutée
+        self.programmer(5, self.arreter)
+        debut = time.time()
+        BoucleAsynchrone(self.serveur, self.importeur).lancer()
+
+        self.assertLess(time.time() - debut, 2)
+        self.assertEqual(len(executions), 1)
+        self.assertGreaterEqual(executions[0], echeance)
+        self.assertLess(executions[0] - echeance, 0.2)
+        self.assertEqual(self.receptions, ["abc"])
+
+        # La réponse mise en tampon a été envoyée
+        client = list(self.serveur.clients.values())[0]
+        self.assertEqual(client.tampon, b"")
+        self.assertEqual(self.distant.recv(1024), "reçu abc".encode())
+
+        # Un tour au démarrage, un après chaque évènement, un à l'échéance
+        self.assertLess(self.importeur.nb_tours, 10)
@@ -0,0 +1,193 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest de reseau.connexions.client_connecte."""
+
+import selectors
+import socket
+import unittest
+
+from reseau.connexions.client_connecte import ClientConnecte, DECONNECTER, \
+        IGNORER, TRONQUER
+
+class TestClientConnecte(unittest.TestCase):
+
+    """Unittest du tampon de sortie des clients connectés."""
+
+    def setUp(self):
+        """Crée une paire de sockets connectés."""
+        self.local, self.distant = socket.socketpair()
+        self.distant.setblocking(False)
+        self.selecteur = None
+
+    def tearDown(self):
+        """Ferme les sockets."""
+        if self.selecteur:
+            self.selecteur.close()
+        self.local.close()
+        self.distant.close()
+
+    def creer(self, taille_tampon=1024 * 1024, debordement=DECONNECTER):
+        """Crée le client enveloppant le socket local."""
+        return ClientConnecte(self.local, ("local", 0), taille_tampon,
+                debordement)
+
+    def saturer(self, client):
+        """Remplit le tampon du système pour que send n'envoie plus rien."""
+        bloc = b"-" * 65536
+        while True:
+            try:
+                client.socket.send(bloc)
+            except BlockingIOError:
+                break
+
+    def lire(self):
+        """Lit tout ce que le socket distant peut recevoir."""
+        recu = bytearray()
+        while True:
+            try:
+                bloc = self.distant.recv(65536)
+            except BlockingIOError:
+                break
+            if not bloc:
+                break
+            recu += bloc
+        return bytes(recu)
+
+    def test_envoi_direct(self):
+        """Vérifie qu'un message court est envoyé sans tampon."""
+        client = self.creer()
+        client.envoyer(b"bonjour")
+        self.assertEqual(client.tampon, b"")
+        self.assertEqual(self.lire(), b"bonjour")
+
+    def test_envoi_partiel(self):
+        """Vérifie que ce qui n'a pu être envoyé est gardé en tampon."""
+        client = self.creer(taille_tampon=16 * 1024 * 1024)
+        message = bytes(range(256)) * 16384
+        client.envoyer(message)
+        self.assertTrue(client.sature)
+        self.assertTrue(message.endswith(bytes(client.tampon)))
+
+        # Les messages suivants sont ajoutés au tampon, dans l'ordre
+        client.envoyer(b"fin")
+        self.assertTrue(client.tampon.endswith(b"fin"))
+
+        recu = bytearray()
+        while client.tampon:
+            recu += self.lire()
+            client.ecrire()
+        recu += self.lire()
+        self.assertEqual(bytes(recu), message + b"fin")
+
+    def test_ecrire(self):
+        """Vérifie que ecrire vide le tampon une fois le socket libéré."""
+        client = self.creer()
+        self.saturer(client)
+        client.envoyer(b"bonjour")
+        self.assertEqual(client.tampon, b"bonjour")
+
+        # Le socket est toujours saturé : rien n'est envoyé
+        client.ecrire()
+        self.assertEqual(client.tampon, b"bonjour")
+
+        self.assertTrue(self.lire().endswith(b"-"))
+        client.ecrire()
+        self.assertEqual(client.tampon, b"")
+        self.assertEqual(self.lire(), b"bonjour")
+
+    def test_deconnecter(self):
+        """Vérifie la politique 'deconnecter' quand le tampon déborde."""
+        client = self.creer(16, DECONNECTER)
+        self.saturer(client)
+        client.envoyer(b"a" * 10)
+        self.assertTrue(client.connecte)
+        client.envoyer(b"b" * 10)
+        self.assertFalse(client.connecte)
+        self.assertEqual(client.retour, "tampon de sortie saturé")
+        self.assertEqual(client.tampon, b"")
+
+        # Un client déconnecté n'envoie plus rien
+        client.envoyer(b"c")
+        self.assertEqual(client.tampon, b"")
+
+    def test_tronquer(self):
+        """Vérifie la politique 'tronquer' quand le tampon déborde."""
+        client = self.creer(16, TRONQUER)
+        self.saturer(client)
+        client.envoyer(b"a" * 10)
+        client.envoyer(b"b" * 10)
+        self.assertTrue(client.connecte)
+        self.assertEqual(client.tampon, b"a" * 10 + b"b" * 6)
+        self.assertEqual(client.nb_octets_perdus, 4)
+        client.envoyer(b"c")
+        self.assertEqual(len(client.tampon), 16)
+        self.assertEqual(client.nb_octets_perdus, 5)
+
+    def test_ignorer(self):
+        """Vérifie la politique 'ignorer' quand le tampon déborde."""
+        client = self.creer(16, IGNORER)
+        self.saturer(client)
+        client.envoyer(b"a" * 10)
+        client.envoyer(b"b" * 10)
+        self.assertTrue(client.connecte)
+        self.assertEqual(client.tampon, b"a" * 10)
+        self.assertEqual(client.nb_octets_perdus, 10)
+        client.envoyer(b"c" * 6)
+        self.assertEqual(client.tampon, b"a" * 10 + b"c" * 6)
+
+    def test_politique_inconnue(self):
+        """Vérifie qu'une politique inconnue est refusée."""
+        with self.assertRaises(ValueError):
+            self.creer(16, "fermer")
+
+    def test_surveiller_ecriture(self):
+        """Vérifie que l'écriture n'est surveillée que tampon non vide."""
+        client = self.creer()
+        self.selecteur = selectors.DefaultSelector()
+        self.selecteur.register(client.fileno, selectors.EVENT_READ, client)
+        client.selecteur = self.selecteur
+        evenements = lambda: self.selecteur.get_key(client.fileno).events
+
+        self.saturer(client)
+        client.envoyer(b"bonjour")
+        self.assertEqual(evenements(),
+                selectors.EVENT_READ | selectors.EVENT_WRITE)
+        self.assertIs(self.selecteur.get_key(client.fileno).data, client)
+
+        # Le client est signalé prêt en écriture une fois le socket libéré
+        self.lire()
+        pret = [masque for cle, masque in self.selecteur.select(0) \
+                if cle.data is client]
+        self.assertTrue(pret and pret[0] & selectors.EVENT_WRITE)
+
+        client.ecrire()
+        self.assertEqual(evenements(), selectors.EVENT_READ)
@@ -0,0 +1,76 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Fichier définissant les unittest de reseau.connexions.decodeur_telnet."""
+
+import unittest
+
+from reseau.connexions.decodeur_telnet import DecodeurTelnet
+
+class TestDecodeurTelnet(unittest.TestCase):
+
+    """Unittest du décodeur Telnet."""
+
+    def decoder(self, *morceaux):
+        """Envoie les morceaux au décodeur et retourne les lignes."""
+        decodeur = DecodeurTelnet()
+        for morceau in morceaux:
+            decodeur.recevoir(morceau)
+
+        lignes = []
+        while decodeur:
+            lignes.append(decodeur.extraire())
+
+        return lignes
+
+    def test_lignes(self):
+        """Vérifie le découpage en lignes."""
+        self.assertEqual(self.decoder(b"abc"), [])
+        self.assertEqual(self.decoder(b"abc\r\n"), [b"abc"])
+        self.assertEqual(self.decoder(b"\n"), [b""])
+        self.assertEqual(self.decoder(b"a\n\n\rb\r\nc"), [b"a", b"b"])
+        self.assertEqual(self.decoder(b"ab", b"c\n"), [b"abc"])
+
+    def test_effacement(self):
+        """Vérifie le traitement des caractères d'effacement."""
+        self.assertEqual(self.decoder(b"ab\x08c\n"), [b"ac"])
+        self.assertEqual(self.decoder(b"\x08a\n"), [b"a"])
+        self.assertEqual(self.decoder(b"ab", b"\x08\x08\x08c\n"), [b"c"])
+
+    def test_options(self):
+        """Vérifie que les options Telnet sont retirées."""
+        self.assertEqual(self.decoder(b"\xff\xfb\x1fhi\n"), [b"hi"])
+        self.assertEqual(self.decoder(b"\xff\xf9yo\r\n"), [b"yo"])
+        self.assertEqual(self.decoder(b"a\xff", b"\xfd", b"\nb\n"),
+                [b"ab"])
+
+    def test_tintin(self):
+        """Vérifie la compatibilité Tintin++."""
+        self.assertEqual(self.decoder(b"\xc3a\xc3\xa9\n"), [b"a\xc3\xa9"])
@@ -0,0 +1,108 @@
+# -*-coding:Utf-8 -*
+
+# Copyright (c) 2010-2017 LE GOFF Vincent
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+# OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""Fichier définissant les unittest de reseau.connexions.serveur."""
+
+import selectors
+import socket
+import unittest
+
+from reseau.connexions.serveur import ConnexionServeur
+
+class TestConnexionServeur(unittest.TestCase):
+
+    """Unittest du serveur basé sur le sélecteur."""
+
+    def setUp(self):
+        """Met en écoute un serveur sur un port libre."""
+        self.serveur = ConnexionServeur(0, attente_maximum=0.5)
+        self.serveur.init()
+        self.receptions = []
+        self.serveur.callbacks["reception"].fonction = \
+                lambda client, msg: self.receptions.append((client, msg))
+        self.distant = None
+
+    def tearDown(self):
+        """Ferme les sockets ouverts."""
+        if self.distant:
+            self.distant.close()
+        for client in list(self.serveur.clients.values()):
+            client.socket.close()
+        self.serveur.selecteur.close()
+        self.serveur.socket.close()
+
+    def connecter(self):
+        """Connecte un client et le fait accepter par le serveur."""
+        port = self.serveur.socket.getsockname()[1]
+        self.distant = socket.create_connection(("127.0.0.1", port))
+        self.distant.settimeout(1)
+        self.serveur.verifier_evenements(0.5)
+        self.assertEqual(len(self.serveur.clients), 1)
+        return list(self.serveur.clients.values())[0]
+
+    def evenements(self, client):
+        """Retourne les évènements surveillés pour le client."""
+        return self.serveur.selecteur.get_key(client.fileno).events
+
+    def test_accepter(self):
+        """Vérifie qu'une connexion en attente est acceptée."""
+        client = self.connecter()
+        self.assertIs(client.selecteur, self.serveur.selecteur)
+        self.assertIs(self.serveur.selecteur.get_key(client.fileno).data,
+                client)
+        self.assertEqual(self.evenements(client), selectors.EVENT_READ)
+
+    def test_recevoir(self):
+        """Vérifie que le callback de réception est appelé."""
+        client = self.connecter()
+        self.distant.sendall(b"abc\r\ndef")
+        self.serveur.verifier_evenements(0.5)
+        self.assertEqual(self.receptions, [(client, "abc")])
+        self.assertEqual(client.message, b"def")
+
+    def test_ecrire(self):
+        """Vérifie que le tampon de sortie est vidé quand c'est possible."""
+        client = self.connecter()
+        client.mettre_en_tampon(b"bonjour")
+        self.assertEqual(self.evenements(client),
+                selectors.EVENT_READ | selectors.EVENT_WRITE)
+        self.serveur.verifier_evenements(0.5)
+        self.assertEqual(client.tampon, b"")
+        self.assertEqual(self.evenements(client), selectors.EVENT_READ)
+        self.assertEqual(self.distant.recv(1024), b"bonjour")
+
+    def test_deconnexion(self):
+        """Vérifie qu'un client qui ferme la connexion est retiré."""
+        self.connecter()
+        self.distant.close()
+        self.distant = None
+        self.serveur.verifier_evenements(0.5)
+        self.assertEqual(self.serveur.clients, {})